@@ -38,7 +38,12 @@ from fastapi.openapi.utils import get_openapi
 from middleware.auth_middleware import AuthMiddleware
 from config.settings import settings
 from api.models.schemas import HealthCheck
-from api.routes import crawl, jobs, listings
+from api.routes import crawl, jobs, listings, ml_models
+from api.services.scoring_executor import scoring_executor
+from api.services.llm_service import llm_analyzer
+from api.services.job_store import job_store
+from api.services.crawl_scheduler import crawl_scheduler
+from api.services.job_events import stream_job_progress
 
 # -------------------------------------------------
 # WEBSOCKET MANAGER
@@ -73,8 +78,40 @@ async def lifespan(app: FastAPI):
     print(" Starting Bulletproof Web Crawler API")
     print(f" API: http://{settings.API_HOST}:{settings.API_PORT}")
     print(f" Docs: http://{settings.API_HOST}:{settings.API_PORT}/docs")
+    if settings.PRELOAD_MODELS and ml_models.MODEL_REGISTRY_AVAILABLE:
+        versions = await asyncio.to_thread(ml_models.model_registry.reload)
+        print(f" Preloaded models: {versions}")
+    scoring_executor.start(settings.SCORING_EXECUTOR, settings.SCORING_WORKERS)
+    await llm_analyzer.startup()
+    firestore_repository = None
+    if settings.DATABASE_TYPE == "firebase":
+        try:
+            from storage.async_repository import firestore_repository
+            await asyncio.to_thread(firestore_repository.start)
+        except Exception as e:
+            print(f" Firestore not available at startup: {e}")
+    crawl_scheduler.start(settings.MAX_CONCURRENT_TASKS, settings.CRAWL_QUEUE_MAX_DEPTH, settings.CRAWL_ESTIMATED_SECONDS)
+    requeue_task = asyncio.create_task(crawl.run_requeue(settings.JOB_HEARTBEAT_SECONDS))
+    retention_task = asyncio.create_task(job_store.run_retention(settings.JOB_RETENTION_INTERVAL_SECONDS))
+    heartbeat_task = asyncio.create_task(
+        job_store.run_heartbeat(settings.JOB_HEARTBEAT_SECONDS, crawl_scheduler.job_ids)
+    )
     yield
     print(" Shutting down API")
+    requeue_task.cancel()
+    retention_task.cancel()
+    heartbeat_task.cancel()
+    queued = crawl_scheduler.job_ids()
+    await crawl_scheduler.shutdown()
+    try:
+        await job_store.release(queued)
+    except Exception as e:
+        print(f" Could not release queued crawl jobs: {e}")
+    if firestore_repository is not None:
+        await firestore_repository.shutdown()
+    await llm_analyzer.shutdown()
+    await scoring_executor.shutdown()
+    job_store.close()
 
 # -------------------------------------------------
 # FASTAPI APP
@@ -110,6 +147,7 @@ app.add_middleware(AuthMiddleware)
 app.include_router(crawl.router, prefix="/api/v1", tags=["Crawling"])
 app.include_router(jobs.router, prefix="/api/v1", tags=["Jobs"])
 app.include_router(listings.router, prefix="/api/v1", tags=["Listings"])
+app.include_router(ml_models.router, prefix="/api/v1", tags=["Models"])
 
 # -------------------------------------------------
 # ROOT
@@ -144,16 +182,18 @@ async def health_check():
 # -------------------------------------------------
 @app.websocket("/ws/progress/{job_id}")
 async def websocket_endpoint(websocket: WebSocket, job_id: str):
+    """
+    Job progress: status snapshots whenever they change (and in reply to
+    any message), plus per-URL results of batch jobs as they finish.
+    Closes once the job is finished.
+    """
     await manager.connect(websocket)
     try:
-        while True:
-            await websocket.receive_text()
-            await websocket.send_json({
-                "job_id": job_id,
-                "status": "running",
-                "progress": 50,
-            })
+        if await stream_job_progress(websocket, job_id, jobs.job_snapshot, settings.WS_PROGRESS_POLL_SECONDS):
+            await websocket.close()
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 # -------------------------------------------------
@@ -207,4 +247,5 @@ if __name__ == "__main__":
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.DEBUG,
+        workers=None if settings.DEBUG else settings.API_WORKERS,
     )
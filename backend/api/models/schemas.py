@@ -29,6 +29,13 @@ class CrawlRequest(BaseModel):
     extract_images: bool = Field(default=True, description="Extract image URLs")
     extract_links: bool = Field(default=True, description="Extract all links")
     custom_headers: Optional[Dict[str, str]] = Field(default=None, description="Custom HTTP headers")
+    priority: int = Field(default=0, description="Queue priority (higher starts first)", ge=-10, le=10)
+
+
+class BatchCrawlRequest(CrawlRequest):
+    """Request model for crawling a list of listing URLs as one job"""
+    url: Optional[str] = Field(default=None, description="Page the URLs came from, e.g. a saved search (informational)")
+    urls: List[str] = Field(..., min_length=1, max_length=500, description="Listing URLs to crawl in one browser session")
 
 
 class CrawlResponse(BaseModel):
@@ -37,6 +44,8 @@ class CrawlResponse(BaseModel):
     status: JobStatus = Field(..., description="Current job status")
     message: str = Field(..., description="Status message")
     estimated_time: Optional[int] = Field(default=None, description="Estimated completion time in seconds")
+    queue_position: Optional[int] = Field(default=None, description="Queued jobs ahead of this one (0 = next to start)")
+    estimated_start_time: Optional[datetime] = Field(default=None, description="Estimated time the crawl starts")
 
 
 class JobInfo(BaseModel):
@@ -247,3 +256,35 @@ class BuyabilityScore(BaseModel):
     calculation_breakdown: CalculationBreakdown = Field(..., description="Calculation details")
     calculation_summary: str = Field(..., description="Human-readable calculation summary")
     warning_message: Optional[str] = Field(None, description="Warning if any score is critically low")
+
+
+# ===== BULK ANALYSIS MODELS =====
+
+class BulkAnalyzeItem(BaseModel):
+    """
+    One car to analyze in a bulk request: either a stored listing (listing_id)
+    or raw specs (year and mileage required, same fields as POST /analyze)
+    """
+    listing_id: Optional[str] = Field(None, description="Stored listing to analyze")
+    year: Optional[int] = Field(None, description="Model year")
+    mileage: Optional[int] = Field(None, description="Total mileage in km")
+    engine_volume: Optional[str] = None
+    engine_power: Optional[str] = None
+    make: Optional[str] = None
+    series: Optional[str] = None
+    model: Optional[str] = None
+    fuel_type: Optional[str] = None
+    transmission: Optional[str] = None
+    body_type: Optional[str] = None
+    drive_type: Optional[str] = None
+    price: Optional[str] = None
+    painted_parts: Optional[List[str]] = None
+    changed_parts: Optional[List[str]] = None
+    local_painted_parts: Optional[List[str]] = None
+
+
+class BulkAnalyzeRequest(BaseModel):
+    """Request model for bulk analysis"""
+    items: List[BulkAnalyzeItem] = Field(..., min_length=1, description="Listings or specs to analyze")
+    language: str = Field(default="en", description="Language for translations (en or tr)")
+    include_llm: bool = Field(default=True, description="Run LLM mechanical analysis for items with make/model")
@@ -1,17 +1,23 @@
 """
 Crawl API Routes
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any, Optional, List
+import asyncio
+import functools
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 
 # Add parent directories to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from api.models.schemas import CrawlRequest, CrawlResponse, JobStatus, CrawlResult
+from api.models.schemas import CrawlRequest, BatchCrawlRequest, CrawlResponse, JobStatus, CrawlResult
+from api.services.job_store import job_store, WORKER_ID
+from api.services.job_events import job_events
+from api.services.crawl_scheduler import crawl_scheduler, QueueFull
+from config.settings import settings
 from crawler.crawler import Crawler
 from loguru import logger
 
@@ -19,10 +25,6 @@ from loguru import logger
 router = APIRouter()
 
 
-# Temporary in-memory storage (will be replaced with database)
-jobs_storage: Dict[str, Dict[str, Any]] = {}
-
-
 def parse_price(price_str: Any) -> Optional[float]:
     """Parse price string like '1.490.000 TL' to float"""
     if price_str is None:
@@ -62,10 +64,7 @@ def parse_int(value: Any) -> Optional[int]:
 async def perform_analysis_on_listing(sahibinden_data: Dict[str, Any], language: str = "en") -> Optional[Dict[str, Any]]:
     """Perform hybrid analysis on listing data (statistical + LLM + crash score)"""
     try:
-        from api.services.llm_service import llm_analyzer
-        from api.services.crash_score_service import calculate_crash_score, crash_score_to_dict
-        from api.services.buyability_score_service import calculate_buyability_score, buyability_score_to_dict
-        from src.predict_buyability import predict_buyability
+        from api.services.analysis_pipeline import run_hybrid_analysis
 
         # Validate language
         lang = language if language in ("en", "tr") else "en"
@@ -77,7 +76,6 @@ async def perform_analysis_on_listing(sahibinden_data: Dict[str, Any], language:
             logger.warning(f"Missing required fields for analysis: year={year}, mileage={mileage}")
             return None
 
-        # ===== 1. STATISTICAL ANALYSIS (existing model) =====
         sample = {
             "Model Yıl": year,
             "Km": mileage,
@@ -85,10 +83,6 @@ async def perform_analysis_on_listing(sahibinden_data: Dict[str, Any], language:
             "Beygir Gucu": sahibinden_data.get('motor_gucu') or "100"
         }
 
-        statistical_result = predict_buyability(sample)
-
-        # ===== 2. LLM MECHANICAL ANALYSIS =====
-        llm_result = None
         car_data = {
             "Model Yıl": year,
             "Km": mileage,
@@ -104,90 +98,44 @@ async def perform_analysis_on_listing(sahibinden_data: Dict[str, Any], language:
             "fiyat": sahibinden_data.get('fiyat')
         }
 
-        if sahibinden_data.get('marka') or sahibinden_data.get('model'):
-            try:
-                llm_result = await llm_analyzer.analyze_mechanical_reliability(car_data)
-            except Exception as llm_error:
-                logger.warning(f"LLM analysis failed: {llm_error}")
-
-        # ===== 3. CRASH SCORE ANALYSIS =====
-        crash_score_result = None
         parts_data = sahibinden_data.get('boyali_degisen', {})
-
         parsed_painted = parts_data.get('boyali', []) if isinstance(parts_data, dict) else None
         parsed_changed = parts_data.get('degisen', []) if isinstance(parts_data, dict) else None
         parsed_local_painted = parts_data.get('lokal_boyali', []) if isinstance(parts_data, dict) else None
 
-        if parsed_painted or parsed_changed or parsed_local_painted:
-            try:
-                crash_result = calculate_crash_score(
-                    painted_parts=parsed_painted,
-                    changed_parts=parsed_changed,
-                    local_painted_parts=parsed_local_painted,
-                    language=lang
-                )
-                crash_score_result = crash_score_to_dict(crash_result)
-            except Exception as crash_error:
-                logger.warning(f"Crash score calculation failed: {crash_error}")
-        else:
-            if lang == "tr":
-                crash_score_result = {
-                    "score": 100,
-                    "total_deduction": 0,
-                    "deductions": [],
-                    "summary": "Boyali veya degisen parca bilgisi mevcut degil. Arac orijinal durumda kabul edildi.",
-                    "risk_level": "Bilinmiyor",
-                    "verdict": "Parca bilgisi yok - Orijinal kabul edildi"
-                }
-            else:
-                crash_score_result = {
-                    "score": 100,
-                    "total_deduction": 0,
-                    "deductions": [],
-                    "summary": "No painted or changed parts information available. Vehicle assumed to be in original condition.",
-                    "risk_level": "Unknown",
-                    "verdict": "No parts info - Assumed original"
-                }
-
-        # ===== 4. CALCULATE BUYABILITY SCORE =====
-        statistical_score = statistical_result.get('risk_score') if statistical_result else None
-        mechanical_score_val = None
-        if llm_result and llm_result.get('scores'):
-            mechanical_score_val = llm_result['scores'].get('mechanical_score')
-        crash_score_val = crash_score_result.get('score') if crash_score_result else None
-
-        buyability_result = None
-        try:
-            buyability_calc = calculate_buyability_score(
-                statistical_score=statistical_score,
-                mechanical_score=mechanical_score_val,
-                crash_score=crash_score_val
-            )
-            buyability_result = buyability_score_to_dict(buyability_calc)
-        except Exception as buyability_error:
-            logger.warning(f"Buyability score calculation failed: {buyability_error}")
-
-        return {
-            "buyability_score": buyability_result,
-            "statistical_analysis": statistical_result,
-            "llm_analysis": llm_result,
-            "crash_score_analysis": crash_score_result
-        }
+        # Statistical, LLM and crash analysis run concurrently
+        return await run_hybrid_analysis(
+            sample,
+            car_data,
+            painted_parts=parsed_painted,
+            changed_parts=parsed_changed,
+            local_painted_parts=parsed_local_painted,
+            language=lang,
+            with_llm=bool(sahibinden_data.get('marka') or sahibinden_data.get('model'))
+        )
 
     except Exception as e:
         logger.error(f"Error performing analysis on listing: {str(e)}")
         return None
 
 
-def save_listing_to_firestore(sahibinden_data: Dict[str, Any], user_id: Optional[str], result_images: List[str] = None, analysis_results: Optional[Dict[str, Any]] = None) -> bool:
-    """Save the crawled listing to Firestore"""
+async def save_crawled_listing(
+    crawler: Crawler,
+    sahibinden_data: Dict[str, Any],
+    user_id: Optional[str],
+    image_records: List[Dict[str, Any]],
+    analysis_results: Optional[Dict[str, Any]] = None,
+    cleaned_listing: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    Save the crawled listing to the configured database (DATABASE_TYPE) in
+    one write, with the cleaner's output (if the crawler produced it), the
+    downloaded image records and analysis results
+    """
     try:
-        from storage.firebase_repository import FirestoreRepository
-
-        repo = FirestoreRepository()
-
         # Prepare cleaned data for storage with proper type conversion
         cleaned_data = {
+            **(cleaned_listing or {}),
             'listing_id': sahibinden_data.get('ilan_no'),
             'brand': sahibinden_data.get('marka'),
             'series': sahibinden_data.get('seri'),
@@ -208,49 +156,78 @@ def save_listing_to_firestore(sahibinden_data: Dict[str, Any], user_id: Optional
             'description': sahibinden_data.get('aciklama'),
             'technical_specs': sahibinden_data.get('teknik_ozellikler'),
             'painted_parts': sahibinden_data.get('boyali_degisen'),
-            'data_quality_score': 0.8,  # Default score
+            'data_quality_score': (cleaned_listing or {}).get('data_quality_score', 0.8),  # Cleaner score, else default
         }
 
-        # Add analysis results if available
+        # Add analysis results if available (stored by backends with fields for them)
         if analysis_results:
             cleaned_data['buyability_score'] = analysis_results.get('buyability_score')
             cleaned_data['statistical_analysis'] = analysis_results.get('statistical_analysis')
             cleaned_data['llm_analysis'] = analysis_results.get('llm_analysis')
             cleaned_data['crash_score_analysis'] = analysis_results.get('crash_score_analysis')
 
-        # Get images - prefer result_images, fallback to gorseller from sahibinden_data
-        images = result_images or sahibinden_data.get('gorseller', [])
-        logger.info(f"Saving listing with {len(images)} images")
-        image_records = [{'url': img, 'is_primary': i == 0} for i, img in enumerate(images)]
-
-        result = repo.create_listing(cleaned_data, images=image_records, user_id=user_id)
-
-        if result:
-            logger.success(f"Saved listing {cleaned_data['listing_id']} to Firestore for user {user_id}")
-            return True
-        return False
+        logger.info(f"Saving listing with {len(image_records)} images")
+        saved = await crawler.persist_listing(cleaned_data, image_records, sahibinden_data, user_id=user_id)
+        if saved:
+            logger.success(f"Saved listing {cleaned_data['listing_id']} for user {user_id}")
+        return saved
 
     except Exception as e:
-        logger.error(f"Failed to save listing to Firestore: {str(e)}")
+        logger.error(f"Failed to save crawled listing: {str(e)}")
         return False
 
 
-async def perform_crawl(job_id: str, request: CrawlRequest, user_id: Optional[str] = None):
+async def persist_crawled_listing(
+    crawler: Crawler,
+    result: Dict[str, Any],
+    analysis_results: Optional[Dict[str, Any]],
+    user_id: Optional[str]
+) -> bool:
+    """Save the listing of a successful crawl, if the parser found one"""
+    sahibinden_data = result.get("sahibinden_listing")
+    image_records = result.get("image_records") or []
+    logger.info(f"Crawl completed. sahibinden_data present: {sahibinden_data is not None}, user_id: {user_id}, images count: {len(image_records)}")
+    if sahibinden_data:
+        logger.info(f"sahibinden_data keys: {sahibinden_data.keys() if isinstance(sahibinden_data, dict) else 'not a dict'}")
+        logger.info(f"ilan_no: {sahibinden_data.get('ilan_no') if isinstance(sahibinden_data, dict) else 'N/A'}")
+    if sahibinden_data and sahibinden_data.get("ilan_no"):
+        return await save_crawled_listing(
+            crawler,
+            sahibinden_data,
+            user_id,
+            image_records,
+            analysis_results=analysis_results,
+            cleaned_listing=result.get("cleaned_listing")
+        )
+    logger.warning(f"No sahibinden_listing data or missing ilan_no, skipping database save")
+    return False
+
+
+async def perform_crawl(job_id: str, request: CrawlRequest, user_id: Optional[str] = None) -> bool:
     """
-    Background task to perform the actual crawling with the real Crawler class
+    Scheduled task to perform the actual crawling with the real Crawler class
+
+    Returns:
+        False if the job was no longer pending (cancelled, or started by another worker)
     """
     crawler = None
     try:
-        # Update status to running
-        jobs_storage[job_id]["status"] = JobStatus.RUNNING
-        jobs_storage[job_id]["started_at"] = datetime.utcnow()
+        # Update status to running (unless the job was cancelled while queued)
+        started_at = datetime.utcnow()
+        if not await job_store.transition(
+            job_id, JobStatus.RUNNING, [JobStatus.PENDING],
+            started_at=started_at, worker_id=WORKER_ID, heartbeat_at=started_at
+        ):
+            logger.info(f"Job {job_id} is no longer pending, skipping crawl")
+            return False
 
         # Initialize Crawler with request parameters
         crawler = Crawler(
             use_stealth=request.use_stealth,
             use_proxy=request.use_proxy,
             solve_captcha=request.solve_captcha,
-            headless=True
+            headless=True,
+            persist_listings=False  # Saved below in one write, with analysis attached
         )
         await crawler.initialize()
 
@@ -266,8 +243,6 @@ async def perform_crawl(job_id: str, request: CrawlRequest, user_id: Optional[st
 
         # Map crawler result to job storage format
         if result.get("status") == "success":
-            jobs_storage[job_id]["status"] = JobStatus.COMPLETED
-
             # Perform analysis on the listing before storing
             sahibinden_data = result.get("sahibinden_listing")
             analysis_results = None
@@ -279,7 +254,7 @@ async def perform_crawl(job_id: str, request: CrawlRequest, user_id: Optional[st
                 else:
                     logger.warning("Analysis returned no results")
 
-            jobs_storage[job_id]["result"] = {
+            job_result = {
                 "html": result.get("html"),
                 "text": result.get("text"),
                 "title": result.get("title"),
@@ -296,43 +271,256 @@ async def perform_crawl(job_id: str, request: CrawlRequest, user_id: Optional[st
                 "analysis": analysis_results
             }
 
-            # Save to Firestore if we have sahibinden data
-            result_images = result.get("images", [])
-            logger.info(f"Crawl completed. sahibinden_data present: {sahibinden_data is not None}, user_id: {user_id}, images count: {len(result_images)}")
-            if sahibinden_data:
-                logger.info(f"sahibinden_data keys: {sahibinden_data.keys() if isinstance(sahibinden_data, dict) else 'not a dict'}")
-                logger.info(f"ilan_no: {sahibinden_data.get('ilan_no') if isinstance(sahibinden_data, dict) else 'N/A'}")
-            if sahibinden_data and sahibinden_data.get("ilan_no"):
-                save_listing_to_firestore(sahibinden_data, user_id, result_images=result_images, analysis_results=analysis_results)
-            else:
-                logger.warning(f"No sahibinden_listing data or missing ilan_no, skipping Firestore save")
+            # Result and status are stored together; a job cancelled meanwhile stays cancelled
+            await job_store.transition(
+                job_id, JobStatus.COMPLETED, [JobStatus.RUNNING],
+                result=job_result, completed_at=datetime.utcnow()
+            )
+
+            # Save to the database if we have sahibinden data
+            await persist_crawled_listing(crawler, result, analysis_results, user_id)
         else:
             # Crawl failed
-            jobs_storage[job_id]["status"] = JobStatus.FAILED
-            jobs_storage[job_id]["error_message"] = result.get("error_message", "Unknown crawl error")
-
-        # Update completed timestamp
-        jobs_storage[job_id]["completed_at"] = datetime.utcnow()
+            await job_store.transition(
+                job_id, JobStatus.FAILED, [JobStatus.RUNNING],
+                error_message=result.get("error_message", "Unknown crawl error"),
+                completed_at=datetime.utcnow()
+            )
 
+    except asyncio.CancelledError:
+        # Scheduler shut down mid-crawl
+        await job_store.transition(
+            job_id, JobStatus.FAILED, [JobStatus.RUNNING],
+            error_message="Crawl interrupted by server shutdown",
+            completed_at=datetime.utcnow()
+        )
+        raise
     except Exception as e:
         # Handle unexpected errors
-        jobs_storage[job_id]["status"] = JobStatus.FAILED
-        jobs_storage[job_id]["error_message"] = str(e)
-        jobs_storage[job_id]["completed_at"] = datetime.utcnow()
+        await job_store.transition(
+            job_id, JobStatus.FAILED, [JobStatus.PENDING, JobStatus.RUNNING],
+            error_message=str(e),
+            completed_at=datetime.utcnow()
+        )
     finally:
         # Cleanup crawler resources
         if crawler:
             await crawler.close()
 
+    return True
 
-@router.post("/crawl", response_model=CrawlResponse)
-async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks, req: Request):
+
+async def crawl_batch_item(crawler: Crawler, url: str, request: BatchCrawlRequest, user_id: Optional[str]) -> Dict[str, Any]:
+    """Crawl, analyze and save one URL of a batch job"""
+    try:
+        result = await crawler.crawl(
+            url=url,
+            use_browser=True,
+            wait_time=request.wait_time,
+            wait_for_selector=request.wait_for_selector,
+            custom_headers=request.custom_headers,
+            max_retries=request.max_retries
+        )
+    except Exception as e:
+        return {"url": url, "status": "failed", "error_message": str(e)}
+
+    if result.get("status") != "success":
+        return {
+            "url": url,
+            "status": result.get("status", "failed"),
+            "error_message": result.get("error_message", "Unknown crawl error")
+        }
+
+    sahibinden_data = result.get("sahibinden_listing")
+    analysis_results = await perform_analysis_on_listing(sahibinden_data) if sahibinden_data else None
+    saved = await persist_crawled_listing(crawler, result, analysis_results, user_id)
+
+    return {
+        "url": url,
+        "status": "success",
+        "final_url": result.get("url"),
+        "title": result.get("title"),
+        "listing_id": sahibinden_data.get("ilan_no") if sahibinden_data else None,
+        "sahibinden_listing": sahibinden_data,
+        "analysis": analysis_results,
+        "saved": saved,
+        "crawl_duration": result.get("crawl_duration")
+    }
+
+
+async def perform_batch_crawl(job_id: str, request: BatchCrawlRequest, user_id: Optional[str] = None) -> bool:
     """
-    Start a new crawl job
+    Scheduled task crawling every URL of a batch job in one browser session.
+    Each finished URL updates the job's batch_progress and is published to
+    the job's progress websockets; a cancelled job stops before its next URL
+    and keeps the results so far.
+
+    Returns:
+        False if the job was no longer pending (cancelled, or started by another worker)
+    """
+    crawler = None
+    started = False
+    items: List[Dict[str, Any]] = []
+    progress = {"total": len(request.urls), "done": 0, "succeeded": 0, "failed": 0}
+
+    def batch_result() -> Dict[str, Any]:
+        return {"items": items, **progress}
+
+    try:
+        started_at = datetime.utcnow()
+        if not await job_store.transition(
+            job_id, JobStatus.RUNNING, [JobStatus.PENDING],
+            started_at=started_at, worker_id=WORKER_ID, heartbeat_at=started_at, batch_progress=progress
+        ):
+            logger.info(f"Job {job_id} is no longer pending, skipping batch crawl")
+            return False
+        started = True
+
+        crawler = Crawler(
+            use_stealth=request.use_stealth,
+            use_proxy=request.use_proxy,
+            solve_captcha=request.solve_captcha,
+            headless=True,
+            persist_listings=False  # Each listing is saved with its analysis attached
+        )
+        await crawler.initialize()
+        await crawler.start_browser_session()
+
+        for index, url in enumerate(request.urls):
+            job = await job_store.get(job_id)
+            if job is None or job["status"] != JobStatus.RUNNING:
+                logger.info(f"Batch job {job_id} stopped after {index} of {len(request.urls)} URLs")
+                await job_store.update(job_id, result=batch_result(), batch_progress=progress)
+                return True
+
+            item = await crawl_batch_item(crawler, url, request, user_id)
+            items.append(item)
+            progress["done"] += 1
+            progress["succeeded" if item["status"] == "success" else "failed"] += 1
+            await job_store.update(job_id, batch_progress=progress)
+            job_events.publish(job_id, {"type": "item", "job_id": job_id, "index": index, "progress": dict(progress), **item})
+
+        if progress["succeeded"]:
+            finished = await job_store.transition(
+                job_id, JobStatus.COMPLETED, [JobStatus.RUNNING],
+                result=batch_result(), completed_at=datetime.utcnow()
+            )
+        else:
+            finished = await job_store.transition(
+                job_id, JobStatus.FAILED, [JobStatus.RUNNING],
+                result=batch_result(),
+                error_message=f"All {progress['total']} URLs failed",
+                completed_at=datetime.utcnow()
+            )
+        if not finished:
+            # Cancelled during the last URL: keep the results, as when it stops between URLs
+            await job_store.update(job_id, result=batch_result(), batch_progress=progress)
+
+    except asyncio.CancelledError:
+        # Scheduler shut down mid-batch
+        await job_store.transition(
+            job_id, JobStatus.FAILED, [JobStatus.RUNNING],
+            result=batch_result(),
+            error_message="Batch crawl interrupted by server shutdown",
+            completed_at=datetime.utcnow()
+        )
+        raise
+    except Exception as e:
+        await job_store.transition(
+            job_id, JobStatus.FAILED, [JobStatus.PENDING, JobStatus.RUNNING],
+            result=batch_result(),
+            error_message=str(e),
+            completed_at=datetime.utcnow()
+        )
+    finally:
+        if crawler:
+            await crawler.close()
+        # Lets progress websockets send the final status right away
+        if started:
+            job_events.publish(job_id, {"type": "finished", "job_id": job_id, "progress": dict(progress)})
 
-    This endpoint accepts a URL and configuration options, then starts a background
-    crawl task. Returns a job ID that can be used to check status and retrieve results.
+    return True
+
+
+def job_pages(request: CrawlRequest) -> int:
+    """Pages a job crawls (scheduler estimates are per page)"""
+    return len(request.urls) if isinstance(request, BatchCrawlRequest) else 1
+
+
+def job_runner(job: Dict[str, Any]):
+    """(request, run callable) for a stored job, from its kind and config"""
+    config = job.get("config") or {"url": job["url"]}
+    if job.get("kind") == "batch":
+        request = BatchCrawlRequest(**config)
+        return request, functools.partial(perform_batch_crawl, job["job_id"], request, job.get("user_id"))
+    request = CrawlRequest(**config)
+    return request, functools.partial(perform_crawl, job["job_id"], request, job.get("user_id"))
+
+
+async def requeue_pending_jobs() -> int:
     """
+    Queue pending jobs no live process owns (left by a previous run of the
+    API, released at shutdown, or queued by a worker that died), oldest
+    first. Each job is claimed (compare-and-set on its owner) before it is
+    queued, so exactly one worker process queues it.
+    """
+    jobs = await job_store.list(status=JobStatus.PENDING, limit=crawl_scheduler.max_depth)
+    queued = 0
+    for job in reversed(jobs):
+        owner = job.get("worker_id")
+        if owner and (owner == WORKER_ID or not job_store.is_stale(job)):
+            continue
+        try:
+            crawl_scheduler.ensure_capacity()
+            if not await job_store.claim(job["job_id"], owner):
+                continue
+            request, run = job_runner(job)
+            await crawl_scheduler.submit(job["job_id"], run, request.priority, job_pages(request))
+            queued += 1
+        except QueueFull:
+            break
+        except Exception as e:
+            logger.warning(f"Could not requeue job {job['job_id']}: {e}")
+    if queued:
+        logger.info(f"Requeued {queued} pending crawl jobs")
+    return queued
+
+
+async def run_requeue(interval_seconds: float):
+    """Requeue orphaned pending jobs every interval_seconds (run as a background task)"""
+    while True:
+        try:
+            await requeue_pending_jobs()
+        except Exception as e:
+            logger.warning(f"Could not requeue pending crawl jobs: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def queue_full_error(error: QueueFull) -> HTTPException:
+    """429 telling the client when the queue should have room again"""
+    return HTTPException(
+        status_code=429,
+        detail="Too many crawl jobs queued, try again later",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+async def queue_crawl_job(req: Request, request: CrawlRequest, **extra) -> Dict[str, Any]:
+    """
+    Create a pending job for request and queue it on the worker pool
+
+    Returns:
+        The job ID and the scheduler's queue position and estimated wait
+
+    Raises:
+        HTTPException: 429 with Retry-After when the queue is full
+    """
+    # Reject before creating the job when the queue is already full
+    try:
+        crawl_scheduler.ensure_capacity()
+    except QueueFull as e:
+        raise queue_full_error(e)
+
     # Get user_id from auth middleware
     user_id = getattr(req.state, "user_id", None)
 
@@ -340,7 +528,7 @@ async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks,
     job_id = str(uuid.uuid4())
 
     # Initialize job in storage
-    jobs_storage[job_id] = {
+    job = {
         "job_id": job_id,
         "url": request.url,
         "status": JobStatus.PENDING,
@@ -351,20 +539,79 @@ async def start_crawl(request: CrawlRequest, background_tasks: BackgroundTasks,
         "result": None,
         "error_message": None,
         "retry_count": 0,
-        "user_id": user_id
+        "user_id": user_id,
+        "worker_id": WORKER_ID,
+        "heartbeat_at": datetime.utcnow(),
+        **extra
     }
+    await job_store.create(job)
+
+    # Queue the crawl on the worker pool (pass user_id)
+    request, run = job_runner(job)
+    pages = job_pages(request)
+    try:
+        queued = await crawl_scheduler.submit(job_id, run, request.priority, pages)
+    except QueueFull as e:
+        await job_store.delete(job_id)
+        raise queue_full_error(e)
+
+    return {"job_id": job_id, "pages": pages, **queued}
 
-    # Add crawl task to background tasks (pass user_id)
-    background_tasks.add_task(perform_crawl, job_id, request, user_id)
 
+def queued_response(queued: Dict[str, Any], message: str) -> CrawlResponse:
+    wait = queued["estimated_wait"]
     return CrawlResponse(
-        job_id=job_id,
+        job_id=queued["job_id"],
         status=JobStatus.PENDING,
-        message="Crawl job queued successfully",
-        estimated_time=30
+        message=message if queued["queue_position"] == 0 else f"{message} ({queued['queue_position']} ahead)",
+        estimated_time=round(wait + crawl_scheduler.average_duration * queued["pages"]),
+        queue_position=queued["queue_position"],
+        estimated_start_time=datetime.utcnow() + timedelta(seconds=wait)
     )
 
 
+@router.post("/crawl", response_model=CrawlResponse)
+async def start_crawl(request: CrawlRequest, req: Request):
+    """
+    Start a new crawl job
+
+    This endpoint accepts a URL and configuration options, then queues the
+    crawl on the scheduler's worker pool. Returns a job ID that can be used to
+    check status and retrieve results, with the job's queue position and
+    estimated start time. Answers 429 with Retry-After when the queue is full.
+    """
+    queued = await queue_crawl_job(req, request)
+    return queued_response(queued, "Crawl job queued successfully")
+
+
+@router.post("/crawl/batch", response_model=CrawlResponse)
+async def start_batch_crawl(request: BatchCrawlRequest, req: Request):
+    """
+    Start a batch crawl job over a list of listing URLs
+
+    The URLs are crawled one after another in a single browser session;
+    each listing is parsed, cleaned, analyzed and saved as it is crawled.
+    Per-URL progress and results stream over /ws/progress/{job_id}, and
+    GET /crawl/{job_id}/result returns every item once the job is done.
+    Answers 429 with Retry-After when the queue is full.
+    """
+    # The job's url column holds the source page, or the first listing
+    request.url = request.url or request.urls[0]
+    queued = await queue_crawl_job(req, request, kind="batch")
+    return queued_response(queued, f"Batch crawl of {len(request.urls)} URLs queued successfully")
+
+
+@router.get("/crawl/queue", response_model=Dict[str, Any])
+async def get_crawl_queue():
+    """
+    Crawl worker pool and queue metrics (this API process)
+    """
+    return {
+        "status": "success",
+        "data": crawl_scheduler.metrics()
+    }
+
+
 @router.post("/crawl/quick", response_model=Dict[str, Any])
 async def quick_crawl(request: CrawlRequest):
     """
@@ -396,14 +643,15 @@ async def quick_crawl(request: CrawlRequest):
 @router.get("/crawl/{job_id}/result", response_model=Dict[str, Any])
 async def get_crawl_result(job_id: str):
     """
-    Get the result of a completed crawl job
+    Get the result of a completed crawl job, or the partial result of a
+    cancelled or failed batch job (the items crawled before it stopped)
     """
-    if job_id not in jobs_storage:
+    job = await job_store.get_result(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = jobs_storage[job_id]
-
-    if job["status"] != JobStatus.COMPLETED:
+    stopped = job["status"] in (JobStatus.CANCELLED, JobStatus.FAILED) and job.get("result") is not None
+    if job["status"] != JobStatus.COMPLETED and not stopped:
         raise HTTPException(
             status_code=400,
             detail=f"Job is not completed yet. Current status: {job['status']}"
@@ -426,23 +674,25 @@ async def cancel_crawl(job_id: str):
     """
     Cancel a running crawl job
     """
-    if job_id not in jobs_storage:
-        raise HTTPException(status_code=404, detail="Job not found")
+    # Mark job as cancelled, unless it finished first
+    cancelled = await job_store.transition(
+        job_id, JobStatus.CANCELLED, [JobStatus.PENDING, JobStatus.RUNNING, JobStatus.CANCELLED],
+        completed_at=datetime.utcnow()
+    )
 
-    job = jobs_storage[job_id]
+    crawl_scheduler.cancel(job_id)
 
-    if job["status"] in [JobStatus.COMPLETED, JobStatus.FAILED]:
+    if not cancelled:
+        job = await job_store.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
         raise HTTPException(
             status_code=400,
             detail=f"Cannot cancel job in {job['status']} status"
         )
 
-    # Mark job as cancelled
-    job["status"] = JobStatus.CANCELLED
-    job["completed_at"] = datetime.utcnow()
-
     return {
         "job_id": job_id,
-        "status": job["status"],
+        "status": JobStatus.CANCELLED,
         "message": "Job cancelled successfully"
     }
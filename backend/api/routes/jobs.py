@@ -10,7 +10,8 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from api.models.schemas import JobInfo, JobStatus, CrawlerStats
-from api.routes.crawl import jobs_storage
+from api.services.job_store import job_store
+from api.services.crawl_scheduler import crawl_scheduler
 
 
 router = APIRouter()
@@ -25,17 +26,8 @@ async def list_jobs(
     """
     List all crawl jobs with optional filtering
     """
-    jobs = list(jobs_storage.values())
-
-    # Filter by status if provided
-    if status:
-        jobs = [job for job in jobs if job["status"] == status]
-
-    # Sort by created_at descending (newest first)
-    jobs.sort(key=lambda x: x["created_at"], reverse=True)
-
-    # Apply pagination
-    jobs = jobs[offset:offset + limit]
+    # Newest first, filtered by status if provided
+    jobs = await job_store.list(status=status, limit=limit, offset=offset)
 
     # Convert to JobInfo model
     result = []
@@ -60,11 +52,10 @@ async def get_job(job_id: str):
     """
     Get detailed information about a specific job
     """
-    if job_id not in jobs_storage:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = jobs_storage[job_id]
-
     return JobInfo(
         job_id=job["job_id"],
         url=job["url"],
@@ -83,16 +74,21 @@ async def get_job_status(job_id: str):
     """
     Get the current status of a job
     """
-    if job_id not in jobs_storage:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job = jobs_storage[job_id]
+    return status_payload(job)
+
 
+async def job_snapshot(job_id: str) -> Optional[dict]:
+    """Status payload of a job for the progress websocket (None if it does not exist)"""
+    job = await job_store.get(job_id)
+    if job is None:
+        return None
     return {
-        "job_id": job_id,
-        "status": job["status"],
-        "progress": calculate_progress(job),
-        "message": get_status_message(job)
+        **status_payload(job),
+        "finished": job["status"] in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
     }
 
 
@@ -101,11 +97,9 @@ async def delete_job(job_id: str):
     """
     Delete a job and its results
     """
-    if job_id not in jobs_storage:
+    if not await job_store.delete(job_id):
         raise HTTPException(status_code=404, detail="Job not found")
 
-    del jobs_storage[job_id]
-
     return {
         "job_id": job_id,
         "message": "Job deleted successfully"
@@ -121,19 +115,12 @@ async def delete_all_jobs(
 
     WARNING: Use with caution
     """
-    if status:
-        # Delete only jobs with specific status
-        to_delete = [job_id for job_id, job in jobs_storage.items() if job["status"] == status]
-    else:
-        # Delete all jobs
-        to_delete = list(jobs_storage.keys())
-
-    for job_id in to_delete:
-        del jobs_storage[job_id]
+    # Delete only jobs with specific status, or all jobs
+    deleted_count = await job_store.delete_many(status)
 
     return {
-        "message": f"Deleted {len(to_delete)} jobs",
-        "deleted_count": len(to_delete)
+        "message": f"Deleted {deleted_count} jobs",
+        "deleted_count": deleted_count
     }
 
 
@@ -142,24 +129,21 @@ async def get_stats():
     """
     Get overall crawler statistics
     """
-    jobs = list(jobs_storage.values())
+    stats = await job_store.stats()
+    counts = stats["counts"]
 
-    total_jobs = len(jobs)
-    pending_jobs = sum(1 for job in jobs if job["status"] == JobStatus.PENDING)
-    running_jobs = sum(1 for job in jobs if job["status"] == JobStatus.RUNNING)
-    completed_jobs = sum(1 for job in jobs if job["status"] == JobStatus.COMPLETED)
-    failed_jobs = sum(1 for job in jobs if job["status"] == JobStatus.FAILED)
+    total_jobs = sum(counts.values())
+    pending_jobs = counts.get(JobStatus.PENDING.value, 0)
+    running_jobs = counts.get(JobStatus.RUNNING.value, 0)
+    completed_jobs = counts.get(JobStatus.COMPLETED.value, 0)
+    failed_jobs = counts.get(JobStatus.FAILED.value, 0)
 
     success_rate = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0.0
 
-    # Calculate average response time
-    response_times = []
-    for job in jobs:
-        if job["status"] == JobStatus.COMPLETED and job.get("started_at") and job.get("completed_at"):
-            duration = (job["completed_at"] - job["started_at"]).total_seconds()
-            response_times.append(duration)
-
-    average_response_time = sum(response_times) / len(response_times) if response_times else 0.0
+    # Running counters: average duration of every completed crawl, and
+    # pages crawled including jobs already evicted by retention
+    average_response_time = stats["average_duration"]
+    total_pages_crawled = stats["totals"].get(JobStatus.COMPLETED.value, 0)
 
     return CrawlerStats(
         total_jobs=total_jobs,
@@ -169,10 +153,36 @@ async def get_stats():
         failed_jobs=failed_jobs,
         success_rate=success_rate,
         average_response_time=average_response_time,
-        total_pages_crawled=completed_jobs
+        total_pages_crawled=total_pages_crawled
     )
 
 
+@router.get("/stats/storage")
+async def get_storage_stats():
+    """
+    Job store usage: stored jobs and bytes, result blobs on disk,
+    retention limits and evictions
+    """
+    return {
+        "status": "success",
+        "data": await job_store.storage()
+    }
+
+
+def status_payload(job: dict) -> dict:
+    """Status, progress and queue position of a job (batch jobs add their per-URL counts)"""
+    payload = {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "progress": calculate_progress(job),
+        "message": get_status_message(job),
+        "queue_position": crawl_scheduler.position(job["job_id"])
+    }
+    if job.get("kind") == "batch":
+        payload["batch"] = job.get("batch_progress")
+    return payload
+
+
 def calculate_progress(job: dict) -> float:
     """Calculate job progress percentage"""
     status = job["status"]
@@ -180,7 +190,10 @@ def calculate_progress(job: dict) -> float:
     if status == JobStatus.PENDING:
         return 0.0
     elif status == JobStatus.RUNNING:
-        # Could be enhanced with actual task progress
+        # Batch jobs count finished URLs; a single crawl has no finer steps
+        batch = job.get("batch_progress")
+        if batch and batch.get("total"):
+            return round(batch["done"] / batch["total"] * 100, 1)
         return 50.0
     elif status in [JobStatus.COMPLETED, JobStatus.CANCELLED]:
         return 100.0
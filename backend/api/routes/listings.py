@@ -3,25 +3,41 @@ Listings API Routes
 Endpoints for fetching and managing user's crawled car listings
 """
 from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import asyncio
+import json
 import sys
 import os
+import time
 
 # Add parent directories to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from config.settings import settings
 from loguru import logger
+from api.services.scoring_executor import scoring_executor, score_statistical
+from api.services.analysis_pipeline import run_hybrid_analysis, run_bulk_analysis
+from api.models.schemas import BulkAnalyzeRequest
+from api.services.http_cache import conditional_json
 
-# Import buyability prediction function
+# Import buyability model metadata (model artifacts are loaded lazily on first use)
 try:
-    from src.predict_buyability import predict_buyability
+    from src.predict_buyability import MODEL_NAME, COMPILED_MODEL_NAME
+    from src.model_registry import model_registry
     BUYABILITY_MODEL_AVAILABLE = True
 except Exception as e:
     logger.warning(f"Buyability model not available: {e}")
     BUYABILITY_MODEL_AVAILABLE = False
 
+
+def is_buyability_model_available() -> bool:
+    """Check that the prediction code imported and the model artifacts exist"""
+    return BUYABILITY_MODEL_AVAILABLE and (
+        model_registry.is_available(COMPILED_MODEL_NAME) or model_registry.is_available(MODEL_NAME)
+    )
+
 router = APIRouter()
 
 # Fields to return to frontend (cleaned data only)
@@ -36,6 +52,25 @@ CLEAN_FIELDS = [
     'buyability_score', 'statistical_analysis', 'llm_analysis', 'crash_score_analysis'
 ]
 
+# Firestore field paths per view, so list pages only read what the cards
+# render (nested paths keep just those sub-fields of the analysis maps)
+LIST_FIELDS = [
+    'listing_id', 'brand', 'series', 'model', 'title', 'year', 'price', 'mileage',
+    'fuel_type', 'transmission', 'location', 'images', 'data_quality_score',
+    'user_id', 'crawled_at', 'buyability_score',
+    'statistical_analysis.risk_score', 'llm_analysis.scores.mechanical_score',
+    'crash_score_analysis.score'
+]
+DETAIL_FIELDS = [field for field in CLEAN_FIELDS if field != 'id']
+
+# Fields needed to check ownership and run the statistical model
+OWNER_FIELDS = ['user_id']
+ANALYZE_FIELDS = ['user_id', 'year', 'mileage', 'engine_volume', 'engine_power']
+BULK_ANALYZE_FIELDS = [
+    'user_id', 'year', 'mileage', 'engine_volume', 'engine_power', 'brand', 'series',
+    'model', 'fuel_type', 'transmission', 'body_type', 'drive_type', 'price', 'painted_parts'
+]
+
 
 def filter_clean_data(listing: Dict[str, Any]) -> Dict[str, Any]:
     """Filter listing to return only cleaned fields"""
@@ -54,11 +89,13 @@ def filter_clean_data(listing: Dict[str, Any]) -> Dict[str, Any]:
     return clean
 
 
-def get_firebase_repo():
-    """Get Firebase repository instance"""
+async def get_firebase_repo():
+    """Get the shared Firebase repository (awaitable methods, started in the app lifespan)"""
     try:
-        from storage.firebase_repository import FirestoreRepository
-        return FirestoreRepository()
+        from storage.async_repository import firestore_repository
+        if not firestore_repository.started:
+            await asyncio.to_thread(firestore_repository.start)
+        return firestore_repository
     except Exception as e:
         logger.error(f"Failed to initialize Firebase repository: {str(e)}")
         raise HTTPException(status_code=500, detail="Database connection failed")
@@ -68,54 +105,132 @@ def get_firebase_repo():
 async def get_listings(
     user_id: str = Header(..., description="User ID from Firebase"),
     limit: int = Query(50, ge=1, le=200),
-    skip: int = Query(0, ge=0)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated, use cursor"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Get user's car listings from Firestore
+    Get user's car listings from Firestore, newest first
 
     - **user_id**: Firebase user ID (from Authorization header)
     - **limit**: Maximum number of listings to return (1-200)
-    - **skip**: Number of listings to skip for pagination
+    - **cursor**: Opaque cursor from the previous response's next_cursor
+    - **skip**: Deprecated offset pagination (reads skip + limit documents)
+
+    Responses carry an ETag and are revalidated on every use (new crawls
+    change the first page); an unchanged page is answered with 304.
     """
     try:
         logger.info(f"Fetching listings for user_id: {user_id}")
-        repo = get_firebase_repo()
-        listings = repo.list_listings(
-            user_id=user_id,
-            limit=limit + skip  # Account for skip
-        )
-        logger.info(f"Found {len(listings)} listings for user {user_id}")
+        repo = await get_firebase_repo()
 
-        # Apply skip
-        listings = listings[skip:skip + limit]
+        if skip and not cursor:
+            # Legacy offset pagination
+            listings = (await repo.list_listings(user_id=user_id, limit=limit + skip, fields=LIST_FIELDS))[skip:skip + limit]
+            next_cursor = None
+        else:
+            try:
+                listings, next_cursor = await repo.list_listings_page(
+                    user_id=user_id, limit=limit, cursor=cursor, fields=LIST_FIELDS
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        logger.info(f"Found {len(listings)} listings for user {user_id}")
 
         # Filter to return only cleaned data
         clean_listings = [filter_clean_data(l) for l in listings]
 
+        return conditional_json({
+            "status": "success",
+            "count": len(clean_listings),
+            "next_cursor": next_cursor,
+            "data": clean_listings
+        }, if_none_match, "private, no-cache")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching listings for user {user_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Registered before /listings/{listing_id}, which would otherwise match /listings/search
+@router.get("/listings/search", tags=["Listings"])
+async def search_listings(
+    user_id: str = Header(..., description="User ID from Firebase"),
+    brand: Optional[str] = Query(None),
+    min_year: Optional[int] = Query(None),
+    max_year: Optional[int] = Query(None),
+    min_price: Optional[float] = Query(None),
+    max_price: Optional[float] = Query(None),
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    Search user's listings with filters
+
+    - **user_id**: Firebase user ID (from Authorization header)
+    - **brand**: Filter by car brand
+    - **min_year**: Filter by minimum year
+    - **max_year**: Filter by maximum year
+    - **min_price**: Filter by minimum price
+    - **max_price**: Filter by maximum price
+    - **limit**: Maximum number of results
+    """
+    try:
+        from storage.firestore_query import ListingQuery
+
+        repo = await get_firebase_repo()
+
+        # Filters, ordering and limit run in Firestore when an index serves them
+        filtered, query_plan = await repo.search_listings(ListingQuery(
+            user_id=user_id,
+            brand=brand,
+            min_year=min_year,
+            max_year=max_year,
+            min_price=min_price,
+            max_price=max_price,
+            limit=limit,
+            fields=LIST_FIELDS
+        ))
+
+        # Filter to return only cleaned data
+        clean_listings = [filter_clean_data(l) for l in filtered]
+
         return {
             "status": "success",
             "count": len(clean_listings),
+            "filters_applied": {
+                "brand": brand,
+                "min_year": min_year,
+                "max_year": max_year,
+                "min_price": min_price,
+                "max_price": max_price
+            },
+            "query_plan": query_plan,
             "data": clean_listings
         }
     except Exception as e:
-        logger.error(f"Error fetching listings for user {user_id}: {str(e)}")
+        logger.error(f"Error searching listings for user {user_id}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/listings/{listing_id}", tags=["Listings"])
 async def get_listing(
     listing_id: str,
-    user_id: str = Header(..., description="User ID from Firebase")
+    user_id: str = Header(..., description="User ID from Firebase"),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Get a specific car listing by ID
 
     - **listing_id**: The listing ID (ilan_no from sahibinden)
     - **user_id**: Firebase user ID (from Authorization header)
+
+    Browsers revalidate the response on every use with If-None-Match
+    (304 when unchanged), so edits and re-crawls show up immediately.
     """
     try:
-        repo = get_firebase_repo()
-        listing = repo.get_by_listing_id(listing_id)
+        repo = await get_firebase_repo()
+        listing = await repo.get_by_listing_id(listing_id, fields=DETAIL_FIELDS)
 
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
@@ -124,10 +239,10 @@ async def get_listing(
         if listing.get('user_id') != user_id:
             raise HTTPException(status_code=403, detail="Unauthorized")
 
-        return {
+        return conditional_json({
             "status": "success",
             "data": filter_clean_data(listing)
-        }
+        }, if_none_match, "private, no-cache")
     except HTTPException:
         raise
     except Exception as e:
@@ -147,8 +262,8 @@ async def delete_listing(
     - **user_id**: Firebase user ID (from Authorization header)
     """
     try:
-        repo = get_firebase_repo()
-        listing = repo.get_by_listing_id(listing_id)
+        repo = await get_firebase_repo()
+        listing = await repo.get_by_listing_id(listing_id, fields=OWNER_FIELDS)
 
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
@@ -158,7 +273,7 @@ async def delete_listing(
             raise HTTPException(status_code=403, detail="Unauthorized")
 
         # Delete the listing
-        success = repo.delete_listing(listing_id)
+        success = await repo.delete_listing(listing_id)
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to delete listing")
@@ -184,54 +299,10 @@ async def get_listings_stats(
     - **user_id**: Firebase user ID (from Authorization header)
     """
     try:
-        repo = get_firebase_repo()
-        listings = repo.list_listings(user_id=user_id, limit=1000)
-
-        if not listings:
-            return {
-                "status": "success",
-                "data": {
-                    "total_listings": 0,
-                    "avg_price": 0,
-                    "avg_quality_score": 0,
-                    "price_range": {"min": 0, "max": 0},
-                    "year_range": {"min": 0, "max": 0}
-                }
-            }
+        repo = await get_firebase_repo()
 
-        # Calculate statistics
-        total_listings = len(listings)
-        total_price = 0
-        price_count = 0
-        total_quality = 0
-        prices = []
-        years = []
-
-        for listing in listings:
-            if listing.get('price'):
-                total_price += listing['price']
-                price_count += 1
-                prices.append(listing['price'])
-
-            if listing.get('data_quality_score'):
-                total_quality += listing['data_quality_score']
-
-            if listing.get('year'):
-                years.append(listing['year'])
-
-        stats = {
-            "total_listings": total_listings,
-            "avg_price": total_price / price_count if price_count > 0 else 0,
-            "avg_quality_score": total_quality / total_listings if total_listings > 0 else 0,
-            "price_range": {
-                "min": min(prices) if prices else 0,
-                "max": max(prices) if prices else 0
-            },
-            "year_range": {
-                "min": min(years) if years else 0,
-                "max": max(years) if years else 0
-            }
-        }
+        # One aggregate document read, maintained on listing writes/deletes
+        stats = await repo.get_user_stats(user_id)
 
         return {
             "status": "success",
@@ -242,72 +313,14 @@ async def get_listings_stats(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/listings/search", tags=["Listings"])
-async def search_listings(
-    user_id: str = Header(..., description="User ID from Firebase"),
-    brand: Optional[str] = Query(None),
-    min_year: Optional[int] = Query(None),
-    max_year: Optional[int] = Query(None),
-    min_price: Optional[float] = Query(None),
-    max_price: Optional[float] = Query(None),
-    limit: int = Query(50, ge=1, le=200)
-):
-    """
-    Search user's listings with filters
-
-    - **user_id**: Firebase user ID (from Authorization header)
-    - **brand**: Filter by car brand
-    - **min_year**: Filter by minimum year
-    - **max_year**: Filter by maximum year
-    - **min_price**: Filter by minimum price
-    - **max_price**: Filter by maximum price
-    - **limit**: Maximum number of results
-    """
-    try:
-        repo = get_firebase_repo()
-
-        # Get all user listings first
-        listings = repo.list_listings(user_id=user_id, limit=1000)
-
-        # Apply filters
-        filtered = listings
-
-        if brand:
-            filtered = [l for l in filtered if l.get('brand', '').lower() == brand.lower()]
-
-        if min_year:
-            filtered = [l for l in filtered if l.get('year', 0) >= min_year]
-
-        if max_year:
-            filtered = [l for l in filtered if l.get('year', 9999) <= max_year]
-
-        if min_price is not None:
-            filtered = [l for l in filtered if l.get('price', 0) >= min_price]
-
-        if max_price is not None:
-            filtered = [l for l in filtered if l.get('price', float('inf')) <= max_price]
-
-        # Apply limit
-        filtered = filtered[:limit]
-
-        # Filter to return only cleaned data
-        clean_listings = [filter_clean_data(l) for l in filtered]
-
-        return {
-            "status": "success",
-            "count": len(clean_listings),
-            "filters_applied": {
-                "brand": brand,
-                "min_year": min_year,
-                "max_year": max_year,
-                "min_price": min_price,
-                "max_price": max_price
-            },
-            "data": clean_listings
-        }
-    except Exception as e:
-        logger.error(f"Error searching listings for user {user_id}: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+@router.get("/listings/cache/metrics", tags=["Listings"])
+async def get_listing_cache_metrics():
+    """Hit rate and memory use of the listing detail cache"""
+    from storage.async_repository import firestore_repository
+    return {
+        "status": "success",
+        "data": firestore_repository.cache_metrics()
+    }
 
 
 @router.post("/listings/{listing_id}/analyze", tags=["Listings"])
@@ -325,15 +338,15 @@ async def analyze_listing(
     - **listing_id**: The listing ID to analyze
     - **user_id**: Firebase user ID (from Authorization header)
     """
-    if not BUYABILITY_MODEL_AVAILABLE:
+    if not is_buyability_model_available():
         raise HTTPException(
             status_code=503,
             detail="Buyability model not available. Please train the model first."
         )
 
     try:
-        repo = get_firebase_repo()
-        listing = repo.get_by_listing_id(listing_id)
+        repo = await get_firebase_repo()
+        listing = await repo.get_by_listing_id(listing_id, fields=ANALYZE_FIELDS)
 
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
@@ -357,8 +370,8 @@ async def analyze_listing(
                 detail="Listing missing required fields (year, mileage) for analysis"
             )
 
-        # Get buyability prediction
-        analysis = predict_buyability(sample)
+        # Get buyability prediction (off the event loop)
+        analysis = await scoring_executor.run(score_statistical, sample)
 
         return {
             "status": "success",
@@ -388,8 +401,8 @@ async def save_listing_analysis(
     - **user_id**: Firebase user ID (from Authorization header)
     """
     try:
-        repo = get_firebase_repo()
-        listing = repo.get_by_listing_id(listing_id)
+        repo = await get_firebase_repo()
+        listing = await repo.get_by_listing_id(listing_id, fields=OWNER_FIELDS)
 
         if not listing:
             raise HTTPException(status_code=404, detail="Listing not found")
@@ -398,23 +411,16 @@ async def save_listing_analysis(
         if listing.get('user_id') != user_id:
             raise HTTPException(status_code=403, detail="Unauthorized")
 
-        # Update listing with analysis results
-        listing.update({
+        # Save analysis results to Firestore
+        updated = await repo.update_listing_fields(listing_id, {
             'buyability_score': analysis_data.get('buyability_score'),
             'statistical_analysis': analysis_data.get('statistical_analysis'),
             'llm_analysis': analysis_data.get('llm_analysis'),
             'crash_score_analysis': analysis_data.get('crash_score_analysis'),
-            'updated_at': datetime.utcnow()
         })
 
-        # Save back to Firestore
-        repo.db.collection('car_listings').document(listing_id).update({
-            'buyability_score': analysis_data.get('buyability_score'),
-            'statistical_analysis': analysis_data.get('statistical_analysis'),
-            'llm_analysis': analysis_data.get('llm_analysis'),
-            'crash_score_analysis': analysis_data.get('crash_score_analysis'),
-            'updated_at': datetime.utcnow()
-        })
+        if not updated:
+            raise HTTPException(status_code=500, detail="Failed to save analysis results")
 
         logger.success(f"Saved analysis results for listing {listing_id}")
 
@@ -471,14 +477,14 @@ async def analyze_car_direct(
 
     No authentication required.
     """
-    if not BUYABILITY_MODEL_AVAILABLE:
+    if not is_buyability_model_available():
         raise HTTPException(
             status_code=503,
             detail="Buyability model not available. Please train the model first."
         )
 
     try:
-        # ===== 1. STATISTICAL ANALYSIS (existing model) =====
+        # Statistical model input
         sample = {
             "Model Yıl": year,
             "Km": mileage,
@@ -486,12 +492,6 @@ async def analyze_car_direct(
             "Beygir Gucu": engine_power if engine_power else "100"
         }
 
-        # Get statistical buyability prediction
-        statistical_result = predict_buyability(sample)
-
-        # ===== 2. LLM MECHANICAL ANALYSIS (new) =====
-        llm_result = None
-
         # Build comprehensive car data for LLM
         car_data = {
             "Model Yıl": year,
@@ -508,20 +508,6 @@ async def analyze_car_direct(
             "fiyat": price
         }
 
-        # Only call LLM if we have enough data (at least make and model)
-        if make or model:
-            try:
-                from api.services.llm_service import llm_analyzer
-                llm_result = await llm_analyzer.analyze_mechanical_reliability(car_data)
-            except Exception as llm_error:
-                logger.warning(f"LLM analysis failed: {llm_error}")
-                # Continue without LLM analysis - graceful degradation
-        else:
-            logger.info("Skipping LLM analysis - no make/model provided")
-
-        # ===== 3. CRASH SCORE ANALYSIS (new) =====
-        crash_score_result = None
-
         # Parse comma-separated parts lists
         parsed_painted = [p.strip() for p in painted_parts.split(',')] if painted_parts else None
         parsed_changed = [p.strip() for p in changed_parts.split(',')] if changed_parts else None
@@ -530,62 +516,17 @@ async def analyze_car_direct(
         # Validate language parameter
         lang = language if language in ("en", "tr") else "en"
 
-        # Calculate crash score if any parts data is provided
-        if parsed_painted or parsed_changed or parsed_local_painted:
-            try:
-                from api.services.crash_score_service import calculate_crash_score, crash_score_to_dict
-                crash_result = calculate_crash_score(
-                    painted_parts=parsed_painted,
-                    changed_parts=parsed_changed,
-                    local_painted_parts=parsed_local_painted,
-                    language=lang
-                )
-                crash_score_result = crash_score_to_dict(crash_result)
-            except Exception as crash_error:
-                logger.warning(f"Crash score calculation failed: {crash_error}")
-                # Continue without crash score - graceful degradation
-        else:
-            # No parts data provided - return perfect score (100)
-            if lang == "tr":
-                crash_score_result = {
-                    "score": 100,
-                    "total_deduction": 0,
-                    "deductions": [],
-                    "summary": "Boyali veya degisen parca bilgisi mevcut degil. Arac orijinal durumda kabul edildi.",
-                    "risk_level": "Bilinmiyor",
-                    "verdict": "Parca bilgisi yok - Orijinal kabul edildi"
-                }
-            else:
-                crash_score_result = {
-                    "score": 100,
-                    "total_deduction": 0,
-                    "deductions": [],
-                    "summary": "No painted or changed parts information available. Vehicle assumed to be in original condition.",
-                    "risk_level": "Unknown",
-                    "verdict": "No parts info - Assumed original"
-                }
-
-        # ===== 4. CALCULATE BUYABILITY SCORE =====
-        # Extract individual scores for buyability calculation
-        statistical_score = statistical_result.get('risk_score') if statistical_result else None
-        mechanical_score_val = None
-        if llm_result and llm_result.get('scores'):
-            mechanical_score_val = llm_result['scores'].get('mechanical_score')
-        crash_score_val = crash_score_result.get('score') if crash_score_result else None
-
-        # Calculate comprehensive buyability score
-        buyability_result = None
-        try:
-            from api.services.buyability_score_service import calculate_buyability_score, buyability_score_to_dict
-            buyability_calc = calculate_buyability_score(
-                statistical_score=statistical_score,
-                mechanical_score=mechanical_score_val,
-                crash_score=crash_score_val
-            )
-            buyability_result = buyability_score_to_dict(buyability_calc)
-        except Exception as buyability_error:
-            logger.warning(f"Buyability score calculation failed: {buyability_error}")
-            # Continue without buyability score - graceful degradation
+        # ===== 1-4. STATISTICAL + LLM + CRASH (concurrent), THEN BUYABILITY SCORE =====
+        # LLM is only called if we have enough data (at least make or model)
+        analysis = await run_hybrid_analysis(
+            sample,
+            car_data,
+            painted_parts=parsed_painted,
+            changed_parts=parsed_changed,
+            local_painted_parts=parsed_local_painted,
+            language=lang,
+            with_llm=bool(make or model)
+        )
 
         # ===== 5. BUILD HYBRID RESPONSE =====
         from datetime import datetime
@@ -609,10 +550,11 @@ async def analyze_car_direct(
                 "changed_parts": parsed_changed,
                 "local_painted_parts": parsed_local_painted
             },
-            "buyability_score": buyability_result,
-            "statistical_analysis": statistical_result,
-            "llm_analysis": llm_result,
-            "crash_score_analysis": crash_score_result,
+            "buyability_score": analysis["buyability_score"],
+            "statistical_analysis": analysis["statistical_analysis"],
+            "llm_analysis": analysis["llm_analysis"],
+            "crash_score_analysis": analysis["crash_score_analysis"],
+            "timing": analysis["timing"],
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -623,3 +565,171 @@ async def analyze_car_direct(
     except Exception as e:
         logger.error(f"Error analyzing car: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _bulk_entry(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build run_hybrid_analysis inputs from bulk item fields
+    (BulkAnalyzeItem names; stored listings are mapped onto them)
+    """
+    year = fields.get('year')
+    mileage = fields.get('mileage')
+    if year is None or mileage is None:
+        raise ValueError("Missing required fields (year, mileage) for analysis")
+
+    return {
+        "sample": {
+            "Model Yıl": year,
+            "Km": mileage,
+            "CCM": fields.get('engine_volume') or "1500",
+            "Beygir Gucu": fields.get('engine_power') or "100"
+        },
+        "car_data": {
+            "Model Yıl": year,
+            "Km": mileage,
+            "marka": fields.get('make'),
+            "seri": fields.get('series'),
+            "model": fields.get('model'),
+            "yakit_tipi": fields.get('fuel_type'),
+            "vites": fields.get('transmission'),
+            "kasa_tipi": fields.get('body_type'),
+            "motor_hacmi": fields.get('engine_volume'),
+            "motor_gucu": fields.get('engine_power'),
+            "cekis": fields.get('drive_type'),
+            "fiyat": fields.get('price')
+        },
+        "painted_parts": fields.get('painted_parts') or None,
+        "changed_parts": fields.get('changed_parts') or None,
+        "local_painted_parts": fields.get('local_painted_parts') or None,
+        "with_llm": bool(fields.get('make') or fields.get('model'))
+    }
+
+
+def _listing_fields(listing: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a stored listing onto bulk item fields"""
+    parts = listing.get('painted_parts')
+    parts = parts if isinstance(parts, dict) else {}
+    return {
+        "year": listing.get('year'),
+        "mileage": listing.get('mileage'),
+        "engine_volume": listing.get('engine_volume'),
+        "engine_power": listing.get('engine_power'),
+        "make": listing.get('brand'),
+        "series": listing.get('series'),
+        "model": listing.get('model'),
+        "fuel_type": listing.get('fuel_type'),
+        "transmission": listing.get('transmission'),
+        "body_type": listing.get('body_type'),
+        "drive_type": listing.get('drive_type'),
+        "price": listing.get('price'),
+        "painted_parts": parts.get('boyali'),
+        "changed_parts": parts.get('degisen'),
+        "local_painted_parts": parts.get('lokal_boyali')
+    }
+
+
+def _ndjson(line: Dict[str, Any]) -> str:
+    return json.dumps(line, ensure_ascii=False, default=str) + "\n"
+
+
+@router.post("/analyze/bulk", tags=["Listings"])
+async def analyze_bulk(
+    request: BulkAnalyzeRequest,
+    user_id: Optional[str] = Header(None, description="User ID from Firebase (required for listing_id items)")
+):
+    """
+    Hybrid analysis for many cars at once, streamed as NDJSON.
+
+    Each item is either a stored listing (**listing_id**, must belong to the
+    user) or raw specs (same fields as POST /analyze, year and mileage
+    required). Stored listings are fetched in one batched read and all
+    statistical scores are computed in one vectorized pass; LLM calls run
+    with bounded concurrency.
+
+    Streams one JSON line per item as it completes
+    (`{"index", "listing_id", "status": "success" | "error", ...}`),
+    followed by a final `{"status": "complete", "summary": {...}}` line.
+    An item whose statistical scoring failed is an error (with its other
+    analysis results attached) and counts as failed in the summary.
+    """
+    if not is_buyability_model_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Buyability model not available. Please train the model first."
+        )
+
+    if len(request.items) > settings.BULK_ANALYZE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items ({len(request.items)}), maximum is {settings.BULK_ANALYZE_MAX_ITEMS}"
+        )
+
+    lang = request.language if request.language in ("en", "tr") else "en"
+    start = time.perf_counter()
+
+    # One batched read for every stored listing in the request
+    listing_ids = [item.listing_id for item in request.items if item.listing_id]
+    listings: Dict[str, Dict[str, Any]] = {}
+    if listing_ids and user_id:
+        repo = await get_firebase_repo()
+        listings = await repo.get_many(listing_ids, fields=BULK_ANALYZE_FIELDS)
+
+    entries: List[Dict[str, Any]] = []
+    entry_items: List[tuple] = []
+    errors: List[Dict[str, Any]] = []
+
+    for index, item in enumerate(request.items):
+        try:
+            if item.listing_id:
+                if not user_id:
+                    raise ValueError("user_id header required for listing_id items")
+                listing = listings.get(item.listing_id)
+                if not listing:
+                    raise ValueError("Listing not found")
+                if listing.get('user_id') != user_id:
+                    raise ValueError("Unauthorized")
+                fields = _listing_fields(listing)
+            else:
+                fields = item.model_dump(exclude={"listing_id"})
+
+            entry = _bulk_entry(fields)
+            if not request.include_llm:
+                entry["with_llm"] = False
+            entries.append(entry)
+            entry_items.append((index, item.listing_id))
+        except ValueError as e:
+            errors.append({"index": index, "listing_id": item.listing_id, "status": "error", "detail": str(e)})
+
+    logger.info(
+        f"Bulk analysis: {len(entries)} items to analyze, {len(errors)} rejected, "
+        f"{len(listings)}/{len(listing_ids)} listings fetched"
+    )
+
+    async def stream():
+        succeeded = 0
+        failed = len(errors)
+        for error in errors:
+            yield _ndjson(error)
+
+        async for position, analysis in run_bulk_analysis(entries, lang, settings.BULK_ANALYZE_LLM_CONCURRENCY):
+            index, listing_id = entry_items[position]
+            if analysis["statistical_analysis"] is None:
+                failed += 1
+                status = analysis["timing"]["statistical"]["status"]
+                detail = "Statistical scoring timed out" if status == "timeout" else "Statistical scoring failed"
+                yield _ndjson({"index": index, "listing_id": listing_id, "status": "error", "detail": detail, **analysis})
+                continue
+            succeeded += 1
+            yield _ndjson({"index": index, "listing_id": listing_id, "status": "success", **analysis})
+
+        yield _ndjson({
+            "status": "complete",
+            "summary": {
+                "total": len(request.items),
+                "succeeded": succeeded,
+                "failed": failed,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+            }
+        })
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
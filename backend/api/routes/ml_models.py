@@ -0,0 +1,130 @@
+"""
+Model Registry API Routes
+Inspect loaded model bundles and hot-reload them without restarting the API
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Optional
+import asyncio
+import sys
+import os
+
+# Add parent directories to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loguru import logger
+from api.services.scoring_executor import scoring_executor
+from middleware.auth_middleware import require_admin
+
+try:
+    from src.model_registry import model_registry, ModelNotAvailableError
+    MODEL_REGISTRY_AVAILABLE = True
+except Exception as e:
+    logger.warning(f"Model registry not available: {e}")
+    MODEL_REGISTRY_AVAILABLE = False
+
+
+router = APIRouter()
+
+
+@router.get("/models")
+async def get_models():
+    """
+    Get availability, load state and version of every model bundle
+    """
+    if not MODEL_REGISTRY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Model registry not available")
+
+    return {
+        "status": "success",
+        "data": model_registry.status()
+    }
+
+
+@router.post("/models/reload", dependencies=[Depends(require_admin)])
+async def reload_models(
+    name: Optional[str] = Query(None, description="Bundle to reload (all available bundles if omitted)")
+):
+    """
+    Hot-reload model bundles from disk (admin only)
+
+    The previous bundle keeps serving requests until the new one has loaded.
+    """
+    if not MODEL_REGISTRY_AVAILABLE:
+        raise HTTPException(status_code=503, detail="Model registry not available")
+
+    try:
+        # Unpickling is CPU-bound, keep it off the event loop
+        versions = await asyncio.to_thread(model_registry.reload, name)
+    except ModelNotAvailableError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    # Process workers hold their own copies of the models
+    if scoring_executor.mode == "process":
+        await scoring_executor.restart()
+
+    logger.success(f"Reloaded model bundles: {versions}")
+
+    return {
+        "status": "success",
+        "versions": versions
+    }
+
+
+@router.get("/models/executor")
+async def get_executor_metrics():
+    """
+    Get scoring executor queue depth and per-task latency
+    """
+    return {
+        "status": "success",
+        "data": scoring_executor.metrics()
+    }
+
+
+@router.get("/models/llm")
+async def get_llm_stats():
+    """
+    Get LLM request counters, including requests coalesced into one in flight
+    """
+    from api.services.llm_service import llm_analyzer
+
+    return {
+        "status": "success",
+        "data": llm_analyzer.stats()
+    }
+
+
+@router.get("/models/llm-cache")
+async def get_llm_cache_stats():
+    """
+    Get LLM analysis cache size and hit/miss counters
+    """
+    from api.services.llm_service import llm_analyzer
+
+    return {
+        "status": "success",
+        "data": {
+            "enabled": llm_analyzer.cache is not None,
+            "version": llm_analyzer.cache_version,
+            **(llm_analyzer.cache.stats() if llm_analyzer.cache else {})
+        }
+    }
+
+
+@router.delete("/models/llm-cache", dependencies=[Depends(require_admin)])
+async def clear_llm_cache():
+    """
+    Drop every cached LLM analysis (admin only)
+    """
+    from api.services.llm_service import llm_analyzer
+
+    if llm_analyzer.cache is None:
+        raise HTTPException(status_code=404, detail="LLM cache is disabled")
+
+    deleted = await asyncio.to_thread(llm_analyzer.cache.clear)
+    logger.info(f"Cleared {deleted} cached LLM analyses")
+
+    return {
+        "status": "success",
+        "deleted": deleted
+    }
@@ -0,0 +1,237 @@
+"""
+Hybrid Analysis Pipeline
+
+Runs the statistical model, LLM mechanical analysis and crash score
+concurrently, each under its own timeout, then combines whatever finished
+into the buyability score. Used by POST /analyze and by the crawler's
+post-crawl analysis.
+
+Bulk analysis scores every sample statistically in one vectorized call,
+bounds the LLM calls a single request may have in flight and yields
+per-item results as they complete.
+"""
+import asyncio
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+from api.services.scoring_executor import (
+    scoring_executor, score_statistical, score_statistical_batch, score_crash, score_buyability
+)
+
+
+def default_crash_score(language: str = "en") -> Dict[str, Any]:
+    """Crash score when no painted/changed parts information is available"""
+    if language == "tr":
+        return {
+            "score": 100,
+            "total_deduction": 0,
+            "deductions": [],
+            "summary": "Boyali veya degisen parca bilgisi mevcut degil. Arac orijinal durumda kabul edildi.",
+            "risk_level": "Bilinmiyor",
+            "verdict": "Parca bilgisi yok - Orijinal kabul edildi"
+        }
+    return {
+        "score": 100,
+        "total_deduction": 0,
+        "deductions": [],
+        "summary": "No painted or changed parts information available. Vehicle assumed to be in original condition.",
+        "risk_level": "Unknown",
+        "verdict": "No parts info - Assumed original"
+    }
+
+
+async def _run_component(
+    name: str,
+    run: Callable[[], Awaitable[Any]],
+    timeout: float
+) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Await one analysis component under a timeout.
+
+    Failures and timeouts are logged and yield None, so the other
+    components can still be combined.
+
+    Returns:
+        (result or None, timing entry with status and duration_ms)
+    """
+    start = time.perf_counter()
+    status = "ok"
+    result = None
+    try:
+        result = await asyncio.wait_for(run(), timeout=timeout)
+    except asyncio.TimeoutError:
+        status = "timeout"
+        logger.warning(f"{name} analysis timed out after {timeout}s")
+    except Exception as e:
+        status = "error"
+        logger.warning(f"{name} analysis failed: {e}")
+
+    return result, {
+        "status": status,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 1)
+    }
+
+
+async def _skipped() -> Tuple[None, Dict[str, Any]]:
+    """Placeholder for a component that has nothing to analyze"""
+    return None, {"status": "skipped", "duration_ms": 0.0}
+
+
+async def _precomputed(component: Tuple[Any, Dict[str, Any]]) -> Tuple[Any, Dict[str, Any]]:
+    """A component result computed ahead of time (e.g. in a batch)"""
+    return component
+
+
+async def run_hybrid_analysis(
+    sample: Dict[str, Any],
+    car_data: Dict[str, Any],
+    painted_parts: Optional[List[str]] = None,
+    changed_parts: Optional[List[str]] = None,
+    local_painted_parts: Optional[List[str]] = None,
+    language: str = "en",
+    with_llm: bool = True,
+    statistical: Optional[Tuple[Any, Dict[str, Any]]] = None,
+    llm_slots: Optional[asyncio.Semaphore] = None
+) -> Dict[str, Any]:
+    """
+    Run statistical, LLM and crash analysis concurrently and combine them.
+
+    Args:
+        sample: Statistical model input (Model Yıl, Km, CCM, Beygir Gucu)
+        car_data: Listing fields for the LLM prompt
+        painted_parts, changed_parts, local_painted_parts: Parts lists for the crash score
+        language: Language for crash score texts ("en" or "tr")
+        with_llm: Whether there is enough data (make/model) to ask the LLM
+        statistical: Precomputed (result, timing) of the statistical component,
+            skips running the model for this sample
+        llm_slots: Semaphore bounding concurrent LLM calls; the LLM timeout
+            starts once a slot is acquired
+
+    Returns:
+        Dictionary with buyability_score, statistical_analysis, llm_analysis,
+        crash_score_analysis and per-component timing
+    """
+    start = time.perf_counter()
+    has_parts = bool(painted_parts or changed_parts or local_painted_parts)
+
+    async def statistical_model():
+        return await scoring_executor.run(score_statistical, sample)
+
+    async def llm():
+        from api.services.llm_service import llm_analyzer
+        return await llm_analyzer.analyze_mechanical_reliability(car_data)
+
+    async def llm_component():
+        if llm_slots is None:
+            return await _run_component("LLM", llm, settings.ANALYSIS_LLM_TIMEOUT)
+        async with llm_slots:
+            return await _run_component("LLM", llm, settings.ANALYSIS_LLM_TIMEOUT)
+
+    async def crash():
+        return await scoring_executor.run(
+            score_crash, painted_parts, changed_parts, local_painted_parts, language
+        )
+
+    if not with_llm:
+        logger.info("Skipping LLM analysis - no make/model provided")
+
+    (statistical_result, statistical_timing), (llm_result, llm_timing), (crash_score_result, crash_timing) = await asyncio.gather(
+        _precomputed(statistical) if statistical else _run_component(
+            "Statistical", statistical_model, settings.ANALYSIS_STATISTICAL_TIMEOUT
+        ),
+        llm_component() if with_llm else _skipped(),
+        _run_component("Crash score", crash, settings.ANALYSIS_CRASH_TIMEOUT) if has_parts else _skipped(),
+    )
+
+    if not has_parts:
+        crash_score_result = default_crash_score(language)
+
+    # Combine whatever finished in time
+    statistical_score = statistical_result.get('risk_score') if statistical_result else None
+    mechanical_score = None
+    if llm_result and llm_result.get('scores'):
+        mechanical_score = llm_result['scores'].get('mechanical_score')
+    crash_score_val = crash_score_result.get('score') if crash_score_result else None
+
+    async def buyability():
+        return await scoring_executor.run(score_buyability, statistical_score, mechanical_score, crash_score_val)
+
+    # Same CPU-bound budget as the statistical model
+    buyability_result, buyability_timing = await _run_component(
+        "Buyability score", buyability, settings.ANALYSIS_STATISTICAL_TIMEOUT
+    )
+
+    return {
+        "buyability_score": buyability_result,
+        "statistical_analysis": statistical_result,
+        "llm_analysis": llm_result,
+        "crash_score_analysis": crash_score_result,
+        "timing": {
+            "statistical": statistical_timing,
+            "llm": llm_timing,
+            "crash_score": crash_timing,
+            "buyability_score": buyability_timing,
+            "total_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+    }
+
+
+async def run_bulk_analysis(
+    entries: List[Dict[str, Any]],
+    language: str = "en",
+    llm_concurrency: int = 8
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Analyze many cars, yielding each result as soon as it completes.
+
+    Statistical scores for all entries come from one vectorized batch call;
+    LLM calls are limited to llm_concurrency at a time so one bulk request
+    cannot take every OpenAI slot from interactive traffic.
+
+    Args:
+        entries: Dicts with sample, car_data, painted_parts, changed_parts,
+            local_painted_parts and with_llm (the run_hybrid_analysis inputs)
+        language: Language for crash score texts ("en" or "tr")
+        llm_concurrency: Maximum LLM calls in flight for this batch
+
+    Yields:
+        (position in entries, run_hybrid_analysis result) in completion order
+    """
+    if not entries:
+        return
+
+    async def statistical_batch():
+        return await scoring_executor.run(score_statistical_batch, [entry["sample"] for entry in entries])
+
+    batch_results, batch_timing = await _run_component(
+        "Bulk statistical", statistical_batch, settings.ANALYSIS_STATISTICAL_TIMEOUT
+    )
+    logger.info(f"Bulk statistical scoring of {len(entries)} samples: {batch_timing['duration_ms']}ms")
+
+    llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+
+    async def analyze(position: int, entry: Dict[str, Any]):
+        statistical = (batch_results[position] if batch_results else None, batch_timing)
+        return position, await run_hybrid_analysis(
+            entry["sample"],
+            entry["car_data"],
+            painted_parts=entry.get("painted_parts"),
+            changed_parts=entry.get("changed_parts"),
+            local_painted_parts=entry.get("local_painted_parts"),
+            language=language,
+            with_llm=entry.get("with_llm", False),
+            statistical=statistical,
+            llm_slots=llm_slots
+        )
+
+    tasks = [asyncio.create_task(analyze(position, entry)) for position, entry in enumerate(entries)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client went away or the consumer stopped early
+        for task in tasks:
+            task.cancel()
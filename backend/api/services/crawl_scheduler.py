@@ -0,0 +1,215 @@
+"""
+Crawl Scheduler
+
+Runs crawl jobs on a fixed number of workers (MAX_CONCURRENT_TASKS per API
+process), so a burst of requests queues up instead of launching one
+browser per request. Jobs wait in a priority queue (higher priority first,
+FIFO within a priority). Past CRAWL_QUEUE_MAX_DEPTH queued jobs, submit()
+raises QueueFull and the route answers 429 with Retry-After.
+
+Queue positions and start estimates come from a moving average of recent
+crawl durations (per page: a batch job's duration is divided by its number
+of URLs). Job state itself lives in the job store; a cancelled job
+is dropped from the queue, and a worker only starts a job that is still
+pending there (a job's run() returns False when it was skipped).
+
+Both limits apply per process: with several uvicorn workers (API_WORKERS), up to
+API_WORKERS x MAX_CONCURRENT_TASKS crawls run at once, and each
+process queues up to CRAWL_QUEUE_MAX_DEPTH jobs. A pending job is queued
+in one process only (the one that created or claimed it in the job store).
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# Weight of the latest crawl in the duration moving average
+DURATION_SMOOTHING = 0.2
+
+
+class QueueFull(Exception):
+    """The crawl queue is at its maximum depth"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Crawl queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class QueuedJob:
+    sort_key: Tuple[int, int]
+    job_id: str = field(compare=False)
+    run: Callable[[], Awaitable[Any]] = field(compare=False)
+    pages: int = field(compare=False, default=1)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+
+
+class CrawlScheduler:
+    """
+    Bounded worker pool with a priority queue for crawl jobs
+    """
+
+    def __init__(self):
+        self.workers = 1
+        self.max_depth = 100
+        self.average_duration = 30.0
+        self._heap: List[QueuedJob] = []
+        self._queued: Dict[str, QueuedJob] = {}
+        self._running: Dict[str, float] = {}
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self._tasks: List[asyncio.Task] = []
+
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, workers: int, max_depth: int, estimated_seconds: float):
+        """Start the worker tasks (call from the running event loop)"""
+        if self.started:
+            return
+        self.workers = max(1, workers)
+        self.max_depth = max(1, max_depth)
+        self.average_duration = float(estimated_seconds)
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        logger.info(f"Crawl scheduler started ({self.workers} workers, queue depth {self.max_depth})")
+
+    async def shutdown(self):
+        """Stop the workers; running crawls are cancelled, queued jobs stay pending in the job store"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._heap.clear()
+        self._queued.clear()
+        logger.info("Crawl scheduler shut down")
+
+    @property
+    def depth(self) -> int:
+        return len(self._queued)
+
+    def estimate_wait(self, position: int) -> float:
+        """Seconds until the job with position jobs ahead of it starts"""
+        free = self.workers - len(self._running)
+        if position < free:
+            return 0.0
+        rounds = (position - free) // self.workers + 1
+        return rounds * self.average_duration
+
+    def retry_after(self) -> int:
+        """Seconds until the queue is expected to have room again"""
+        return max(1, math.ceil(self.average_duration / self.workers))
+
+    def ensure_capacity(self):
+        """
+        Raises:
+            QueueFull: If CRAWL_QUEUE_MAX_DEPTH jobs are already waiting
+        """
+        if self.depth >= self.max_depth:
+            self.rejected += 1
+            raise QueueFull(self.retry_after())
+
+    async def submit(
+        self,
+        job_id: str,
+        run: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+        pages: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Queue a job that crawls pages URLs
+
+        Returns:
+            queue_position (jobs ahead of this one) and estimated_wait in seconds
+
+        Raises:
+            QueueFull: If CRAWL_QUEUE_MAX_DEPTH jobs are already waiting
+        """
+        if not self.started:
+            raise RuntimeError("Crawl scheduler is not running")
+        self.ensure_capacity()
+
+        job = QueuedJob((-priority, next(self._sequence)), job_id, run, max(1, pages))
+        position = self.position(job_id, job.sort_key)
+        self._queued[job_id] = job
+        async with self._condition:
+            heapq.heappush(self._heap, job)
+            self._condition.notify()
+        self.submitted += 1
+
+        return {"queue_position": position, "estimated_wait": self.estimate_wait(position)}
+
+    def job_ids(self) -> List[str]:
+        """Jobs queued or running in this process"""
+        return [*self._queued, *self._running]
+
+    def cancel(self, job_id: str) -> bool:
+        """Drop a queued job (it is skipped when it reaches the front)"""
+        return self._queued.pop(job_id, None) is not None
+
+    def position(self, job_id: str, sort_key: Optional[Tuple[int, int]] = None) -> Optional[int]:
+        """Number of queued jobs ahead of job_id (None if it is not queued here)"""
+        if sort_key is None:
+            job = self._queued.get(job_id)
+            if job is None:
+                return None
+            sort_key = job.sort_key
+        return sum(1 for other in self._queued.values() if other.sort_key < sort_key)
+
+    async def _next_job(self) -> QueuedJob:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: bool(self._heap))
+                job = heapq.heappop(self._heap)
+            # Cancelled jobs stay in the heap until they reach the front
+            if self._queued.get(job.job_id) is job:
+                del self._queued[job.job_id]
+                return job
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._next_job()
+            started = time.monotonic()
+            self._running[job.job_id] = started
+            ran = True
+            try:
+                ran = await job.run() is not False
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Crawl worker {index}: job {job.job_id} failed: {e}")
+            finally:
+                self._running.pop(job.job_id, None)
+                if ran:
+                    duration = (time.monotonic() - started) / job.pages
+                    self.average_duration += DURATION_SMOOTHING * (duration - self.average_duration)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool size, queue depth and counters"""
+        return {
+            "workers": self.workers,
+            "running": len(self._running),
+            "queued": self.depth,
+            "max_depth": self.max_depth,
+            "average_duration": round(self.average_duration, 2),
+            "submitted": self.submitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+# Global scheduler instance, started and stopped in the API lifespan
+crawl_scheduler = CrawlScheduler()
@@ -0,0 +1,54 @@
+"""
+HTTP conditional GET helpers
+
+Listing endpoints answer with an ETag computed from the response content
+(which includes each listing's updated_at), honor If-None-Match with a
+304 Not Modified, and send Cache-Control so the browser can reuse a
+response or revalidate it cheaply instead of downloading it again.
+"""
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+# Responses depend on the caller's user-id header (user_id Header parameter)
+VARY = "user-id"
+
+
+def compute_etag(content: Any) -> str:
+    """Weak ETag from the JSON-encoded content (stable key order)"""
+    body = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return f'W/"{hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check with weak comparison (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_json(
+    payload: Dict[str, Any],
+    if_none_match: Optional[str],
+    cache_control: str
+) -> Response:
+    """
+    JSON response with ETag and Cache-Control, or an empty 304 when the
+    client already holds this version
+    """
+    content = jsonable_encoder(payload)
+    etag = compute_etag(content)
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": VARY}
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=content, headers=headers)
@@ -0,0 +1,115 @@
+"""
+Job Progress Events
+
+In-process fan-out of job events (a batch job's per-URL results) to the
+/ws/progress/{job_id} websockets of this API process. Websockets also poll
+the job store for status snapshots, so a job run by another worker
+process still reports its status and progress, only without the
+per-URL events.
+"""
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+# Queue markers: the client asked for the current status / disconnected
+REFRESH = object()
+CLOSED = object()
+
+# Events buffered per subscriber before new ones are dropped
+MAX_PENDING_EVENTS = 1000
+
+
+class JobEvents:
+    """
+    Subscribers per job ID, each with its own queue of events
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+        self._subscribers[job_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[job_id].discard(queue)
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    def publish(self, job_id: str, event: Dict[str, Any]):
+        """Send an event to the job's subscribers (call from the event loop)"""
+        for queue in self._subscribers.get(job_id, ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.debug(f"Dropping progress event of job {job_id} for a slow subscriber")
+
+
+async def _receive(websocket: WebSocket, queue: asyncio.Queue):
+    """Any client message asks for the current status (the websocket's original protocol)"""
+    try:
+        while True:
+            await websocket.receive_text()
+            queue.put_nowait(REFRESH)
+    except (WebSocketDisconnect, asyncio.QueueFull):
+        pass
+    finally:
+        try:
+            queue.put_nowait(CLOSED)
+        except asyncio.QueueFull:
+            pass
+
+
+async def stream_job_progress(
+    websocket: WebSocket,
+    job_id: str,
+    snapshot: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+    poll_seconds: float
+) -> bool:
+    """
+    Send the job's status snapshot, then its events and every changed
+    snapshot until the job is finished or the client disconnects
+
+    Args:
+        snapshot: Returns the job's status payload (None if it does not exist)
+
+    Returns:
+        False if the client disconnected, True if the stream ended (job
+        finished or not found) and the websocket should be closed
+    """
+    with job_events.subscribe(job_id) as queue:
+        receiver = asyncio.create_task(_receive(websocket, queue))
+        try:
+            last = None
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), poll_seconds)
+                except asyncio.TimeoutError:
+                    event = None
+                if event is CLOSED:
+                    return False
+                if event is not None and event is not REFRESH:
+                    await websocket.send_json(jsonable_encoder(event))
+
+                current = await snapshot(job_id)
+                if current is None:
+                    await websocket.send_json({"type": "error", "job_id": job_id, "detail": "Job not found"})
+                    return True
+                if current != last or event is REFRESH:
+                    last = current
+                    await websocket.send_json(jsonable_encoder({"type": "status", **current}))
+                if current.get("finished"):
+                    return True
+        finally:
+            receiver.cancel()
+
+
+# Global event hub, used by the crawl routes and the progress websocket
+job_events = JobEvents()
@@ -0,0 +1,968 @@
+"""
+Crawl Job Store
+
+Persistent store for crawl jobs, shared by every API worker process so
+jobs survive restarts and uvicorn can run with several workers.
+
+Backends (JOB_STORE_BACKEND):
+    sqlite: one WAL-mode database file (default); safe across processes
+            on one host
+    redis:  hashes in the Redis configured by REDIS_*; shared across hosts
+
+Status changes go through transition(), a compare-and-set on the current
+status, so a job cancelled while it runs is never flipped back to
+completed, and two workers can never both start the same job.
+
+The bulky parts of a crawl result (page html, text, links, images, batch
+items) are
+written to gzip-compressed blobs under JOB_BLOB_DIR and only loaded by
+get_result(). Finished jobs are evicted by TTL per status and, oldest
+first, beyond JOB_RETENTION_MAX_JOBS jobs or JOB_RETENTION_MAX_BYTES of
+stored results.
+
+Listing pages and stats do not scan the job history: jobs are indexed per
+status by creation time, and counters (jobs per status, lifetime totals,
+completed crawl durations, stored bytes) are updated in the same
+transaction as each create, status transition and delete.
+
+A queued or running job records the process that owns it (worker_id,
+WORKER_ID of that process) and a heartbeat_at the process refreshes every
+JOB_HEARTBEAT_SECONDS. A job whose heartbeat is older than
+JOB_STALE_SECONDS lost its process (killed or crashed): a running one is
+failed by the next retention pass of any worker, a pending one is claimed
+(compare-and-set on its owner) and queued again by exactly one worker.
+
+Routes use the awaitable JobStore facade (the global job_store); backend
+calls run in a worker thread so they never block the event loop.
+"""
+import asyncio
+import gzip
+import json
+import os
+import sqlite3
+import socket
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from config.settings import settings
+from api.models.schemas import JobStatus
+
+# Job fields stored in their own column / hash field; anything else a
+# route sets is kept in the JSON 'extra' map
+DATETIME_FIELDS = ("created_at", "started_at", "completed_at")
+JSON_FIELDS = ("config", "result")
+COLUMNS = ("job_id", "url", "status", "user_id", "error_message", "retry_count", "size_bytes") + DATETIME_FIELDS + JSON_FIELDS
+
+# Result fields kept in compressed blobs instead of the job record
+# (items: the per-URL results of a batch job)
+BLOB_FIELDS = ("html", "text", "links", "images", "items")
+
+# Statuses retention may evict (pending and running jobs are always kept)
+FINISHED_STATUSES = (JobStatus.COMPLETED.value, JobStatus.FAILED.value, JobStatus.CANCELLED.value)
+
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+# Owner recorded on the jobs this API process runs (the random part tells
+# apart processes that reuse a PID after a restart)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# Counter names: "status:<status>" (jobs currently in a status),
+# "total:<status>" (jobs that ever entered it), "created", "bytes",
+# "duration_sum" and "duration_count" (completed crawls)
+STATUS_COUNTER = "status:"
+TOTAL_COUNTER = "total:"
+
+
+def _dumps(value: Any) -> str:
+    def default(obj):
+        if isinstance(obj, datetime):
+            return {"__datetime__": obj.strftime(DATETIME_FORMAT)}
+        return str(obj)
+    return json.dumps(value, default=default)
+
+
+def _loads(raw: Optional[str]) -> Any:
+    def hook(obj):
+        if len(obj) == 1 and "__datetime__" in obj:
+            return datetime.strptime(obj["__datetime__"], DATETIME_FORMAT)
+        return obj
+    return json.loads(raw, object_hook=hook) if raw else None
+
+
+def _format_datetime(value: Optional[datetime]) -> Optional[str]:
+    return value.strftime(DATETIME_FORMAT) if value else None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.strptime(value, DATETIME_FORMAT) if value else None
+
+
+def _status_value(status: Any) -> str:
+    return status.value if isinstance(status, JobStatus) else str(status)
+
+
+def _split_fields(fields: Dict[str, Any]):
+    """(column fields encoded for storage, extra fields)"""
+    columns, extra = {}, {}
+    for key, value in fields.items():
+        if key in DATETIME_FIELDS:
+            columns[key] = _format_datetime(value)
+        elif key in JSON_FIELDS:
+            columns[key] = _dumps(value) if value is not None else None
+        elif key == "status":
+            columns[key] = _status_value(value)
+        elif key in COLUMNS:
+            columns[key] = value
+        else:
+            extra[key] = value
+    return columns, extra
+
+
+def _counter_stats(counters: Dict[str, float]) -> Dict[str, Any]:
+    """Stats dict from the raw counters of either backend"""
+    def section(prefix):
+        return {
+            name[len(prefix):]: int(value)
+            for name, value in counters.items() if name.startswith(prefix) and value
+        }
+    duration_count = counters.get("duration_count", 0)
+    return {
+        "counts": section(STATUS_COUNTER),
+        "totals": {"created": int(counters.get("created", 0)), **section(TOTAL_COUNTER)},
+        "average_duration": counters.get("duration_sum", 0) / duration_count if duration_count else 0.0,
+    }
+
+
+def _decode_job(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Stored job (column values as strings) back to the dict routes use"""
+    job = _loads(row.get("extra")) or {}
+    for key in COLUMNS:
+        value = row.get(key)
+        if key in DATETIME_FIELDS:
+            value = _parse_datetime(value)
+        elif key in JSON_FIELDS:
+            value = _loads(value)
+        elif key == "status":
+            value = JobStatus(value)
+        elif key in ("retry_count", "size_bytes"):
+            value = int(value or 0)
+        job[key] = value
+    return job
+
+
+class SQLiteJobBackend:
+    """Jobs in a WAL-mode SQLite database"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=10.0)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    user_id TEXT,
+                    error_message TEXT,
+                    retry_count INTEGER NOT NULL DEFAULT 0,
+                    size_bytes INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    config TEXT,
+                    result TEXT,
+                    extra TEXT
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(crawl_jobs)")}
+            if "size_bytes" not in columns:
+                conn.execute("ALTER TABLE crawl_jobs ADD COLUMN size_bytes INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_jobs_created_at ON crawl_jobs(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_jobs_status_created_at ON crawl_jobs(status, created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_job_counters (
+                    name TEXT PRIMARY KEY,
+                    value REAL NOT NULL
+                )
+            """)
+            if conn.execute("SELECT COUNT(*) FROM crawl_job_counters").fetchone()[0] == 0:
+                self._rebuild_counters(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _rebuild_counters(conn: sqlite3.Connection):
+        """Counters from a full scan (once, for a database created before counters existed)"""
+        changes: Dict[str, float] = {"created": 0, "bytes": 0}
+        for status, count, size in conn.execute(
+            "SELECT status, COUNT(*), COALESCE(SUM(size_bytes), 0) FROM crawl_jobs GROUP BY status"
+        ):
+            changes[STATUS_COUNTER + status] = count
+            changes[TOTAL_COUNTER + status] = count
+            changes["created"] += count
+            changes["bytes"] += size
+        changes["duration_sum"], changes["duration_count"] = conn.execute(
+            "SELECT COALESCE(SUM((julianday(completed_at) - julianday(started_at)) * 86400.0), 0), COUNT(*) "
+            "FROM crawl_jobs WHERE status = ? AND started_at IS NOT NULL AND completed_at IS NOT NULL",
+            (JobStatus.COMPLETED.value,)
+        ).fetchone()
+        SQLiteJobBackend._bump(conn, changes)
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, changes: Dict[str, float]):
+        conn.executemany(
+            "INSERT INTO crawl_job_counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [(name, value) for name, value in changes.items() if value]
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction holding the database lock from the first read (call with self._lock held)"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    def create(self, job: Dict[str, Any]):
+        columns, extra = _split_fields(job)
+        columns["extra"] = _dumps(extra)
+        names = list(columns)
+        with self._lock, self._transaction() as conn:
+            conn.execute(
+                f"INSERT INTO crawl_jobs ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                [columns[name] for name in names]
+            )
+            self._bump(conn, {
+                STATUS_COUNTER + columns["status"]: 1,
+                TOTAL_COUNTER + columns["status"]: 1,
+                "created": 1,
+                "bytes": columns.get("size_bytes") or 0,
+            })
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM crawl_jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return _decode_job(dict(row)) if row else None
+
+    def update(
+        self,
+        job_id: str,
+        fields: Dict[str, Any],
+        from_statuses: Optional[Iterable[str]] = None,
+        from_owner: Optional[str] = None
+    ) -> bool:
+        """
+        Set fields, only if the job's status is one of from_statuses and its
+        worker_id is from_owner ("" = no owner), when given
+        """
+        columns, extra = _split_fields(fields)
+        assignments = [f"{name} = ?" for name in columns] or ["status = status"]
+        params: List[Any] = list(columns.values())
+        if extra:
+            assignments.append("extra = json_patch(COALESCE(extra, '{}'), ?)")
+            params.append(_dumps(extra))
+
+        sql = f"UPDATE crawl_jobs SET {', '.join(assignments)} WHERE job_id = ?"
+        params.append(job_id)
+        if from_statuses is not None:
+            statuses = [_status_value(status) for status in from_statuses]
+            if not statuses:
+                return False
+            sql += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            params.extend(statuses)
+        if from_owner is not None:
+            sql += " AND COALESCE(json_extract(extra, '$.worker_id'), '') = ?"
+            params.append(from_owner)
+
+        with self._lock, self._transaction() as conn:
+            before = conn.execute("SELECT status, size_bytes FROM crawl_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if before is None or conn.execute(sql, params).rowcount != 1:
+                return False
+
+            changes: Dict[str, float] = {}
+            status = columns.get("status")
+            if status and status != before["status"]:
+                changes[STATUS_COUNTER + before["status"]] = -1
+                changes[STATUS_COUNTER + status] = 1
+                changes[TOTAL_COUNTER + status] = 1
+                if status == JobStatus.COMPLETED.value:
+                    duration = conn.execute(
+                        "SELECT (julianday(completed_at) - julianday(started_at)) * 86400.0 FROM crawl_jobs WHERE job_id = ?",
+                        (job_id,)
+                    ).fetchone()[0]
+                    if duration is not None:
+                        changes["duration_sum"] = duration
+                        changes["duration_count"] = 1
+            if "size_bytes" in columns:
+                changes["bytes"] = (columns["size_bytes"] or 0) - before["size_bytes"]
+            self._bump(conn, changes)
+        return True
+
+    def delete(self, job_ids: List[str]) -> List[str]:
+        """Delete jobs; returns the IDs of the jobs that existed"""
+        if not job_ids:
+            return []
+        deleted: List[str] = []
+        with self._lock, self._transaction() as conn:
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ', '.join('?' for _ in chunk)
+                changes: Dict[str, float] = {"bytes": 0}
+                for job_id, status, size in conn.execute(
+                    f"SELECT job_id, status, size_bytes FROM crawl_jobs WHERE job_id IN ({placeholders})", chunk
+                ):
+                    changes[STATUS_COUNTER + status] = changes.get(STATUS_COUNTER + status, 0) - 1
+                    changes["bytes"] -= size
+                    deleted.append(job_id)
+                conn.execute(f"DELETE FROM crawl_jobs WHERE job_id IN ({placeholders})", chunk)
+                self._bump(conn, changes)
+        return deleted
+
+    def job_ids(self, status: Optional[str] = None) -> List[str]:
+        with self._lock:
+            conn = self._connect()
+            if status:
+                rows = conn.execute("SELECT job_id FROM crawl_jobs WHERE status = ?", (status,)).fetchall()
+            else:
+                rows = conn.execute("SELECT job_id FROM crawl_jobs").fetchall()
+        return [row[0] for row in rows]
+
+    def list(self, status: Optional[str], limit: int, offset: int) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM crawl_jobs"
+        params: List[Any] = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [_decode_job(dict(row)) for row in rows]
+
+    def _counters(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._connect().execute("SELECT name, value FROM crawl_job_counters").fetchall())
+
+    def stats(self) -> Dict[str, Any]:
+        return _counter_stats(self._counters())
+
+    def usage(self) -> Dict[str, int]:
+        counters = self._counters()
+        jobs = sum(value for name, value in counters.items() if name.startswith(STATUS_COUNTER))
+        return {"jobs": int(jobs), "bytes": int(counters.get("bytes", 0))}
+
+    def eviction_candidates(
+        self,
+        statuses: List[str],
+        before: Optional[datetime],
+        limit: int
+    ) -> List[Tuple[str, int]]:
+        """(job_id, size_bytes) of finished jobs, oldest first, optionally finished before a time"""
+        sql = f"SELECT job_id, size_bytes FROM crawl_jobs WHERE status IN ({', '.join('?' for _ in statuses)})"
+        params: List[Any] = list(statuses)
+        if before is not None:
+            # A job finishes after it is created, so the created_at bound only narrows the index range
+            sql += " AND created_at < ? AND COALESCE(completed_at, created_at) < ?"
+            params.extend([_format_datetime(before)] * 2)
+        sql += " ORDER BY created_at LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [tuple(row) for row in self._connect().execute(sql, params).fetchall()]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisJobBackend:
+    """
+    Jobs as Redis hashes (one field per column, values JSON-encoded except
+    status), sorted sets of job IDs by creation time (all jobs and one per
+    status) and a counters hash
+    """
+
+    name = "redis"
+    prefix = "crawl-jobs:"
+
+    # KEYS[1] job hash, KEYS[2] counters hash, KEYS[3] by-created index;
+    # ARGV[1] job ID, ARGV[2] per-status index prefix. Status indexes are
+    # derived from the job's status, so this assumes a single Redis node.
+    # The job hash keeps the creation and start times as epoch seconds in
+    # created_ts / started_ts for the indexes and durations.
+    CREATE_SCRIPT = """
+        local status = ARGV[3]
+        local created_ts = ARGV[4]
+        redis.call('HSET', KEYS[1], 'created_ts', created_ts, unpack(ARGV, 5))
+        redis.call('ZADD', KEYS[3], created_ts, ARGV[1])
+        redis.call('ZADD', ARGV[2] .. status, created_ts, ARGV[1])
+        redis.call('HINCRBY', KEYS[2], 'status:' .. status, 1)
+        redis.call('HINCRBY', KEYS[2], 'total:' .. status, 1)
+        redis.call('HINCRBY', KEYS[2], 'created', 1)
+        return 1
+    """
+
+    # Compare-and-set: ARGV[3] comma-separated allowed statuses ("" = any),
+    # ARGV[4] completion time as epoch seconds ("" = not set), ARGV[5]
+    # "=" followed by the expected encoded extra.worker_id ("" = any owner),
+    # ARGV[6..] field/value pairs to set
+    TRANSITION_SCRIPT = """
+        local current = redis.call('HGET', KEYS[1], 'status')
+        if not current then return 0 end
+        if ARGV[3] ~= '' then
+            local allowed = false
+            for status in string.gmatch(ARGV[3], '[^,]+') do
+                if status == current then allowed = true end
+            end
+            if not allowed then return 0 end
+        end
+        if ARGV[5] ~= '' then
+            local owner = redis.call('HGET', KEYS[1], 'extra.worker_id') or ''
+            if owner == '""' then owner = '' end
+            if owner ~= string.sub(ARGV[5], 2) then return 0 end
+        end
+
+        local target = nil
+        for i = 6, #ARGV, 2 do
+            if ARGV[i] == 'status' then target = ARGV[i + 1] end
+            if ARGV[i] == 'size_bytes' then
+                local size = tonumber(cjson.decode(ARGV[i + 1])) or 0
+                local old = tonumber(cjson.decode(redis.call('HGET', KEYS[1], 'size_bytes') or '0')) or 0
+                redis.call('HINCRBY', KEYS[2], 'bytes', size - old)
+            end
+        end
+        if #ARGV > 5 then redis.call('HSET', KEYS[1], unpack(ARGV, 6)) end
+
+        if target and target ~= current then
+            local created_ts = redis.call('HGET', KEYS[1], 'created_ts')
+            redis.call('ZREM', ARGV[2] .. current, ARGV[1])
+            redis.call('ZADD', ARGV[2] .. target, created_ts, ARGV[1])
+            redis.call('HINCRBY', KEYS[2], 'status:' .. current, -1)
+            redis.call('HINCRBY', KEYS[2], 'status:' .. target, 1)
+            redis.call('HINCRBY', KEYS[2], 'total:' .. target, 1)
+            local started_ts = redis.call('HGET', KEYS[1], 'started_ts')
+            if target == 'completed' and ARGV[4] ~= '' and started_ts then
+                redis.call('HINCRBYFLOAT', KEYS[2], 'duration_sum', tonumber(ARGV[4]) - tonumber(started_ts))
+                redis.call('HINCRBY', KEYS[2], 'duration_count', 1)
+            end
+        end
+        return 1
+    """
+
+    DELETE_SCRIPT = """
+        local status = redis.call('HGET', KEYS[1], 'status')
+        if not status then return 0 end
+        local size = tonumber(cjson.decode(redis.call('HGET', KEYS[1], 'size_bytes') or '0')) or 0
+        redis.call('DEL', KEYS[1])
+        redis.call('ZREM', KEYS[3], ARGV[1])
+        redis.call('ZREM', ARGV[2] .. status, ARGV[1])
+        redis.call('HINCRBY', KEYS[2], 'status:' .. status, -1)
+        redis.call('HINCRBY', KEYS[2], 'bytes', -size)
+        return 1
+    """
+
+    def __init__(self, host: str, port: int, db: int, password: Optional[str]):
+        self.client = redis.Redis(host=host, port=port, db=db, password=password, decode_responses=True)
+        self._create = self.client.register_script(self.CREATE_SCRIPT)
+        self._transition = self.client.register_script(self.TRANSITION_SCRIPT)
+        self._delete = self.client.register_script(self.DELETE_SCRIPT)
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.prefix}job:{job_id}"
+
+    @property
+    def _index(self) -> str:
+        return f"{self.prefix}by-created"
+
+    @property
+    def _status_prefix(self) -> str:
+        return f"{self.prefix}by-status:"
+
+    @property
+    def _counters_key(self) -> str:
+        return f"{self.prefix}counters"
+
+    def _script_keys(self, job_id: str) -> List[str]:
+        return [self._key(job_id), self._counters_key, self._index]
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        columns, extra = _split_fields(fields)
+        encoded = {
+            name: value if name == "status" else json.dumps(value)
+            for name, value in columns.items()
+        }
+        for key, value in extra.items():
+            encoded[f"extra.{key}"] = _dumps(value)
+        if fields.get("started_at"):
+            encoded["started_ts"] = str(fields["started_at"].timestamp())
+        return encoded
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Dict[str, Any]:
+        row = {
+            name: value if name == "status" else json.loads(value)
+            for name, value in raw.items() if not name.startswith("extra.")
+        }
+        extra = {name[len("extra."):]: _loads(value) for name, value in raw.items() if name.startswith("extra.")}
+        row["extra"] = _dumps(extra)
+        return _decode_job(row)
+
+    @staticmethod
+    def _pairs(encoded: Dict[str, str]) -> List[str]:
+        return [item for pair in encoded.items() for item in pair]
+
+    def create(self, job: Dict[str, Any]):
+        self._create(
+            keys=self._script_keys(job["job_id"]),
+            args=[
+                job["job_id"], self._status_prefix, _status_value(job["status"]),
+                job["created_at"].timestamp(), *self._pairs(self._encode(job))
+            ]
+        )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.hgetall(self._key(job_id))
+        return self._decode(raw) if raw else None
+
+    def update(
+        self,
+        job_id: str,
+        fields: Dict[str, Any],
+        from_statuses: Optional[Iterable[str]] = None,
+        from_owner: Optional[str] = None
+    ) -> bool:
+        allowed = ",".join(_status_value(status) for status in from_statuses) if from_statuses is not None else ""
+        if from_statuses is not None and not allowed:
+            return False
+        completed_ts = fields["completed_at"].timestamp() if fields.get("completed_at") else ""
+        # An unowned job has no extra.worker_id, or an empty one
+        owner = "" if from_owner is None else "=" + (_dumps(from_owner) if from_owner else "")
+        args = [job_id, self._status_prefix, allowed, completed_ts, owner, *self._pairs(self._encode(fields))]
+        return bool(self._transition(keys=self._script_keys(job_id), args=args))
+
+    def delete(self, job_ids: List[str]) -> List[str]:
+        """Delete jobs; returns the IDs of the jobs that existed"""
+        if not job_ids:
+            return []
+        pipe = self.client.pipeline()
+        for job_id in job_ids:
+            self._delete(keys=self._script_keys(job_id), args=[job_id, self._status_prefix], client=pipe)
+        return [job_id for job_id, deleted in zip(job_ids, pipe.execute()) if deleted]
+
+    def job_ids(self, status: Optional[str] = None) -> List[str]:
+        return self.client.zrange(self._status_prefix + status if status else self._index, 0, -1)
+
+    def list(self, status: Optional[str], limit: int, offset: int) -> List[Dict[str, Any]]:
+        index = self._status_prefix + status if status else self._index
+        job_ids = self.client.zrevrange(index, offset, offset + limit - 1)
+        pipe = self.client.pipeline()
+        for job_id in job_ids:
+            pipe.hgetall(self._key(job_id))
+        return [self._decode(raw) for raw in pipe.execute() if raw]
+
+    def _counters(self) -> Dict[str, float]:
+        return {name: float(value) for name, value in self.client.hgetall(self._counters_key).items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return _counter_stats(self._counters())
+
+    def usage(self) -> Dict[str, int]:
+        counters = self._counters()
+        jobs = sum(value for name, value in counters.items() if name.startswith(STATUS_COUNTER))
+        return {"jobs": int(jobs), "bytes": int(counters.get("bytes", 0))}
+
+    def eviction_candidates(
+        self,
+        statuses: List[str],
+        before: Optional[datetime],
+        limit: int
+    ) -> List[Tuple[str, int]]:
+        """(job_id, size_bytes) of finished jobs, oldest first, optionally finished before a time"""
+        # A job finishes after it is created, so the created bound only narrows each index range
+        newest = f"({before.timestamp()}" if before is not None else "+inf"
+        oldest = []
+        for status in statuses:
+            oldest.extend(self.client.zrangebyscore(
+                self._status_prefix + status, "-inf", newest, start=0, num=limit, withscores=True
+            ))
+        oldest.sort(key=lambda item: item[1])
+        job_ids = [job_id for job_id, _ in oldest[:limit]]
+
+        pipe = self.client.pipeline()
+        for job_id in job_ids:
+            pipe.hmget(self._key(job_id), "created_at", "completed_at", "size_bytes")
+        candidates = []
+        for job_id, (created_at, completed_at, size) in zip(job_ids, pipe.execute()):
+            finished = _parse_datetime(json.loads(completed_at or "null") or json.loads(created_at or "null"))
+            if before is not None and (finished is None or finished >= before):
+                continue
+            candidates.append((job_id, int(json.loads(size or "0") or 0)))
+        return candidates
+
+    def close(self):
+        self.client.close()
+
+
+class JobStore:
+    """
+    Awaitable access to the configured job backend, with result blobs and
+    retention
+    """
+
+    # Jobs evicted per backend query during retention
+    RETENTION_BATCH = 500
+
+    def __init__(self):
+        self._backend = None
+        self._lock = threading.Lock()
+        self.evicted_jobs = 0
+        self.evicted_bytes = 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._create_backend()
+        return self._backend
+
+    @staticmethod
+    def _create_backend():
+        if settings.JOB_STORE_BACKEND == "redis":
+            if REDIS_AVAILABLE:
+                logger.info(f"Job store: redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}")
+                return RedisJobBackend(settings.REDIS_HOST, settings.REDIS_PORT, settings.REDIS_DB, settings.REDIS_PASSWORD)
+            logger.warning("redis package not installed, job store falls back to SQLite. Run: pip install redis")
+        logger.info(f"Job store: sqlite at {settings.JOB_STORE_PATH}")
+        return SQLiteJobBackend(settings.JOB_STORE_PATH)
+
+    async def _call(self, method: str, *args):
+        return await asyncio.to_thread(getattr(self.backend, method), *args)
+
+    # -- Result blobs ---------------------------------------------------
+
+    @staticmethod
+    def _blob_path(job_id: str) -> str:
+        return os.path.join(settings.JOB_BLOB_DIR, f"{job_id}.json.gz")
+
+    def _write_result(self, job_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Move the bulky fields of fields['result'] to a compressed blob,
+        written next to the job's blob path (_update moves it in place once
+        the record is updated)
+        """
+        result = fields.get("result")
+        if not isinstance(result, dict):
+            return fields
+
+        bulky = {key: result[key] for key in BLOB_FIELDS if result.get(key)}
+        stored = {key: value for key, value in result.items() if key not in bulky}
+        blob = None
+        if bulky:
+            raw = _dumps(bulky).encode("utf-8")
+            data = gzip.compress(raw, compresslevel=6)
+            path = self._blob_path(job_id)
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            blob = {"fields": sorted(bulky), "bytes": len(raw), "compressed_bytes": len(data)}
+
+        size = len(_dumps(stored)) + (blob["compressed_bytes"] if blob else 0)
+        return {**fields, "result": stored, "result_blob": blob, "size_bytes": size}
+
+    def _remove_blobs(self, job_ids: Iterable[str]):
+        for job_id in job_ids:
+            try:
+                os.remove(self._blob_path(job_id))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove result blob of job {job_id}: {e}")
+
+    def _update(self, job_id: str, fields: Dict[str, Any], from_statuses: Optional[List[Any]]) -> bool:
+        if "result" in fields:
+            fields = self._write_result(job_id, fields)
+        updated = self.backend.update(job_id, fields, from_statuses)
+        if fields.get("result_blob"):
+            # The blob replaces the previous one only if the record now points to it
+            # (a job cancelled meanwhile keeps its stored result)
+            path = self._blob_path(job_id)
+            if updated:
+                os.replace(path + ".tmp", path)
+            else:
+                try:
+                    os.remove(path + ".tmp")
+                except FileNotFoundError:
+                    pass
+        elif updated and "result" in fields:
+            # The new result has no bulky fields: drop the blob of the one it replaced
+            self._remove_blobs([job_id])
+        return updated
+
+    def _get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.backend.get(job_id)
+        if job and job.get("result_blob") and isinstance(job.get("result"), dict):
+            try:
+                with open(self._blob_path(job_id), "rb") as f:
+                    job["result"].update(_loads(gzip.decompress(f.read()).decode("utf-8")))
+            except FileNotFoundError:
+                logger.warning(f"Result blob of job {job_id} is missing")
+        return job
+
+    def _delete(self, job_ids: List[str]) -> List[str]:
+        deleted = self.backend.delete(job_ids)
+        self._remove_blobs(job_ids)
+        return deleted
+
+    # -- Jobs -----------------------------------------------------------
+
+    async def create(self, job: Dict[str, Any]):
+        await self._call("create", job)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record; the result holds everything except the blob fields"""
+        return await self._call("get", job_id)
+
+    async def get_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record with the full result, blob fields loaded from disk"""
+        return await asyncio.to_thread(self._get_result, job_id)
+
+    async def update(self, job_id: str, **fields) -> bool:
+        """Set fields on a job regardless of its status (False if it does not exist)"""
+        return await asyncio.to_thread(self._update, job_id, fields, None)
+
+    async def transition(
+        self,
+        job_id: str,
+        status: JobStatus,
+        from_statuses: Iterable[JobStatus],
+        **fields
+    ) -> bool:
+        """
+        Atomically move a job to status (and set fields) if its current
+        status is one of from_statuses
+
+        Returns:
+            False if the job does not exist or was in another status
+        """
+        return await asyncio.to_thread(self._update, job_id, {**fields, "status": status}, list(from_statuses))
+
+    async def delete(self, job_id: str) -> bool:
+        return bool(await asyncio.to_thread(self._delete, [job_id]))
+
+    async def delete_many(self, status: Optional[JobStatus] = None) -> int:
+        """Delete every job, or every job in one status"""
+        job_ids = await self._call("job_ids", _status_value(status) if status else None)
+        return len(await asyncio.to_thread(self._delete, job_ids))
+
+    async def list(self, status: Optional[JobStatus] = None, limit: int = 50, offset: int = 0) -> List[Dict[str, Any]]:
+        """Jobs newest first, optionally only one status"""
+        return await self._call("list", _status_value(status) if status else None, limit, offset)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Job counts per status and the average duration of completed jobs"""
+        return await self._call("stats")
+
+    # -- Retention ------------------------------------------------------
+
+    def enforce_retention(self) -> Dict[str, int]:
+        """
+        Evict finished jobs past their status TTL, then the oldest finished
+        jobs while over JOB_RETENTION_MAX_JOBS or JOB_RETENTION_MAX_BYTES
+
+        Returns:
+            Jobs and bytes evicted by this run
+        """
+        evicted = {"jobs": 0, "bytes": 0}
+
+        def evict(candidates: List[Tuple[str, int]]) -> int:
+            # Jobs deleted meanwhile (by a route or another worker) are not counted
+            deleted = set(self._delete([job_id for job_id, _ in candidates]))
+            evicted["jobs"] += len(deleted)
+            evicted["bytes"] += sum(size for job_id, size in candidates if job_id in deleted)
+            return len(deleted)
+
+        now = datetime.utcnow()
+        ttls = {
+            JobStatus.COMPLETED.value: settings.JOB_TTL_COMPLETED_SECONDS,
+            JobStatus.FAILED.value: settings.JOB_TTL_FAILED_SECONDS,
+            JobStatus.CANCELLED.value: settings.JOB_TTL_CANCELLED_SECONDS,
+        }
+        for status, ttl in ttls.items():
+            if ttl <= 0:
+                continue
+            while True:
+                batch = self.backend.eviction_candidates([status], now - timedelta(seconds=ttl), self.RETENTION_BATCH)
+                if not batch or not evict(batch) or len(batch) < self.RETENTION_BATCH:
+                    break
+
+        usage = self.backend.usage()
+        excess_jobs = usage["jobs"] - settings.JOB_RETENTION_MAX_JOBS
+        excess_bytes = usage["bytes"] - settings.JOB_RETENTION_MAX_BYTES
+        while excess_jobs > 0 or excess_bytes > 0:
+            batch = self.backend.eviction_candidates(list(FINISHED_STATUSES), None, self.RETENTION_BATCH)
+            chosen = []
+            for job_id, size in batch:
+                if excess_jobs <= 0 and excess_bytes <= 0:
+                    break
+                chosen.append((job_id, size))
+                excess_jobs -= 1
+                excess_bytes -= size
+            if not chosen or not evict(chosen):
+                break
+
+        self.evicted_jobs += evicted["jobs"]
+        self.evicted_bytes += evicted["bytes"]
+        if evicted["jobs"]:
+            logger.info(f"Job retention evicted {evicted['jobs']} jobs ({evicted['bytes']} bytes)")
+        return evicted
+
+    async def run_retention(self, interval_seconds: float):
+        """Fail stale running jobs and enforce retention every interval_seconds (run as a background task)"""
+        while True:
+            try:
+                await asyncio.to_thread(self.recover_stale_jobs)
+            except Exception as e:
+                logger.warning(f"Stale job recovery failed: {e}")
+            try:
+                await asyncio.to_thread(self.enforce_retention)
+            except Exception as e:
+                logger.warning(f"Job retention failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    # -- Heartbeats -----------------------------------------------------
+
+    ACTIVE_STATUSES = [JobStatus.PENDING.value, JobStatus.RUNNING.value]
+
+    def _heartbeat(self, job_ids: List[str]):
+        now = datetime.utcnow()
+        for job_id in job_ids:
+            self.backend.update(job_id, {"heartbeat_at": now}, self.ACTIVE_STATUSES, WORKER_ID)
+
+    async def run_heartbeat(self, interval_seconds: float, owned: Callable[[], Iterable[str]]):
+        """Refresh heartbeat_at of the jobs owned() returns every interval_seconds (run as a background task)"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await asyncio.to_thread(self._heartbeat, list(owned()))
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    @staticmethod
+    def is_stale(job: Dict[str, Any]) -> bool:
+        """True if the process owning job sent no heartbeat for JOB_STALE_SECONDS"""
+        last_seen = job.get("heartbeat_at") or job.get("started_at") or job["created_at"]
+        return last_seen < datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+
+    async def claim(self, job_id: str, owner: Optional[str]) -> bool:
+        """
+        Make this process (WORKER_ID) the owner of a pending job, only if
+        its owner is still owner (None or "": no owner)
+
+        Returns:
+            False if the job is no longer pending or another process claimed it first
+        """
+        fields = {"worker_id": WORKER_ID, "heartbeat_at": datetime.utcnow()}
+        return await self._call("update", job_id, fields, [JobStatus.PENDING.value], owner or "")
+
+    def _release(self, job_ids: List[str]):
+        for job_id in job_ids:
+            self.backend.update(job_id, {"worker_id": ""}, [JobStatus.PENDING.value], WORKER_ID)
+
+    async def release(self, job_ids: Iterable[str]):
+        """Give up the pending jobs of this process (at shutdown), so another process queues them right away"""
+        await asyncio.to_thread(self._release, list(job_ids))
+
+    def recover_stale_jobs(self) -> int:
+        """
+        Fail running jobs without a heartbeat for JOB_STALE_SECONDS; the
+        compare-and-set leaves a job alone that finished meanwhile
+
+        Returns:
+            Number of jobs failed
+        """
+        now = datetime.utcnow()
+        recovered = 0
+        for job_id in self.backend.job_ids(JobStatus.RUNNING.value):
+            job = self.backend.get(job_id)
+            if job is None or not self.is_stale(job):
+                continue
+            if self.backend.update(job_id, {
+                "status": JobStatus.FAILED,
+                "error_message": f"Crawl worker {job.get('worker_id') or 'unknown'} stopped responding",
+                "completed_at": now,
+            }, [JobStatus.RUNNING.value]):
+                recovered += 1
+        if recovered:
+            logger.warning(f"Failed {recovered} running jobs whose worker stopped sending heartbeats")
+        return recovered
+
+    def _storage(self) -> Dict[str, Any]:
+        usage = self.backend.usage()
+        blob_files = blob_bytes = 0
+        if os.path.isdir(settings.JOB_BLOB_DIR):
+            for entry in os.scandir(settings.JOB_BLOB_DIR):
+                if entry.is_file() and entry.name.endswith(".json.gz"):
+                    blob_files += 1
+                    blob_bytes += entry.stat().st_size
+        return {
+            "backend": self.backend.name,
+            "jobs": usage["jobs"],
+            "stored_bytes": usage["bytes"],
+            "blob_files": blob_files,
+            "blob_disk_bytes": blob_bytes,
+            "evicted_jobs": self.evicted_jobs,
+            "evicted_bytes": self.evicted_bytes,
+            "limits": {
+                "max_jobs": settings.JOB_RETENTION_MAX_JOBS,
+                "max_bytes": settings.JOB_RETENTION_MAX_BYTES,
+                "ttl_seconds": {
+                    JobStatus.COMPLETED.value: settings.JOB_TTL_COMPLETED_SECONDS,
+                    JobStatus.FAILED.value: settings.JOB_TTL_FAILED_SECONDS,
+                    JobStatus.CANCELLED.value: settings.JOB_TTL_CANCELLED_SECONDS,
+                },
+            },
+        }
+
+    async def storage(self) -> Dict[str, Any]:
+        """Stored job count and bytes (records and compressed blobs), limits and evictions"""
+        return await asyncio.to_thread(self._storage)
+
+    def close(self):
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+
+# Global job store, shared by the crawl and jobs routes
+job_store = JobStore()
@@ -0,0 +1,212 @@
+"""
+LLM Analysis Cache
+
+Persistent SQLite cache for LLM mechanical analyses. The mechanical score
+only depends on the vehicle spec (make, series, model, year, fuel, gear,
+HP, engine volume) and a mileage band, so identical configurations are
+answered from disk instead of another multi-second OpenAI call.
+
+Entries carry the prompt/model version they were generated with, expire
+after a TTL and are evicted least-recently-used beyond a size limit.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+# Spec fields the mechanical analysis depends on, with the same
+# Turkish/English fallbacks as the prompt builder
+SPEC_FIELDS = {
+    "make": ("marka", "brand"),
+    "series": ("seri", "series"),
+    "model": ("model",),
+    "year": ("yil", "year", "Model Yıl"),
+    "fuel": ("yakit_tipi", "fuel_type", "yakit"),
+    "gear": ("vites", "transmission"),
+    "hp": ("motor_gucu", "engine_power", "Beygir Gucu"),
+    "engine_volume": ("motor_hacmi", "engine_volume", "CCM"),
+}
+KM_FIELDS = ("km", "mileage", "Km")
+
+
+def _first_value(car_data: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        value = car_data.get(key)
+        if value:
+            return value
+    return None
+
+
+def _normalize_text(value: Any) -> str:
+    """Case- and whitespace-insensitive form of a spec value"""
+    if value is None:
+        return ""
+    return " ".join(str(value).casefold().split())
+
+
+def _parse_km(value: Any) -> Optional[int]:
+    """Mileage as an int from 180000, "180.000" or "180.000 km" """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    digits = re.sub(r"[^\d]", "", str(value))
+    return int(digits) if digits else None
+
+
+def spec_fingerprint(car_data: Dict[str, Any], km_bucket_size: int) -> str:
+    """
+    Normalized fingerprint of the vehicle spec plus mileage band.
+
+    Two listings of the same configuration whose mileage falls into the
+    same km_bucket_size band share a fingerprint.
+    """
+    spec = {name: _normalize_text(_first_value(car_data, keys)) for name, keys in SPEC_FIELDS.items()}
+    km = _parse_km(_first_value(car_data, KM_FIELDS))
+    spec["km_band"] = km // km_bucket_size if km is not None else None
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed TTL/LRU cache of LLM analyses
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int, km_bucket_size: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.km_bucket_size = km_bucket_size
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._entries = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+            conn.commit()
+            self._entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def key_for(self, car_data: Dict[str, Any]) -> str:
+        return spec_fingerprint(car_data, self.km_bucket_size)
+
+    def get(self, key: str, version: str) -> Optional[Dict[str, Any]]:
+        """Cached analysis for key, or None if missing, stale or expired"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT version, response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or row[0] != version:
+                self.misses += 1
+                return None
+
+            if now - row[2] > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._entries -= 1
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            conn.commit()
+            self.hits += 1
+            return json.loads(row[1])
+
+    def put(self, key: str, version: str, response: Dict[str, Any]):
+        """Store an analysis, evicting least recently used entries over the limit"""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            exists = conn.execute("SELECT 1 FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, version, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, version, json.dumps(response), now, now)
+            )
+            if not exists:
+                self._entries += 1
+            self.writes += 1
+
+            overflow = self._entries - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access LIMIT ?)",
+                    (overflow,)
+                )
+                self._entries -= overflow
+                self.evictions += overflow
+            conn.commit()
+
+    def invalidate_versions(self, current_version: str) -> int:
+        """Drop entries generated with another prompt/model version"""
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute("DELETE FROM llm_cache WHERE version != ?", (current_version,)).rowcount
+            conn.commit()
+            self._entries -= deleted
+        if deleted:
+            logger.info(f"LLM cache: dropped {deleted} entries from previous prompt/model versions")
+        return deleted
+
+    def clear(self) -> int:
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute("DELETE FROM llm_cache").rowcount
+            conn.commit()
+            self._entries = 0
+        return deleted
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "km_bucket_size": self.km_bucket_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "writes": self.writes,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
@@ -4,21 +4,29 @@ Provides expert automotive engineering analysis using OpenAI GPT-4
 """
 
 from typing import Dict, Any, Optional
+import asyncio
+import copy
+import hashlib
+import importlib.util
 import json
 from loguru import logger
 
 try:
-    from openai import OpenAI, APIError, RateLimitError, APITimeoutError
+    from openai import AsyncOpenAI, APIError, RateLimitError, APITimeoutError
     import httpx
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     logger.warning("OpenAI package not installed. Run: pip install openai")
 
+# HTTP/2 in httpx needs the optional h2 package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 import sys
 import os
 sys.path.insert(0, str(__file__).replace("\\", "/").rsplit("/", 4)[0])
 from config.settings import settings
+from api.services.llm_cache import LLMCache
 
 
 # System prompt for automotive expert analysis
@@ -47,30 +55,106 @@ class LLMMechanicalAnalyzer:
         self.model = settings.OPENAI_MODEL
         self.timeout = settings.OPENAI_TIMEOUT
         self.max_retries = settings.OPENAI_MAX_RETRIES
-        self.client: Optional[OpenAI] = None
+        self.client: Optional[AsyncOpenAI] = None
+        self._http_client: Optional["httpx.AsyncClient"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Set once startup() ran, so a disabled analyzer does not retry it per call;
+        # the lock keeps concurrent first calls from each creating a client
+        self._started = False
+        self._startup_lock = asyncio.Lock()
+
+        # Single-flight: identical prompts in flight share one OpenAI request
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.llm_requests = 0
+        self.coalesced_requests = 0
+
+        # Persistent cache of analyses, keyed on the vehicle spec
+        self.cache: Optional[LLMCache] = None
+        if settings.LLM_CACHE_ENABLED:
+            self.cache = LLMCache(
+                path=settings.LLM_CACHE_PATH,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                km_bucket_size=settings.LLM_CACHE_KM_BUCKET
+            )
+        self.cache_version = self._compute_cache_version()
 
         if not OPENAI_AVAILABLE:
             logger.warning("OpenAI package not available - LLM analysis disabled")
         elif not self.api_key:
             logger.warning("OpenAI API key not configured - LLM analysis disabled")
-        else:
-            try:
-                # Create a custom httpx client without proxy to avoid conflicts
-                # with the crawler's proxy settings
-                http_client = httpx.Client(
-                    timeout=httpx.Timeout(self.timeout, connect=10.0),
-                    follow_redirects=True
-                )
-                self.client = OpenAI(
-                    api_key=self.api_key,
-                    timeout=self.timeout,
-                    max_retries=self.max_retries,
-                    http_client=http_client
-                )
-                logger.info(f"LLM Analyzer initialized with model: {self.model}")
-            except Exception as e:
-                logger.error(f"Failed to initialize OpenAI client: {e}")
-                self.client = None
+
+    def _compute_cache_version(self) -> str:
+        """
+        Version of the prompts and model. Cached analyses from another
+        version are ignored, so changing either invalidates the cache.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.model.encode())
+        digest.update(AUTOMOTIVE_EXPERT_PROMPT.encode())
+        digest.update(self._build_user_prompt({}).encode())
+        return digest.hexdigest()[:12]
+
+    async def startup(self):
+        """
+        Create the shared async client and its pooled HTTP connection.
+        Called from the API lifespan; analyze_mechanical_reliability also
+        calls it on first use when running outside the app.
+        """
+        async with self._startup_lock:
+            if not self._started:
+                await self._start()
+                self._started = True
+
+    async def _start(self):
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.invalidate_versions, self.cache_version)
+
+        if self.client is not None or not OPENAI_AVAILABLE or not self.api_key:
+            return
+
+        try:
+            http2 = settings.OPENAI_HTTP2 and HTTP2_AVAILABLE
+            if settings.OPENAI_HTTP2 and not HTTP2_AVAILABLE:
+                logger.warning("h2 package not installed - LLM client falling back to HTTP/1.1")
+
+            # Dedicated httpx client without proxy to avoid conflicts with the
+            # crawler's proxy settings; one pool shared by all LLM calls
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS
+                ),
+                http2=http2,
+                follow_redirects=True
+            )
+            self.client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=settings.OPENAI_BASE_URL,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=self._http_client
+            )
+            self._semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+            logger.info(
+                f"LLM Analyzer initialized with model: {self.model} "
+                f"(HTTP/{'2' if http2 else '1.1'}, max {settings.OPENAI_MAX_CONCURRENCY} concurrent calls)"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize OpenAI client: {e}")
+            self.client = None
+
+    async def shutdown(self):
+        """Close the pooled HTTP connection and the cache"""
+        if self.cache is not None:
+            self.cache.close()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self.client = None
+        self._http_client = None
+        self._semaphore = None
+        self._started = False
 
     def _build_user_prompt(self, car_data: Dict[str, Any]) -> str:
         """Convert listing data to structured prompt for LLM"""
@@ -203,41 +287,54 @@ Provide your expert analysis in the following JSON format:
         Returns:
             Parsed LLM analysis or None if API key not configured/failed
         """
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = self.cache.key_for(car_data)
+                cached = await asyncio.to_thread(self.cache.get, cache_key, self.cache_version)
+                if cached is not None:
+                    logger.info("LLM analysis served from cache")
+                    return cached
+            except Exception as e:
+                logger.warning(f"LLM cache lookup failed: {e}")
+
         if not OPENAI_AVAILABLE:
             logger.warning("OpenAI package not installed - skipping LLM analysis")
             return None
 
-        if not self.client:
+        if not self._started:
+            await self.startup()
+        if self.client is None:
             logger.warning("OpenAI client not initialized - skipping LLM analysis")
             return None
 
-        try:
-            user_prompt = self._build_user_prompt(car_data)
-
-            make = car_data.get('marka') or car_data.get('brand') or 'Unknown'
-            model = car_data.get('model') or 'Unknown'
-            logger.info(f"Calling OpenAI {self.model} for mechanical analysis: {make} {model}")
+        user_prompt = self._build_user_prompt(car_data)
+        flight_key = hashlib.sha256(f"{self.cache_version}\n{user_prompt}".encode()).hexdigest()
 
-            # Make OpenAI API call (synchronous, but wrapped for async compatibility)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": AUTOMOTIVE_EXPERT_PROMPT},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent output
-                max_completion_tokens=1500,  # Use max_completion_tokens for newer models
-                response_format={"type": "json_object"}  # Enforce JSON mode
-            )
-
-            response_text = response.choices[0].message.content
-            logger.info("OpenAI response received successfully")
-
-            # Parse and validate response
-            analysis = self._parse_llm_response(response_text)
-
-            return analysis
+        task = self._in_flight.get(flight_key)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(self._request_analysis(car_data, user_prompt, cache_key))
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda t: self._finish_flight(flight_key, t))
+        else:
+            self.coalesced_requests += 1
+            logger.info("Joining in-flight LLM request for identical prompt")
 
+        # Shielded so a caller timing out or disconnecting does not cancel
+        # the request for everyone else waiting on it. Errors of the shared
+        # request reach every caller and are handled here, once.
+        try:
+            try:
+                analysis = await asyncio.shield(task)
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if not task.cancelled() or (current is not None and current.cancelling()):
+                    raise
+                # The shared request was cancelled, not this caller: make our own
+                logger.info("Shared LLM request was cancelled, retrying without coalescing")
+                leader = True
+                analysis = await self._request_analysis(car_data, user_prompt, cache_key)
         except RateLimitError as e:
             logger.error(f"OpenAI rate limit exceeded: {e}")
             return None
@@ -254,6 +351,68 @@ Provide your expert analysis in the following JSON format:
             logger.error(f"Unexpected error in LLM analysis: {e}")
             return None
 
+        # Followers get their own copy so callers can't mutate each other's result
+        return analysis if leader or analysis is None else copy.deepcopy(analysis)
+
+    def _finish_flight(self, flight_key: str, task: asyncio.Future):
+        """Forget a finished request and mark its exception as retrieved"""
+        if self._in_flight.get(flight_key) is task:
+            del self._in_flight[flight_key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _request_analysis(
+        self,
+        car_data: Dict[str, Any],
+        user_prompt: str,
+        cache_key: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Call OpenAI once for a prompt, parse the result and cache it.
+        Errors propagate to every caller waiting on the request.
+        """
+        self.llm_requests += 1
+        make = car_data.get('marka') or car_data.get('brand') or 'Unknown'
+        model = car_data.get('model') or 'Unknown'
+        logger.info(f"Calling OpenAI {self.model} for mechanical analysis: {make} {model}")
+
+        # Non-blocking OpenAI API call, bounded by the concurrency semaphore
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": AUTOMOTIVE_EXPERT_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,  # Lower temperature for more consistent output
+                max_completion_tokens=1500,  # Use max_completion_tokens for newer models
+                response_format={"type": "json_object"}  # Enforce JSON mode
+            )
+
+        response_text = response.choices[0].message.content
+        logger.info("OpenAI response received successfully")
+
+        # Parse and validate response
+        analysis = self._parse_llm_response(response_text)
+
+        if cache_key is not None:
+            try:
+                await asyncio.to_thread(self.cache.put, cache_key, self.cache_version, analysis)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+        return analysis
+
+    def stats(self) -> Dict[str, Any]:
+        """OpenAI request and deduplication counters"""
+        return {
+            "enabled": self.client is not None,
+            "model": self.model,
+            "requests": self.llm_requests,
+            "coalesced_requests": self.coalesced_requests,
+            "in_flight": len(self._in_flight),
+        }
+
 
 # Global instance
 llm_analyzer = LLMMechanicalAnalyzer()
@@ -0,0 +1,242 @@
+"""
+Scoring Executor
+
+Runs CPU-bound scoring (statistical model, crash score, buyability score)
+in a thread or process pool so route handlers never block the event loop.
+Workers preload the model bundles when they start, and the executor keeps
+queue depth and latency metrics per task.
+"""
+import asyncio
+import functools
+import sys
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from loguru import logger
+
+# Latency samples kept per task for percentiles
+LATENCY_WINDOW = 1000
+
+
+# ---------------------------------------------------------------------------
+# Worker-side functions (module level so process pools can pickle them)
+# ---------------------------------------------------------------------------
+
+def _init_worker():
+    """Load the model bundle the statistical analysis uses before taking work"""
+    try:
+        from src.model_registry import model_registry
+        from src.predict_buyability import COMPILED_MODEL_NAME, MODEL_NAME
+
+        for name in (COMPILED_MODEL_NAME, MODEL_NAME):
+            if model_registry.is_available(name):
+                model_registry.get(name)
+                break
+    except Exception as e:
+        logger.warning(f"Scoring worker could not preload models: {e}")
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict):
+    """Run fn in the worker and report how long it took there"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def score_statistical(sample: Dict[str, Any]) -> Dict[str, Any]:
+    """Statistical buyability analysis (ML model)"""
+    from src.predict_buyability import predict_buyability_fast
+    return predict_buyability_fast(sample)
+
+
+def score_statistical_batch(samples: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Statistical analysis of many samples in one vectorized pass. If the
+    batch fails (e.g. one malformed sample), samples are scored one by one
+    and only the ones that fail get None.
+    """
+    from src.predict_buyability import predict_buyability_batch
+    try:
+        return predict_buyability_batch(samples)
+    except Exception as e:
+        logger.warning(f"Batch statistical scoring failed, scoring {len(samples)} samples individually: {e}")
+
+    results: List[Optional[Dict[str, Any]]] = []
+    for position, sample in enumerate(samples):
+        try:
+            results.append(predict_buyability_batch([sample])[0])
+        except Exception as e:
+            logger.warning(f"Statistical scoring failed for sample {position}: {e}")
+            results.append(None)
+    return results
+
+
+def score_crash(
+    painted_parts: Optional[List[str]],
+    changed_parts: Optional[List[str]],
+    local_painted_parts: Optional[List[str]],
+    language: str = "en"
+) -> Dict[str, Any]:
+    """Crash score from painted/changed parts, as a response dict"""
+    from api.services.crash_score_service import calculate_crash_score, crash_score_to_dict
+    return crash_score_to_dict(calculate_crash_score(
+        painted_parts=painted_parts,
+        changed_parts=changed_parts,
+        local_painted_parts=local_painted_parts,
+        language=language
+    ))
+
+
+def score_buyability(
+    statistical_score: Optional[float],
+    mechanical_score: Optional[float],
+    crash_score: Optional[float]
+) -> Dict[str, Any]:
+    """Combined buyability score, as a response dict"""
+    from api.services.buyability_score_service import calculate_buyability_score, buyability_score_to_dict
+    return buyability_score_to_dict(calculate_buyability_score(
+        statistical_score=statistical_score,
+        mechanical_score=mechanical_score,
+        crash_score=crash_score
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Executor
+# ---------------------------------------------------------------------------
+
+class TaskStats:
+    """Counters and recent latencies for one task"""
+
+    def __init__(self):
+        self.completed = 0
+        self.failed = 0
+        self.exec_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.wait_times: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    @staticmethod
+    def _percentile(values: List[float], pct: float) -> float:
+        index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+        return values[index]
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = {"completed": self.completed, "failed": self.failed}
+        for label, samples in (("exec_ms", self.exec_times), ("wait_ms", self.wait_times)):
+            values = sorted(samples)
+            if values:
+                stats[label] = {
+                    "avg": round(sum(values) / len(values) * 1000, 3),
+                    "p50": round(self._percentile(values, 50) * 1000, 3),
+                    "p95": round(self._percentile(values, 95) * 1000, 3),
+                    "p99": round(self._percentile(values, 99) * 1000, 3),
+                    "max": round(values[-1] * 1000, 3),
+                }
+        return stats
+
+
+class ScoringExecutor:
+    """
+    Thread or process pool for CPU-bound scoring, awaited from async routes
+    """
+
+    def __init__(self):
+        self.mode = "thread"
+        self.max_workers = 1
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._stats: Dict[str, TaskStats] = {}
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def _create_executor(self) -> Executor:
+        if self.mode == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="scoring",
+            initializer=_init_worker
+        )
+
+    def start(self, mode: str = "thread", max_workers: int = 2):
+        """Create the worker pool ("thread" or "process")"""
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown scoring executor mode: {mode}")
+        if self.started:
+            return
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self._executor = self._create_executor()
+        logger.info(f"Scoring executor started ({self.mode}, {self.max_workers} workers)")
+
+    async def restart(self):
+        """
+        Replace the pool with fresh workers, e.g. after a model reload so
+        process workers pick up the new artifacts. Tasks already submitted
+        finish on the old pool.
+        """
+        if not self.started:
+            return
+        old = self._executor
+        self._executor = self._create_executor()
+        await asyncio.to_thread(old.shutdown, wait=True)
+        logger.info("Scoring executor restarted")
+
+    async def shutdown(self):
+        """Wait for in-flight tasks, then stop the workers"""
+        if not self.started:
+            return
+        executor = self._executor
+        self._executor = None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        logger.info("Scoring executor shut down")
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and await its result.
+
+        Starts a default thread pool on first use if the lifespan has not
+        started one (e.g. when routes are called outside the app).
+        """
+        if not self.started:
+            self.start()
+
+        stats = self._stats.setdefault(fn.__name__, TaskStats())
+        loop = asyncio.get_running_loop()
+        self._in_flight += 1
+        submitted = time.perf_counter()
+        try:
+            result, exec_time = await loop.run_in_executor(
+                self._executor, functools.partial(_timed_call, fn, args, kwargs)
+            )
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        stats.completed += 1
+        stats.exec_times.append(exec_time)
+        stats.wait_times.append(max(0.0, time.perf_counter() - submitted - exec_time))
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool configuration, queue depth and per-task latency"""
+        return {
+            "mode": self.mode,
+            "workers": self.max_workers,
+            "running": self.started,
+            "in_flight": self._in_flight,
+            "queue_depth": max(0, self._in_flight - self.max_workers),
+            "tasks": {name: stats.to_dict() for name, stats in self._stats.items()},
+        }
+
+
+# Global executor instance, started and stopped in the API lifespan
+scoring_executor = ScoringExecutor()
@@ -1,5 +1,2 @@
-from typing import Dict, Any
-
-# Global in-memory job storage
-# (Later this can be replaced with Redis / DB)
-jobs_storage: Dict[str, Dict[str, Any]] = {}
+"""Crawl job storage (persistent, shared by all API workers)"""
+from api.services.job_store import job_store
@@ -0,0 +1,169 @@
+"""
+LLM Analyzer Concurrency Benchmark
+
+Starts a local stub of the OpenAI chat completions endpoint that answers
+after a fixed delay, points LLMMechanicalAnalyzer at it and compares one
+analysis against N concurrent ones. With the non-blocking client, N
+concurrent analyses (up to OPENAI_MAX_CONCURRENCY) take about as long as one.
+Also checks that identical concurrent requests are coalesced into one stub
+request, and times a cache miss against a cache hit on a temporary LLM cache.
+
+Usage (from the repo root):
+    python backend/benchmark_llm.py [n_concurrent] [delay_seconds]
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STUB_ANALYSIS = {
+    "car_identification": {"engine_code": "N47D20", "transmission_name": "ZF 8HP", "generation": "F30"},
+    "expert_analysis": {
+        "general_comment": "Stub response",
+        "engine_reliability": "Stub response",
+        "transmission_reliability": "Stub response",
+        "km_endurance_check": "Stub response"
+    },
+    "recommendation": {"verdict": "Stub response", "buy_or_pass": "Medium Risk / Inspect"},
+    "scores": {"mechanical_score": 65, "reasoning_for_score": "Stub response"}
+}
+
+SAMPLE_CAR = {
+    "marka": "BMW",
+    "seri": "3 Serisi",
+    "model": "320d",
+    "Model Yıl": 2014,
+    "Km": 180000,
+    "yakit_tipi": "Dizel",
+    "vites": "Otomatik"
+}
+
+
+# Requests the stub has answered
+stub_requests = 0
+
+
+async def handle_stub_connection(reader, writer, delay):
+    """Minimal HTTP/1.1 keep-alive handler returning a fixed chat completion"""
+    global stub_requests
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            content_length = 0
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode().partition(":")
+                if name.strip().lower() == "content-length":
+                    content_length = int(value.strip())
+            request = json.loads(await reader.readexactly(content_length)) if content_length else {}
+
+            stub_requests += 1
+            await asyncio.sleep(delay)
+
+            body = json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": json.dumps(STUB_ANALYSIS)},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+            }).encode()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_benchmark(n_concurrent=10, delay=0.5):
+    server = await asyncio.start_server(
+        lambda r, w: handle_stub_connection(r, w, delay), "127.0.0.1", 0
+    )
+    port = server.sockets[0].getsockname()[1]
+
+    # Settings are read at import time, so configure before importing the service
+    os.environ["OPENAI_API_KEY"] = "stub-key"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{port}/v1"
+    os.environ["OPENAI_MAX_RETRIES"] = "0"
+    cache_dir = tempfile.TemporaryDirectory()
+    os.environ["LLM_CACHE_PATH"] = os.path.join(cache_dir.name, "llm_cache.sqlite3")
+    from config.settings import settings
+    from api.services.llm_service import llm_analyzer
+
+    await llm_analyzer.startup()
+    n_concurrent = min(n_concurrent, settings.OPENAI_MAX_CONCURRENCY)
+    print(f"Stub server on port {port}, {delay}s response delay")
+
+    # Concurrency is measured without the cache, otherwise every call after the first is a hit
+    cache = llm_analyzer.cache
+    llm_analyzer.cache = None
+
+    start = time.perf_counter()
+    single = await llm_analyzer.analyze_mechanical_reliability(SAMPLE_CAR)
+    single_time = time.perf_counter() - start
+
+    # Distinct mileages so the prompts differ and nothing is coalesced
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        llm_analyzer.analyze_mechanical_reliability({**SAMPLE_CAR, "Km": 100000 + i}) for i in range(n_concurrent)
+    ])
+    concurrent_time = time.perf_counter() - start
+
+    # Identical prompts share one in-flight request
+    requests_before = stub_requests
+    start = time.perf_counter()
+    coalesced = await asyncio.gather(*[
+        llm_analyzer.analyze_mechanical_reliability(SAMPLE_CAR) for _ in range(n_concurrent)
+    ])
+    coalesced_time = time.perf_counter() - start
+    coalesced_upstream = stub_requests - requests_before
+
+    llm_analyzer.cache = cache
+    start = time.perf_counter()
+    await llm_analyzer.analyze_mechanical_reliability(SAMPLE_CAR)
+    miss_time = time.perf_counter() - start
+    start = time.perf_counter()
+    cached = await llm_analyzer.analyze_mechanical_reliability({**SAMPLE_CAR, "Km": 181500})
+    hit_time = time.perf_counter() - start
+
+    llm_stats = llm_analyzer.stats()
+    await llm_analyzer.shutdown()
+    cache_dir.cleanup()
+    server.close()
+    await server.wait_closed()
+
+    succeeded = sum(1 for r in results if r) + (1 if single else 0)
+    print(f"1 analysis:            {single_time:.3f}s")
+    print(f"{n_concurrent} concurrent analyses: {concurrent_time:.3f}s ({concurrent_time / single_time:.2f}x one)")
+    print(f"Successful responses:  {succeeded}/{n_concurrent + 1}")
+    print(f"{n_concurrent} identical analyses:  {coalesced_time:.3f}s, {coalesced_upstream} upstream request(s)")
+    print(f"LLM stats:             {llm_stats}")
+    print(f"Cache miss:            {miss_time * 1000:.1f}ms")
+    print(f"Cache hit:             {hit_time * 1000:.1f}ms (same spec, same mileage band)")
+    print(f"Cache stats:           {cache.stats() if cache else 'disabled'}")
+
+    return (succeeded == n_concurrent + 1 and concurrent_time < 2 * single_time
+            and coalesced_upstream == 1 and all(r == single for r in coalesced)
+            and (cache is None or cached == single))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    d = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    sys.exit(0 if asyncio.run(run_benchmark(n, d)) else 1)
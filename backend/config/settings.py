@@ -9,12 +9,21 @@ class Settings(BaseSettings):
     API_HOST: str = "0.0.0.0"
     API_PORT: int = 8000
     DEBUG: bool = True
+    API_WORKERS: int = 1  # uvicorn worker processes; set to match --workers / WEB_CONCURRENCY when started from the CLI
 
     # Database Settings - Choose one: firebase, postgresql, or mongodb
     DATABASE_TYPE: str = "firebase"  # Options: "firebase", "postgresql", "mongodb"
 
     # Firebase Configuration
     FIREBASE_CREDENTIALS_PATH: str = "./serviceAccountKey.json"  # Path to Firebase service account key
+    FIRESTORE_IO_WORKERS: int = 8  # Threads running blocking Firestore calls for async routes
+    LISTING_SEARCH_MAX_SCAN: int = 5000  # Max documents a search reads when filters fall back to Python
+
+    # Listing detail cache (read-through, in front of Firestore)
+    LISTING_CACHE_ENABLED: bool = True
+    LISTING_CACHE_TTL_SECONDS: int = 300
+    LISTING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Memory backend bound (estimated JSON size)
+    LISTING_CACHE_BACKEND: str = "memory"  # Options: "memory" (per process, off when API_WORKERS > 1), "redis" (shared by all workers)
 
     # PostgreSQL Configuration (if DATABASE_TYPE = "postgresql")
     POSTGRES_HOST: str = "localhost"
@@ -47,11 +56,31 @@ class Settings(BaseSettings):
     PROXY_ROTATION_ENABLED: bool = True
 
     # Crawler Settings
-    MAX_CONCURRENT_TASKS: int = 5
+    # Per-process limits: with API_WORKERS > 1 each worker applies its own (the
+    # listing cache's memory backend is not shared either, so it is disabled)
+    MAX_CONCURRENT_TASKS: int = 5  # Crawls running at once per API process (not shared across uvicorn workers)
+    CRAWL_QUEUE_MAX_DEPTH: int = 100  # Queued crawls per API process before POST /crawl returns 429 (not shared)
+    CRAWL_ESTIMATED_SECONDS: int = 30  # Crawl duration estimate until real durations are measured
+    WS_PROGRESS_POLL_SECONDS: float = 2.0  # Job status check interval of /ws/progress (covers jobs run by other workers)
     DEFAULT_TIMEOUT: int = 30
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 5
 
+    # Crawl job store (shared by all API worker processes)
+    JOB_STORE_BACKEND: str = "sqlite"  # Options: "sqlite", "redis"
+    JOB_STORE_PATH: str = "./data/jobs.sqlite3"
+    JOB_BLOB_DIR: str = "./data/job_results"  # Compressed html/text/links/images of crawl results
+    JOB_HEARTBEAT_SECONDS: int = 30  # How often a worker marks its queued and running jobs alive
+    JOB_STALE_SECONDS: int = 300  # Jobs without a heartbeat this long lost their worker: running ones fail, pending ones are requeued
+
+    # Crawl job retention (finished jobs only; 0 TTL = keep)
+    JOB_RETENTION_MAX_JOBS: int = 10000
+    JOB_RETENTION_MAX_BYTES: int = 1024 * 1024 * 1024  # Job records plus compressed result blobs
+    JOB_TTL_COMPLETED_SECONDS: int = 7 * 24 * 3600
+    JOB_TTL_FAILED_SECONDS: int = 3 * 24 * 3600
+    JOB_TTL_CANCELLED_SECONDS: int = 24 * 3600
+    JOB_RETENTION_INTERVAL_SECONDS: int = 300
+
     # Rate Limiting (requests per minute per domain)
     DEFAULT_RATE_LIMIT: int = 30
     RATE_LIMIT_WINDOW: int = 60  # seconds
@@ -77,6 +106,7 @@ class Settings(BaseSettings):
 
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
+    ADMIN_USER_IDS: list[str] = []  # Firebase UIDs allowed to reload models and clear caches (or an "admin" token claim)
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:5173", "http://localhost:5174", "http://localhost:5175", "http://localhost:8080"]
 
     # OpenAI Configuration (for LLM mechanical analysis)
@@ -84,6 +114,31 @@ class Settings(BaseSettings):
     OPENAI_MODEL: str = "gpt-4-turbo"
     OPENAI_TIMEOUT: int = 30
     OPENAI_MAX_RETRIES: int = 2
+    OPENAI_BASE_URL: Optional[str] = None  # Override the API endpoint (e.g. a local stub for benchmarks)
+    OPENAI_HTTP2: bool = True  # Needs the h2 package, falls back to HTTP/1.1 without it
+    OPENAI_MAX_CONNECTIONS: int = 20  # Pooled connections shared by all LLM calls
+    OPENAI_MAX_CONCURRENCY: int = 10  # Max LLM requests in flight at once
+
+    # LLM analysis cache (SQLite, keyed on vehicle spec + mileage band)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = "./data/llm_cache.sqlite3"
+    LLM_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    LLM_CACHE_MAX_ENTRIES: int = 50000
+    LLM_CACHE_KM_BUCKET: int = 25000  # Mileage band width in km
+
+    # ML Models
+    PRELOAD_MODELS: bool = False  # Load model bundles at startup instead of on first request
+    SCORING_EXECUTOR: str = "thread"  # Options: "thread", "process"
+    SCORING_WORKERS: int = 2  # Worker threads/processes for CPU-bound scoring
+
+    # Hybrid analysis per-component timeouts (seconds)
+    ANALYSIS_STATISTICAL_TIMEOUT: float = 5.0
+    ANALYSIS_LLM_TIMEOUT: float = 60.0
+    ANALYSIS_CRASH_TIMEOUT: float = 5.0
+
+    # Bulk analysis
+    BULK_ANALYZE_MAX_ITEMS: int = 500
+    BULK_ANALYZE_LLM_CONCURRENCY: int = 8  # LLM calls in flight per bulk request
 
     model_config = SettingsConfigDict(
         env_file=".env",
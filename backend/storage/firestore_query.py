@@ -0,0 +1,204 @@
+"""
+Firestore query planning for listing search
+
+Turns search filters (brand, year range, price range, ordering, limit) into
+Firestore queries. The preferred plan pushes every filter down and needs one
+of the composite indexes in COMPOSITE_INDEXES. When Firestore cannot serve a
+plan (missing index, unsupported ordering), the repository falls back to the
+next plan in the list, which pushes fewer filters down and applies the rest
+in Python while paging through the results.
+
+Run this module to regenerate firestore.indexes.json at the repo root, then
+deploy it with the Firebase CLI (firebase deploy --only firestore:indexes):
+    python backend/storage/firestore_query.py
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+LISTINGS_COLLECTION = 'car_listings'
+
+# Fields ListingQuery.matches reads, kept in projections of residual plans
+MATCH_FIELDS = ['user_id', 'brand', 'year', 'price']
+
+# Indexes used outside search: per-user price min/max for listing stats
+EXTRA_INDEXES = [
+    [('user_id', 'ASCENDING'), ('price', 'ASCENDING')],
+    [('user_id', 'ASCENDING'), ('price', 'DESCENDING')],
+]
+
+# Ordering every indexed plan is built for (newest first)
+DEFAULT_ORDER_BY = 'crawled_at'
+DEFAULT_DIRECTION = 'DESC'
+
+
+@dataclass
+class ListingQuery:
+    """Filters for a listing search"""
+    user_id: Optional[str] = None
+    brand: Optional[str] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    order_by: str = DEFAULT_ORDER_BY
+    direction: str = DEFAULT_DIRECTION
+    limit: int = 50
+    fields: Optional[List[str]] = None  # Field paths to return (None = whole documents)
+
+    def brand_variants(self) -> List[str]:
+        """
+        Spellings of the brand to match with an 'in' filter. Firestore
+        equality is case-sensitive, so the common casings are queried and
+        matches() keeps the comparison case-insensitive.
+        """
+        if not self.brand:
+            return []
+        variants = [self.brand, self.brand.lower(), self.brand.upper(), self.brand.title(), self.brand.capitalize()]
+        return list(dict.fromkeys(variants))
+
+    def range_filters(self) -> Dict[str, List[Tuple[str, Any]]]:
+        """Inequality filters per field"""
+        ranges: Dict[str, List[Tuple[str, Any]]] = {}
+        if self.min_year is not None:
+            ranges.setdefault('year', []).append(('>=', self.min_year))
+        if self.max_year is not None:
+            ranges.setdefault('year', []).append(('<=', self.max_year))
+        if self.min_price is not None:
+            ranges.setdefault('price', []).append(('>=', self.min_price))
+        if self.max_price is not None:
+            ranges.setdefault('price', []).append(('<=', self.max_price))
+        return ranges
+
+    def matches(self, listing: Dict[str, Any]) -> bool:
+        """Python-side check of every filter, for filters a plan did not push down"""
+        if self.user_id and listing.get('user_id') != self.user_id:
+            return False
+        if self.brand and str(listing.get('brand') or '').lower() != self.brand.lower():
+            return False
+        for field_name, bounds in self.range_filters().items():
+            value = listing.get(field_name)
+            if not isinstance(value, (int, float)):
+                return False
+            for op, bound in bounds:
+                if (op == '>=' and value < bound) or (op == '<=' and value > bound):
+                    return False
+        return True
+
+
+@dataclass
+class QueryPlan:
+    """
+    One way to run a ListingQuery: the filters sent to Firestore and
+    whether the results still need filtering in Python
+    """
+    name: str
+    filters: List[Tuple[str, str, Any]] = field(default_factory=list)
+    order_by: str = DEFAULT_ORDER_BY
+    direction: str = DEFAULT_DIRECTION
+    residual: bool = False
+
+    def index_fields(self) -> List[Tuple[str, str]]:
+        """
+        Composite index this plan needs, as (field, ASCENDING/DESCENDING).
+        Equality fields come first, then the explicit ordering, then the
+        inequality fields, which Firestore orders implicitly by name in the
+        direction of the last explicit ordering.
+        """
+        order = 'DESCENDING' if self.direction.upper() == 'DESC' else 'ASCENDING'
+        equality = [(name, 'ASCENDING') for name, op, _ in self.filters if op in ('==', 'in')]
+        inequality = sorted({name for name, op, _ in self.filters if op not in ('==', 'in')} - {self.order_by})
+        return equality + [(self.order_by, order)] + [(name, order) for name in inequality]
+
+    def signature(self) -> str:
+        """Stable key for the index this plan needs"""
+        return ','.join(f"{name}:{order}" for name, order in self.index_fields())
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "plan": self.name,
+            "pushed_down": [f"{name} {op}" for name, op, _ in self.filters],
+            "order_by": f"{self.order_by} {self.direction.upper()}",
+            "residual_filtering": self.residual,
+        }
+
+
+def plan_listing_query(query: ListingQuery) -> List[QueryPlan]:
+    """
+    Candidate plans for a query, most pushed-down first.
+
+    1. indexed: every filter in Firestore, limit applied server-side
+    2. brand: user + brand in Firestore, ranges filtered in Python
+    3. scan: user only in Firestore, everything else filtered in Python
+
+    Later plans only need the indexes that plain listing already uses, so
+    the last plan always runs.
+    """
+    base = [('user_id', '==', query.user_id)] if query.user_id else []
+    brand = [('brand', 'in', query.brand_variants())] if query.brand else []
+    ranges = [
+        (name, op, bound)
+        for name, bounds in sorted(query.range_filters().items())
+        for op, bound in bounds
+    ]
+
+    candidates = [
+        QueryPlan('indexed', base + brand + ranges, query.order_by, query.direction, residual=False),
+        QueryPlan('brand', base + brand, query.order_by, query.direction, residual=bool(ranges)),
+        QueryPlan('scan', base, query.order_by, query.direction, residual=bool(brand or ranges)),
+    ]
+
+    plans: List[QueryPlan] = []
+    seen = set()
+    for plan in candidates:
+        key = tuple((name, op) for name, op, _ in plan.filters)
+        if key not in seen:
+            seen.add(key)
+            plans.append(plan)
+    return plans
+
+
+def _composite_indexes() -> List[Dict[str, Any]]:
+    """
+    Index definitions (firestore.indexes.json format) for every indexed
+    plan the search endpoint can produce with the default ordering, plus
+    EXTRA_INDEXES
+    """
+    signatures = {
+        ','.join(f"{name}:{order}" for name, order in fields): fields
+        for fields in EXTRA_INDEXES
+    }
+    for has_brand in (False, True):
+        for has_year in (False, True):
+            for has_price in (False, True):
+                query = ListingQuery(
+                    user_id='user',
+                    brand='brand' if has_brand else None,
+                    min_year=0 if has_year else None,
+                    min_price=0 if has_price else None,
+                )
+                for plan in plan_listing_query(query):
+                    fields = plan.index_fields()
+                    if len(fields) > 1:
+                        signatures[plan.signature()] = fields
+
+    return [
+        {
+            "collectionGroup": LISTINGS_COLLECTION,
+            "queryScope": "COLLECTION",
+            "fields": [{"fieldPath": name, "order": order} for name, order in fields],
+        }
+        for _, fields in sorted(signatures.items())
+    ]
+
+
+COMPOSITE_INDEXES = _composite_indexes()
+
+
+if __name__ == "__main__":
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "firestore.indexes.json")
+    with open(path, "w") as f:
+        json.dump({"indexes": COMPOSITE_INDEXES, "fieldOverrides": []}, f, indent=2)
+        f.write("\n")
+    print(f"Wrote {len(COMPOSITE_INDEXES)} composite indexes to {path}")
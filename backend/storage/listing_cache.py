@@ -0,0 +1,296 @@
+"""
+Read-through cache for single-listing lookups
+
+Entries are keyed by listing_id and remember which field paths they hold
+(None = the whole document). A lookup is served from the cache when the
+cached paths cover the requested ones, so a detail-view read also serves
+the later ownership and analyze lookups of the same listing. Reads of
+other paths are merged into the entry.
+
+Two backends:
+    memory: per-process LRU bounded by an estimate of the cached bytes;
+            not used with API_WORKERS > 1, since a write in one worker
+            would not invalidate the others' entries
+    redis:  shared by every worker of a multi-process deployment
+
+Writes invalidate the listing's entry. The memory backend also keeps a
+version per recently invalidated listing, so a read that was in flight
+during a write does not put the old document back; with redis that window
+is bounded by the TTL.
+"""
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from loguru import logger
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Invalidation versions kept for in-flight reads
+VERSION_WINDOW = 10000
+
+
+def _covers(cached_fields: Optional[List[str]], fields: Optional[List[str]]) -> bool:
+    """Whether an entry holding cached_fields can answer a read of fields"""
+    if cached_fields is None:
+        return True
+    if fields is None:
+        return False
+    cached = set(cached_fields)
+    for path in fields:
+        parts = path.split('.')
+        if not any('.'.join(parts[:i]) in cached for i in range(1, len(parts) + 1)):
+            return False
+    return True
+
+
+def _project(doc: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Copy of the given field paths of doc (missing paths are left out, as Firestore does)"""
+    if fields is None:
+        return copy.deepcopy(doc)
+
+    projected: Dict[str, Any] = {}
+    for path in fields:
+        parts = path.split('.')
+        value = doc
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = copy.deepcopy(value)
+
+    if 'id' in doc:
+        projected['id'] = doc['id']
+    return projected
+
+
+def _merge(base: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """Deep merge, so a partial read of a map does not drop its other keys"""
+    merged = dict(base)
+    for key, value in update.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    return str(value)
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class MemoryBackend:
+    """LRU of entries bounded by their estimated size in bytes"""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], int, float]]" = OrderedDict()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        entry, _, expires_at = item
+        if expires_at <= time.monotonic():
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, entry: Dict[str, Any], ttl: float):
+        size = len(json.dumps(entry, default=_encode))
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        self.delete(key)
+        self._entries[key] = (entry, size, time.monotonic() + ttl)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def delete(self, key: str):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.bytes -= item[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class RedisBackend:
+    """Entries as JSON strings in Redis, expired by Redis"""
+
+    name = "redis"
+    prefix = "listing-cache:"
+
+    def __init__(self, host: str, port: int, db: int, password: Optional[str]):
+        self.client = redis.Redis(host=host, port=port, db=db, password=password, socket_timeout=0.5)
+        self.errors = 0
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self.client.get(self.prefix + key)
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.debug(f"Listing cache read failed: {e}")
+            return None
+        return json.loads(raw, object_hook=_decode) if raw else None
+
+    def store(self, key: str, entry: Dict[str, Any], ttl: float):
+        try:
+            self.client.set(self.prefix + key, json.dumps(entry, default=_encode), ex=max(1, int(ttl)))
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.debug(f"Listing cache write failed: {e}")
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(self.prefix + key)
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.warning(f"Listing cache invalidation failed for {key}: {e}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + "*", count=500))
+            if keys:
+                self.client.delete(*keys)
+        except redis.RedisError as e:
+            self.errors += 1
+            logger.warning(f"Listing cache clear failed: {e}")
+
+    def info(self) -> Dict[str, Any]:
+        return {"errors": self.errors}
+
+
+class ListingCache:
+    """
+    TTL cache of listing documents keyed by listing_id
+    """
+
+    def __init__(self, ttl_seconds: float, backend):
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["ListingCache"]:
+        """
+        Cache configured by the LISTING_CACHE_* settings (None when disabled,
+        or when only a per-process memory cache is possible with API_WORKERS > 1)
+        """
+        if not settings.LISTING_CACHE_ENABLED:
+            return None
+
+        backend = None
+        if settings.LISTING_CACHE_BACKEND == "redis":
+            if REDIS_AVAILABLE:
+                backend = RedisBackend(
+                    settings.REDIS_HOST, settings.REDIS_PORT, settings.REDIS_DB, settings.REDIS_PASSWORD
+                )
+            else:
+                logger.warning("redis package not installed, listing cache falls back to memory. Run: pip install redis")
+        if backend is None and settings.API_WORKERS > 1:
+            logger.warning(
+                f"Listing cache disabled: the memory backend is per process and {settings.API_WORKERS} "
+                f"workers would serve stale listings. Set LISTING_CACHE_BACKEND=redis"
+            )
+            return None
+        return cls(settings.LISTING_CACHE_TTL_SECONDS, backend or MemoryBackend(settings.LISTING_CACHE_MAX_BYTES))
+
+    def get(self, listing_id: str, fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """The requested paths of a cached listing, or None on a miss"""
+        with self._lock:
+            entry = self.backend.load(listing_id)
+            if entry is None or not _covers(entry['fields'], fields):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _project(entry['doc'], fields)
+
+    def version(self, listing_id: str) -> int:
+        """Token to pass to put(), taken before reading the listing"""
+        with self._lock:
+            return self._versions.get(listing_id, 0)
+
+    def put(self, listing_id: str, fields: Optional[List[str]], doc: Dict[str, Any], version: int = 0):
+        """Cache a listing read with fields, unless it was invalidated since version()"""
+        with self._lock:
+            if self._versions.get(listing_id, 0) != version:
+                return
+            entry = self.backend.load(listing_id)
+            if entry is not None:
+                merged_fields = None if entry['fields'] is None or fields is None else sorted(set(entry['fields']) | set(fields))
+                entry = {'fields': merged_fields, 'doc': _merge(entry['doc'], copy.deepcopy(doc))}
+            else:
+                entry = {'fields': list(fields) if fields is not None else None, 'doc': copy.deepcopy(doc)}
+            self.backend.store(listing_id, entry, self.ttl_seconds)
+
+    def invalidate(self, listing_ids: Iterable[str]):
+        """Drop listings after a write"""
+        with self._lock:
+            for listing_id in listing_ids:
+                if not listing_id:
+                    continue
+                listing_id = str(listing_id)
+                self._versions[listing_id] = self._versions.pop(listing_id, 0) + 1
+                self.backend.delete(listing_id)
+                self.invalidations += 1
+            while len(self._versions) > VERSION_WINDOW:
+                self._versions.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self.backend.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Hit rate and backend usage"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            **self.backend.info(),
+        }
@@ -0,0 +1,103 @@
+"""
+Per-user listing statistics aggregates
+
+Each user has one document in the user_listing_stats collection holding
+running totals of their listings (count, price sum/count, price min/max,
+quality sum and per-year counts). The repository applies a listing's
+contribution in the same transaction that writes or deletes the listing,
+so the stats endpoint reads one document instead of every listing.
+
+Year min/max come from the per-year counts, so deletes keep them exact.
+Deleting the cheapest or most expensive listing marks the price range
+stale; it is recomputed with two single-document queries on the next read.
+"""
+from typing import Any, Dict, Iterable, Optional
+
+STATS_COLLECTION = 'user_listing_stats'
+
+# Listing fields the aggregates depend on
+STATS_FIELDS = ['user_id', 'price', 'year', 'data_quality_score']
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {
+        'count': 0,
+        'price_count': 0,
+        'price_sum': 0.0,
+        'price_min': None,
+        'price_max': None,
+        'price_range_stale': False,
+        'quality_sum': 0.0,
+        'year_counts': {},
+    }
+
+
+def apply_listing(stats: Dict[str, Any], listing: Dict[str, Any], sign: int = 1) -> Dict[str, Any]:
+    """
+    Add (sign=1) or remove (sign=-1) one listing's contribution.
+
+    Same rules as the original summary: prices, years and quality scores
+    only count when set and non-zero.
+    """
+    stats['count'] = max(0, stats['count'] + sign)
+
+    price = listing.get('price')
+    if price:
+        stats['price_count'] = max(0, stats['price_count'] + sign)
+        stats['price_sum'] += sign * price
+        if sign > 0:
+            if not stats['price_range_stale']:
+                stats['price_min'] = price if stats['price_min'] is None else min(stats['price_min'], price)
+                stats['price_max'] = price if stats['price_max'] is None else max(stats['price_max'], price)
+        elif price in (stats['price_min'], stats['price_max']):
+            stats['price_range_stale'] = True
+
+    quality = listing.get('data_quality_score')
+    if quality:
+        stats['quality_sum'] += sign * quality
+
+    year = listing.get('year')
+    if year:
+        key = str(int(year))
+        remaining = stats['year_counts'].get(key, 0) + sign
+        if remaining > 0:
+            stats['year_counts'][key] = remaining
+        else:
+            stats['year_counts'].pop(key, None)
+
+    if stats['price_count'] == 0:
+        stats.update(price_sum=0.0, price_min=None, price_max=None, price_range_stale=False)
+    if stats['count'] == 0:
+        stats['quality_sum'] = 0.0
+
+    return stats
+
+
+def build_stats(listings: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregates for a full set of listings (backfill and rebuilds)"""
+    stats = empty_stats()
+    for listing in listings:
+        apply_listing(stats, listing)
+    return stats
+
+
+def stats_summary(stats: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregates in the GET /listings/stats/summary response format"""
+    stats = stats or empty_stats()
+    years = [int(year) for year in stats.get('year_counts', {})]
+    count = stats.get('count', 0)
+    price_count = stats.get('price_count', 0)
+
+    return {
+        "total_listings": count,
+        "avg_price": stats.get('price_sum', 0) / price_count if price_count > 0 else 0,
+        "avg_quality_score": stats.get('quality_sum', 0) / count if count > 0 else 0,
+        "price_range": {
+            "min": stats.get('price_min') or 0,
+            "max": stats.get('price_max') or 0
+        },
+        "year_range": {
+            "min": min(years) if years else 0,
+            "max": max(years) if years else 0
+        }
+    }
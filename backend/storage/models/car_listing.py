@@ -102,6 +102,7 @@ class CarListing(Base):
         Index('idx_brand_year', 'brand', 'year'),
         Index('idx_price_mileage', 'price', 'mileage'),
         Index('idx_source_date', 'source', 'crawled_at'),
+        Index('idx_crawled_at_id', 'crawled_at', 'id'),  # Keyset pagination
         UniqueConstraint('listing_id', 'source', name='uq_listing_per_source'),
     )
 
@@ -0,0 +1,54 @@
+"""
+Opaque cursors for keyset pagination
+
+A cursor carries the sort key of the last item on a page (e.g. its
+crawled_at and id). The next page starts after that key, so every page
+costs the same regardless of how deep it is.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(order_by: str, value: Any, item_id: Any) -> str:
+    """Cursor pointing after the item with this sort value and id"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"o": order_by, "v": value, "id": item_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: str) -> Dict[str, Any]:
+    """
+    Decode a cursor made by encode_cursor for the same ordering.
+
+    Returns:
+        Dict with "value" (sort value) and "id"
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["v"]
+        if isinstance(value, dict) and "dt" in value:
+            value = datetime.fromisoformat(value["dt"])
+        item_id = payload["id"]
+        cursor_order = payload["o"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {e}") from e
+
+    if cursor_order != order_by:
+        raise ValueError(f"Cursor was issued for ordering by {cursor_order}, not {order_by}")
+    return {"value": value, "id": item_id}
+
+
+def cursor_after(items, order_by: str, id_key: str, limit: int) -> Optional[str]:
+    """Cursor for the page after items, or None if this was the last page"""
+    if len(items) < limit or not items:
+        return None
+    last = items[-1]
+    get = last.get if isinstance(last, dict) else lambda key: getattr(last, key, None)
+    return encode_cursor(order_by, get(order_by), get(id_key))
@@ -1,18 +1,37 @@
 """Repository for database operations on car listings"""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, FrozenSet
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy.exc import SQLAlchemyError
 from loguru import logger
 
 from .models import CarListing, ListingImage, SessionLocal
 from .models.car_listing import CarListingSource
+from .pagination import cursor_after, decode_cursor
+from .bulk import BulkWriteReport
 
 
 class CarListingRepository:
     """Repository for car listing database operations"""
 
+    # Listings per INSERT ... ON CONFLICT statement in bulk_upsert
+    BULK_CHUNK_SIZE = 500
+
+    # Columns an upsert never overwrites
+    UPSERT_KEEP_COLUMNS = {'id', 'listing_id', 'crawled_at'}
+
+    # Values _listing_values fills in for keys missing from cleaned_data
+    LISTING_DEFAULTS = {
+        'source': 'sahibinden',
+        'features': {},
+        'technical_specs': {},
+        'painted_parts': {},
+        'data_quality_score': 0.0,
+    }
+
     def __init__(self, db: Optional[Session] = None):
         """
         Initialize repository
@@ -71,51 +90,7 @@ class CarListingRepository:
                 return self.update_listing(existing.id, cleaned_data, images)
 
             # Create new listing
-            listing = CarListing(
-                listing_id=listing_id,
-                url=cleaned_data.get('url'),
-                source=cleaned_data.get('source', 'sahibinden'),
-
-                # Overview
-                brand=cleaned_data.get('brand'),
-                series=cleaned_data.get('series'),
-                model=cleaned_data.get('model'),
-                year=cleaned_data.get('year'),
-                price=cleaned_data.get('price'),
-                mileage=cleaned_data.get('mileage'),
-                listing_date=self._parse_datetime(cleaned_data.get('listing_date')),
-
-                # Details
-                fuel_type=cleaned_data.get('fuel_type'),
-                transmission=cleaned_data.get('transmission'),
-                body_type=cleaned_data.get('body_type'),
-                engine_power=cleaned_data.get('engine_power'),
-                engine_volume=cleaned_data.get('engine_volume'),
-                drive_type=cleaned_data.get('drive_type'),
-                color=cleaned_data.get('color'),
-                vehicle_condition=cleaned_data.get('vehicle_condition'),
-
-                # Seller Info
-                seller_type=cleaned_data.get('seller_type'),
-                location=cleaned_data.get('location'),
-                warranty=cleaned_data.get('warranty'),
-                heavy_damage=cleaned_data.get('heavy_damage'),
-                plate_origin=cleaned_data.get('plate_origin'),
-                trade_option=cleaned_data.get('trade_option'),
-                title=cleaned_data.get('title'),
-                description=cleaned_data.get('description'),
-                phone=cleaned_data.get('phone'),
-
-                # Structured data
-                features=cleaned_data.get('features', {}),
-                technical_specs=cleaned_data.get('technical_specs', {}),
-                painted_parts=cleaned_data.get('painted_parts', {}),
-
-                # Metadata
-                data_quality_score=cleaned_data.get('data_quality_score', 0.0),
-                has_images=bool(images),
-                has_painted_diagram=self._has_painted_diagram(images),
-            )
+            listing = CarListing(**self._listing_values(cleaned_data, images))
 
             db.add(listing)
             db.flush()  # Get the listing ID before adding images
@@ -123,17 +98,7 @@ class CarListingRepository:
             # Add images if provided
             if images:
                 for img_data in images:
-                    image = ListingImage(
-                        listing_id=listing.id,
-                        image_type=img_data.get('image_type'),
-                        image_order=img_data.get('image_order'),
-                        original_url=img_data.get('original_url'),
-                        local_path=img_data.get('local_path'),
-                        file_size=img_data.get('file_size'),
-                        width=img_data.get('width'),
-                        height=img_data.get('height'),
-                    )
-                    db.add(image)
+                    db.add(ListingImage(**self._image_values(listing.id, img_data)))
 
             db.commit()
             self.logger.success(f"Created listing {listing_id} (ID: {listing.id}) with {len(images) if images else 0} images")
@@ -203,17 +168,7 @@ class CarListingRepository:
 
                 # Add new images
                 for img_data in images:
-                    image = ListingImage(
-                        listing_id=listing.id,
-                        image_type=img_data.get('image_type'),
-                        image_order=img_data.get('image_order'),
-                        original_url=img_data.get('original_url'),
-                        local_path=img_data.get('local_path'),
-                        file_size=img_data.get('file_size'),
-                        width=img_data.get('width'),
-                        height=img_data.get('height'),
-                    )
-                    db.add(image)
+                    db.add(ListingImage(**self._image_values(listing.id, img_data)))
 
                 listing.has_images = bool(images)
                 listing.has_painted_diagram = self._has_painted_diagram(images)
@@ -232,6 +187,107 @@ class CarListingRepository:
             self.logger.error(f"Error updating listing: {str(e)}")
             return None
 
+    def bulk_upsert(self, listings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Insert or update many listings with INSERT ... ON CONFLICT
+
+        Each item is cleaned listing data with an optional 'images' key.
+        Listings are written BULK_CHUNK_SIZE at a time: one multi-row upsert
+        per chunk (an existing row keeps a column whose new value is NULL or
+        whose key is missing from the item, like update_listing; defaults only
+        apply to new rows), then one delete and one multi-row insert for the
+        images of listings that came with images. Each chunk commits on its
+        own; when a chunk fails, its listings are retried one by one in
+        savepoints so a bad row only fails itself.
+
+        Returns:
+            BulkWriteReport dict (written count, per-listing failures, throughput)
+        """
+        db = self._get_session()
+        report = BulkWriteReport(total=len(listings))
+
+        # A repeated listing_id keeps its last entry, as sequential upserts would
+        entries: Dict[str, Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], FrozenSet[str]]] = {}
+        for item in listings:
+            listing_id = item.get('listing_id')
+            if not listing_id:
+                report.fail(None, "missing listing_id")
+                continue
+            images = item.get('images')
+            data = {key: value for key, value in item.items() if key != 'images'}
+            defaulted = frozenset(key for key in self.LISTING_DEFAULTS if key not in data)
+            entries[str(listing_id)] = (self._listing_values(data, images), images, defaulted)
+
+        items = list(entries.items())
+        for start in range(0, len(items), self.BULK_CHUNK_SIZE):
+            chunk = items[start:start + self.BULK_CHUNK_SIZE]
+            try:
+                self._upsert_chunk(db, chunk)
+                db.commit()
+                report.written += len(chunk)
+                continue
+            except SQLAlchemyError as e:
+                db.rollback()
+                self.logger.warning(f"Bulk upsert chunk failed, retrying row by row: {str(e)}")
+
+            for entry in chunk:
+                try:
+                    with db.begin_nested():
+                        self._upsert_chunk(db, [entry])
+                    report.written += 1
+                except SQLAlchemyError as e:
+                    report.fail(entry[0], getattr(e, 'orig', None) or e)
+            db.commit()
+
+        result = report.to_dict()
+        self.logger.success(
+            f"Bulk upserted {result['written']}/{result['total']} listings "
+            f"({result['listings_per_second']}/s, {len(result['failed'])} failed)"
+        )
+        return result
+
+    def _upsert_chunk(
+        self,
+        db: Session,
+        entries: List[Tuple[str, Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]], FrozenSet[str]]]]
+    ):
+        """Upsert one chunk of listings and replace the images of those that came with images"""
+        pks: Dict[str, int] = {}
+
+        # Listings without images keep their image flags, and defaulted
+        # columns keep their stored value, so each combination gets its own
+        # statement (defaults still fill the NOT NULL columns of new rows)
+        groups: Dict[Tuple[bool, FrozenSet[str]], List[Dict[str, Any]]] = {}
+        for _, (values, images, defaulted) in entries:
+            groups.setdefault((images is not None, defaulted), []).append(values)
+
+        for (with_images, defaulted), rows in groups.items():
+            keep = self.UPSERT_KEEP_COLUMNS | defaulted
+            if not with_images:
+                keep = keep | {'has_images', 'has_painted_diagram'}
+            stmt = pg_insert(CarListing).values(rows)
+            columns = CarListing.__table__.columns
+            updates = {
+                name: func.coalesce(stmt.excluded[name], columns[name])
+                for name in rows[0] if name not in keep
+            }
+            updates['cleaned_at'] = func.now()
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CarListing.listing_id],
+                set_=updates
+            ).returning(CarListing.id, CarListing.listing_id)
+            pks.update({listing_id: pk for pk, listing_id in db.execute(stmt)})
+
+        replaced = [(pks[listing_id], images) for listing_id, (_, images, _) in entries if images is not None]
+        if replaced:
+            db.query(ListingImage).filter(
+                ListingImage.listing_id.in_([pk for pk, _ in replaced])
+            ).delete(synchronize_session=False)
+
+            image_rows = [self._image_values(pk, img_data) for pk, images in replaced for img_data in images]
+            if image_rows:
+                db.execute(insert(ListingImage).values(image_rows))
+
     def get_by_id(self, id: int) -> Optional[CarListing]:
         """Get listing by database ID"""
         db = self._get_session()
@@ -254,7 +310,8 @@ class CarListingRepository:
         self,
         limit: int = 100,
         offset: int = 0,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
     ) -> List[CarListing]:
         """
         List listings with optional filters
@@ -263,6 +320,7 @@ class CarListingRepository:
             limit: Max number of results
             offset: Number to skip
             filters: Dict of field=value filters
+            columns: Columns to load (None for all)
 
         Returns:
             List of listings
@@ -278,6 +336,8 @@ class CarListingRepository:
                     if hasattr(CarListing, key):
                         query = query.filter(getattr(CarListing, key) == value)
 
+            query = self._load_columns(query, columns)
+
             # Sort by crawled_at descending (newest first)
             query = query.order_by(CarListing.crawled_at.desc())
 
@@ -290,6 +350,68 @@ class CarListingRepository:
             self.logger.error(f"Error listing listings: {str(e)}")
             return []
 
+    def list_listings_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[str]] = None
+    ) -> Tuple[List[CarListing], Optional[str]]:
+        """
+        One page of listings, newest first, using keyset pagination
+
+        Pages continue after the (crawled_at, id) of the previous page's last
+        row instead of using OFFSET, so deep pages cost the same as the first.
+
+        Args:
+            limit: Page size
+            cursor: next_cursor from the previous page (None for the first page)
+            filters: Dict of field=value filters
+            columns: Columns to load (None for all); crawled_at is always loaded
+
+        Returns:
+            Tuple of (listings, cursor for the next page or None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        db = self._get_session()
+        position = decode_cursor(cursor, 'crawled_at') if cursor else None
+
+        try:
+            query = db.query(CarListing)
+
+            if filters:
+                for key, value in filters.items():
+                    if hasattr(CarListing, key):
+                        query = query.filter(getattr(CarListing, key) == value)
+
+            query = self._load_columns(query, columns and [*columns, 'crawled_at'])
+
+            if position:
+                query = query.filter(or_(
+                    CarListing.crawled_at < position["value"],
+                    and_(CarListing.crawled_at == position["value"], CarListing.id < position["id"])
+                ))
+
+            query = query.order_by(CarListing.crawled_at.desc(), CarListing.id.desc())
+            listings = query.limit(limit).all()
+
+            return listings, cursor_after(listings, 'crawled_at', 'id', limit)
+
+        except SQLAlchemyError as e:
+            self.logger.error(f"Error listing listings page: {str(e)}")
+            return [], None
+
+    @staticmethod
+    def _load_columns(query, columns: Optional[List[str]]):
+        """Restrict a CarListing query to the given columns (primary key is always loaded)"""
+        if not columns:
+            return query
+        table_columns = CarListing.__table__.columns
+        attributes = [getattr(CarListing, name) for name in dict.fromkeys(columns) if name in table_columns]
+        return query.options(load_only(*attributes)) if attributes else query
+
     def delete_listing(self, id: int) -> bool:
         """Delete listing by ID"""
         db = self._get_session()
@@ -334,6 +456,73 @@ class CarListingRepository:
             self.logger.error(f"Error getting statistics: {str(e)}")
             return {}
 
+    @classmethod
+    def _listing_values(
+        cls,
+        cleaned_data: Dict[str, Any],
+        images: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Column values for a new listing row"""
+        return {
+            'listing_id': cleaned_data.get('listing_id'),
+            'url': cleaned_data.get('url'),
+            'source': cleaned_data.get('source', 'sahibinden'),
+
+            # Overview
+            'brand': cleaned_data.get('brand'),
+            'series': cleaned_data.get('series'),
+            'model': cleaned_data.get('model'),
+            'year': cleaned_data.get('year'),
+            'price': cleaned_data.get('price'),
+            'mileage': cleaned_data.get('mileage'),
+            'listing_date': cls._parse_datetime(cleaned_data.get('listing_date')),
+
+            # Details
+            'fuel_type': cleaned_data.get('fuel_type'),
+            'transmission': cleaned_data.get('transmission'),
+            'body_type': cleaned_data.get('body_type'),
+            'engine_power': cleaned_data.get('engine_power'),
+            'engine_volume': cleaned_data.get('engine_volume'),
+            'drive_type': cleaned_data.get('drive_type'),
+            'color': cleaned_data.get('color'),
+            'vehicle_condition': cleaned_data.get('vehicle_condition'),
+
+            # Seller Info
+            'seller_type': cleaned_data.get('seller_type'),
+            'location': cleaned_data.get('location'),
+            'warranty': cleaned_data.get('warranty'),
+            'heavy_damage': cleaned_data.get('heavy_damage'),
+            'plate_origin': cleaned_data.get('plate_origin'),
+            'trade_option': cleaned_data.get('trade_option'),
+            'title': cleaned_data.get('title'),
+            'description': cleaned_data.get('description'),
+            'phone': cleaned_data.get('phone'),
+
+            # Structured data
+            'features': cleaned_data.get('features', {}),
+            'technical_specs': cleaned_data.get('technical_specs', {}),
+            'painted_parts': cleaned_data.get('painted_parts', {}),
+
+            # Metadata
+            'data_quality_score': cleaned_data.get('data_quality_score', 0.0),
+            'has_images': bool(images),
+            'has_painted_diagram': cls._has_painted_diagram(images),
+        }
+
+    @staticmethod
+    def _image_values(listing_pk: int, img_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Column values for one listing image row"""
+        return {
+            'listing_id': listing_pk,
+            'image_type': img_data.get('image_type'),
+            'image_order': img_data.get('image_order'),
+            'original_url': img_data.get('original_url'),
+            'local_path': img_data.get('local_path'),
+            'file_size': img_data.get('file_size'),
+            'width': img_data.get('width'),
+            'height': img_data.get('height'),
+        }
+
     @staticmethod
     def _parse_datetime(value: Any) -> Optional[datetime]:
         """Parse datetime value"""
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+
+"Build per-user listing statistics aggregates for existing listings"
+
+import argparse
+import sys
+import os
+from loguru import logger
+
+# Backend modules import each other as top-level packages (config, storage)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+# Configure logger
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+)
+
+
+def main():
+    """Backfill aggregates for every user, or rebuild them for one user"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--user", help="Only rebuild this user's stats")
+    args = parser.parse_args()
+
+    try:
+        from storage.firebase_repository import FirestoreRepository
+
+        repo = FirestoreRepository()
+
+        if args.user:
+            stats = repo.rebuild_user_stats(args.user)
+            logger.success(f"Rebuilt stats for {args.user}: {stats['count']} listings")
+        else:
+            users = repo.backfill_user_stats()
+            logger.success(f"Listing stats written for {users} users")
+
+        return True
+
+    except Exception as e:
+        logger.error(f"Backfill failed: {str(e)}")
+        return False
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
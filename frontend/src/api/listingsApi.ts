@@ -126,9 +126,10 @@ export interface HybridAnalysis {
 // Legacy type alias for backward compatibility
 export type BuyabilityAnalysis = StatisticalAnalysis;
 
-export const getListings = async (limit: number = 50, skip: number = 0) => {
+// Pass the previous response's next_cursor to get the following page
+export const getListings = async (limit: number = 50, cursor?: string | null) => {
   const response = await api.get("/listings", {
-    params: { limit, skip },
+    params: { limit, cursor: cursor ?? undefined },
   });
   return response.data;
 };
@@ -190,6 +190,17 @@ export const useCrawler = () => {
     setStatusMessage('Loaded from history');
     setError(null);
     setElapsedSeconds(0);
+
+    // History cards only carry the list-view fields; load the full listing for the detail view
+    crawlerApi.getListing(listing.listing_id)
+      .then((response) => {
+        if (response?.data) {
+          setResult(listingToCrawlResult(response.data));
+        }
+      })
+      .catch((err: any) => {
+        console.error('Failed to load listing details:', err);
+      });
   }, []);
 
   // Cleanup on unmount
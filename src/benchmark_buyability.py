@@ -0,0 +1,86 @@
+"""
+Buyability Scoring Benchmark
+
+Compares the per-row predict_buyability loop against predict_buyability_batch
+on samples drawn from the raw dataset, and checks both return identical results.
+Also checks predict_buyability_fast against predict_buyability and reports its
+single-row latency percentiles.
+
+Usage (from the repo root):
+    python src/benchmark_buyability.py [n_rows]
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from src.predict_buyability import predict_buyability, predict_buyability_batch, predict_buyability_fast
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "raw", "turkey_car_market.csv")
+
+
+def load_samples(n_rows):
+    """Build API-style samples from the raw dataset"""
+    df = pd.read_csv(DATA_PATH)
+    df = df.sample(n=min(n_rows, len(df)), random_state=42, replace=False)
+    return [
+        {
+            "Model Yıl": int(row["Model Yıl"]),
+            "Km": int(row["Km"]),
+            "CCM": row["CCM"],
+            "Beygir Gucu": row["Beygir Gucu"],
+        }
+        for _, row in df.iterrows()
+    ]
+
+
+def run_benchmark(n_rows=2000):
+    samples = load_samples(n_rows)
+    print(f"Scoring {len(samples)} samples...")
+
+    start = time.perf_counter()
+    loop_results = [predict_buyability(sample) for sample in samples]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch_results = predict_buyability_batch(samples)
+    batch_time = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(loop_results, batch_results) if a != b)
+
+    print(f"Per-row loop: {loop_time:.3f}s ({len(samples) / loop_time:,.0f} rows/s)")
+    print(f"Batch:        {batch_time:.3f}s ({len(samples) / batch_time:,.0f} rows/s)")
+    print(f"Speedup:      {loop_time / batch_time:.1f}x")
+    print(f"Mismatches:   {mismatches}")
+
+    # Warm up the compiled bundle so its load time isn't counted
+    predict_buyability_fast(samples[0])
+    fast_results = []
+    latencies = []
+    for sample in samples:
+        start = time.perf_counter()
+        fast_results.append(predict_buyability_fast(sample))
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+
+    # model_version names the bundle that scored the sample, so it differs by design
+    fast_mismatches = sum(
+        1 for a, b in zip(loop_results, fast_results)
+        if {**a, 'model_version': None} != {**b, 'model_version': None}
+    )
+
+    print(f"Fast path:    {latencies.sum() / 1000:.3f}s ({len(samples) / latencies.sum() * 1000:,.0f} rows/s)")
+    print(f"Fast latency: p50 {np.percentile(latencies, 50):.3f}ms, "
+          f"p99 {np.percentile(latencies, 99):.3f}ms, max {latencies.max():.3f}ms")
+    print(f"Fast mismatches: {fast_mismatches}")
+
+    return mismatches == 0 and fast_mismatches == 0
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    sys.exit(0 if run_benchmark(n) else 1)
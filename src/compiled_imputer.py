@@ -0,0 +1,109 @@
+"""
+Compiled Imputer
+
+Flattens a fitted IterativeImputer with a linear estimator (the default
+BayesianRidge) into its initial fill values and the per-step regression
+coefficients, and replays the imputation rounds with NumPy. Lets the
+compiled buyability bundle fill missing values without importing sklearn.
+
+train_binary_zscore.py exports the fitted imputer;
+tests/test_compiled_imputer.py checks it against sklearn.
+"""
+import numpy as np
+
+
+def export_imputer(imputer):
+    """
+    Flatten a fitted IterativeImputer into arrays.
+
+    Args:
+        imputer: sklearn IterativeImputer fitted with a linear estimator,
+                 initial_strategy mean/median/constant and sample_posterior=False
+
+    Returns:
+        Dictionary of NumPy arrays accepted by CompiledImputer
+    """
+    if imputer.sample_posterior:
+        raise ValueError("sample_posterior imputers are not supported")
+    if imputer.add_indicator:
+        raise ValueError("Imputers with a missing indicator are not supported")
+    if np.any(imputer.initial_imputer_.statistics_ != imputer.initial_imputer_.statistics_):
+        raise ValueError("Imputers with empty features are not supported")
+
+    sequence = imputer.imputation_sequence_
+    if not all(hasattr(step.estimator, "coef_") for step in sequence):
+        raise ValueError("Only linear estimators are supported")
+    if len({len(step.neighbor_feat_idx) for step in sequence}) > 1:
+        raise ValueError("n_nearest_features imputers are not supported")
+
+    n_neighbors = len(sequence[0].neighbor_feat_idx) if sequence else 0
+    return {
+        "statistics": np.asarray(imputer.initial_imputer_.statistics_, dtype=np.float64),
+        "feat_idx": np.array([step.feat_idx for step in sequence], dtype=np.intp),
+        "neighbor_feat_idx": np.array([step.neighbor_feat_idx for step in sequence],
+                                      dtype=np.intp).reshape(len(sequence), n_neighbors),
+        "coef": np.array([step.estimator.coef_ for step in sequence],
+                         dtype=np.float64).reshape(len(sequence), n_neighbors),
+        "intercept": np.array([step.estimator.intercept_ for step in sequence], dtype=np.float64),
+        "min_value": np.asarray(imputer._min_value, dtype=np.float64),
+        "max_value": np.asarray(imputer._max_value, dtype=np.float64),
+        "feature_names": np.array([str(name) for name in getattr(imputer, "feature_names_in_", [])]),
+    }
+
+
+class CompiledImputer:
+    """
+    NumPy replay of an exported IterativeImputer.
+
+    transform gives the same values as IterativeImputer.transform: the same
+    initial fill, then every imputation step as a row-vector dot product in
+    the same order, clipped to the same bounds.
+    """
+
+    def __init__(self, arrays):
+        self.statistics = arrays["statistics"]
+        self.feat_idx = arrays["feat_idx"].astype(np.intp)
+        self.neighbor_feat_idx = arrays["neighbor_feat_idx"].astype(np.intp)
+        self.coef = arrays["coef"]
+        self.intercept = arrays["intercept"]
+        self.min_value = arrays["min_value"]
+        self.max_value = arrays["max_value"]
+        self.feature_names = [str(name) for name in arrays["feature_names"]]
+        self._arrays = arrays
+
+    @classmethod
+    def from_imputer(cls, imputer):
+        return cls(export_imputer(imputer))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def save(self, path):
+        # Write through a file handle so np.savez keeps the given filename
+        with open(path, "wb") as f:
+            np.savez(f, **self._arrays)
+
+    def transform(self, X):
+        """Fill NaNs in X (n_rows, n_features); complete rows come back unchanged"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        missing = np.isnan(X)
+        Xt = np.where(missing, self.statistics, X)
+        if not missing.any():
+            return Xt
+
+        for step in range(len(self.feat_idx)):
+            feat = self.feat_idx[step]
+            rows = missing[:, feat]
+            if not rows.any():
+                continue
+            X_test = Xt[rows][:, self.neighbor_feat_idx[step]]
+            imputed = X_test @ self.coef[step] + self.intercept[step]
+            Xt[rows, feat] = np.clip(imputed, self.min_value[feat], self.max_value[feat])
+
+        return Xt
+
@@ -0,0 +1,71 @@
+"""
+Health Score Kernel
+
+Composite health score shared by training (label generation) and inference
+(single, batch and fast paths). Each of the 6 numerical features is
+normalized to a 0-1 component score, then weighted. Higher = better condition.
+"""
+import numpy as np
+
+CURRENT_YEAR = 2025
+
+# Column order of the component matrix
+COMPONENT_NAMES = [
+    "age_score",
+    "km_per_year_score",
+    "km_score",
+    "year_score",
+    "hp_score",
+    "ccm_score",
+]
+
+
+def health_score_kernel(car_age, km_per_year, km, year, hp, ccm, weights):
+    """
+    Compute health scores for arrays of cars in one pass.
+
+    Args:
+        car_age, km_per_year, km, year, hp, ccm: Array-likes of equal length
+            (or scalars) with the imputed feature values
+        weights: Feature weights dict (age, km_per_year, total_km,
+            model_year, hp, ccm)
+
+    Returns:
+        Tuple of (health scores, shape (n,), and component scores,
+        shape (n, 6) in COMPONENT_NAMES order)
+    """
+    car_age, km_per_year, km, year, hp, ccm = (
+        np.asarray(values, dtype=np.float64).reshape(-1)
+        for values in (car_age, km_per_year, km, year, hp, ccm)
+    )
+
+    # Age score: newer is better (0-20 years range)
+    age_score = np.clip(1 - (car_age / 20), 0, 1)
+
+    # km_per_year score: lower usage is better (0-30000 km/year range)
+    km_per_year_score = np.clip(1 - (km_per_year / 30000), 0, 1)
+
+    # Total km score: lower mileage is better (0-400000 km range)
+    km_score = np.clip(1 - (km / 400000), 0, 1)
+
+    # Model year score: more recent is better (1959-2025 range)
+    year_score = np.clip((year - 1959) / (CURRENT_YEAR - 1959), 0, 1)
+
+    # HP score: higher power is better (50-250 HP range)
+    hp_score = np.clip((hp - 50) / 200, 0, 1)
+
+    # CCM score: optimal around 1450cc, penalize extremes
+    ccm_score = np.clip(1 - (np.abs(ccm - 1450) / 1000), 0, 1)
+
+    # Composite weighted score
+    health_scores = (
+        weights['age'] * age_score +
+        weights['km_per_year'] * km_per_year_score +
+        weights['total_km'] * km_score +
+        weights['model_year'] * year_score +
+        weights['hp'] * hp_score +
+        weights['ccm'] * ccm_score
+    )
+
+    components = np.column_stack([age_score, km_per_year_score, km_score, year_score, hp_score, ccm_score])
+    return health_scores, components
@@ -0,0 +1,237 @@
+"""
+Model Registry
+
+Resolves model artifact paths independently of the working directory
+(every artifact of a bundle comes from the same directory), loads each model bundle lazily on first use and stamps it with a version
+derived from the artifact contents. Bundles can be hot-reloaded without
+restarting the API process.
+"""
+import os
+import pickle
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# Directories searched for artifacts, in order. MODEL_DIR overrides the defaults;
+# src/src/models is where train_binary_zscore.py wrote when run from inside src/.
+DEFAULT_SEARCH_DIRS = [
+    SRC_DIR / "models",
+    SRC_DIR / "src" / "models",
+]
+
+# Artifact files that make up each bundle
+BUNDLES: Dict[str, Dict[str, str]] = {
+    "buyability": {
+        "classifier": "buyability_model.pkl",
+        "imputer": "feature_imputer.pkl",
+        "features": "buyability_features.pkl",
+        "health_threshold": "health_threshold.pkl",
+        "feature_weights": "feature_weights.pkl",
+    },
+    # Same model without sklearn/lightgbm: the classifier and imputer are the
+    # exported NumPy versions (see tree_ensemble.py and compiled_imputer.py)
+    "buyability_compiled": {
+        "classifier": "buyability_trees.npz",
+        "imputer": "buyability_imputer.npz",
+        "features": "buyability_features.pkl",
+        "health_threshold": "health_threshold.pkl",
+        "feature_weights": "feature_weights.pkl",
+    },
+    "binary_zscore": {
+        "classifier": "binary_zscore_model.pkl",
+        "features": "binary_zscore_features.pkl",
+        "imputer": "imputer.pkl",
+    },
+}
+
+
+# Bundles exported from another bundle: reloading the source reloads them too,
+# and their source_version is the source's version in the same directory
+BUNDLE_SOURCES: Dict[str, str] = {
+    "buyability_compiled": "buyability",
+}
+
+
+class ModelNotAvailableError(Exception):
+    """Raised when a bundle's artifacts cannot be found or loaded"""
+    pass
+
+
+class ModelBundle:
+    """A loaded set of model artifacts with version metadata"""
+
+    def __init__(
+        self,
+        name: str,
+        artifacts: Dict[str, Any],
+        paths: Dict[str, Path],
+        version: str,
+        source_version: Optional[str] = None
+    ):
+        self.name = name
+        self.artifacts = artifacts
+        self.paths = paths
+        self.version = version
+        self.source_version = source_version
+        self.loaded_at = datetime.utcnow()
+
+    def __getattr__(self, key: str) -> Any:
+        try:
+            return self.__dict__["artifacts"][key]
+        except KeyError:
+            raise AttributeError(key)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "version": self.version,
+            "source_version": self.source_version,
+            "loaded_at": self.loaded_at.isoformat(),
+            "artifacts": {key: str(path) for key, path in self.paths.items()},
+        }
+
+
+class ModelRegistry:
+    """
+    Lazy, thread-safe registry of model bundles
+    """
+
+    def __init__(self, search_dirs: Optional[List[Path]] = None):
+        env_dir = os.environ.get("MODEL_DIR")
+        if search_dirs is None:
+            search_dirs = ([Path(env_dir).resolve()] if env_dir else []) + DEFAULT_SEARCH_DIRS
+        self.search_dirs = search_dirs
+        self._bundles: Dict[str, ModelBundle] = {}
+        self._lock = threading.Lock()
+
+    def resolve_paths(self, name: str) -> Dict[str, Path]:
+        """
+        Find a bundle's artifacts, all in the first search dir that has them.
+
+        A directory holding only part of the set (e.g. retrained .pkl files
+        without the .npz exports) is an error rather than a reason to mix in
+        artifacts from the next directory.
+        """
+        if name not in BUNDLES:
+            raise ModelNotAvailableError(f"Unknown model bundle: {name}")
+
+        filenames = BUNDLES[name]
+        for directory in self.search_dirs:
+            paths = {key: directory / filename for key, filename in filenames.items()}
+            present = {key for key, path in paths.items() if path.is_file()}
+            if len(present) == len(paths):
+                return paths
+            if present:
+                missing = ", ".join(sorted(filenames[key] for key in paths if key not in present))
+                raise ModelNotAvailableError(f"Incomplete '{name}' bundle in {directory}: missing {missing}")
+
+        searched = ", ".join(str(d) for d in self.search_dirs)
+        raise ModelNotAvailableError(f"Artifacts for '{name}' not found in: {searched}")
+
+    def is_available(self, name: str) -> bool:
+        """Check that all artifacts exist without loading them"""
+        try:
+            self.resolve_paths(name)
+            return True
+        except ModelNotAvailableError:
+            return False
+
+    @staticmethod
+    def compute_version(paths: Dict[str, Path]) -> str:
+        """Version stamp: short hash over the artifact contents"""
+        digest = hashlib.sha256()
+        for key in sorted(paths):
+            digest.update(key.encode())
+            digest.update(paths[key].read_bytes())
+        return digest.hexdigest()[:12]
+
+    @staticmethod
+    def _load_artifact(key: str, path: Path) -> Any:
+        if path.suffix == ".npz":
+            if key == "imputer":
+                from src.compiled_imputer import CompiledImputer
+                return CompiledImputer.load(path)
+            from src.tree_ensemble import TreeEnsemble
+            return TreeEnsemble.load(path)
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def _load(self, name: str) -> ModelBundle:
+        paths = self.resolve_paths(name)
+        try:
+            artifacts = {}
+            for key, path in paths.items():
+                artifacts[key] = self._load_artifact(key, path)
+        except Exception as e:
+            raise ModelNotAvailableError(f"Failed to load '{name}' bundle: {e}") from e
+        return ModelBundle(name, artifacts, paths, self.compute_version(paths), self._source_version(name, paths))
+
+    def _source_version(self, name: str, paths: Dict[str, Path]) -> Optional[str]:
+        """Version of the bundle name was exported from, read from the same directory (None if absent)"""
+        source = BUNDLE_SOURCES.get(name)
+        if source is None:
+            return None
+        directory = next(iter(paths.values())).parent
+        source_paths = {key: directory / filename for key, filename in BUNDLES[source].items()}
+        if not all(path.is_file() for path in source_paths.values()):
+            return None
+        return self.compute_version(source_paths)
+
+    def get(self, name: str) -> ModelBundle:
+        """Return the bundle, loading it on first use"""
+        bundle = self._bundles.get(name)
+        if bundle is not None:
+            return bundle
+
+        with self._lock:
+            bundle = self._bundles.get(name)
+            if bundle is None:
+                bundle = self._load(name)
+                self._bundles[name] = bundle
+            return bundle
+
+    def reload(self, name: Optional[str] = None) -> Dict[str, str]:
+        """
+        Load fresh copies of one or all bundles and swap them in.
+
+        The old bundle keeps serving until the new one has loaded, so a
+        broken artifact never takes the model offline. Reloading a bundle
+        also reloads the available bundles exported from it.
+
+        Returns:
+            Mapping of bundle name to its new version
+        """
+        if name:
+            names = [name] + [n for n, source in BUNDLE_SOURCES.items() if source == name and self.is_available(n)]
+        else:
+            names = [n for n in BUNDLES if self.is_available(n)]
+        versions = {}
+        for bundle_name in names:
+            bundle = self._load(bundle_name)
+            with self._lock:
+                self._bundles[bundle_name] = bundle
+            versions[bundle_name] = bundle.version
+        return versions
+
+    def status(self) -> Dict[str, Any]:
+        """Availability (or why not), load state and version of every bundle"""
+        status = {}
+        for name in BUNDLES:
+            try:
+                self.resolve_paths(name)
+                entry = {"available": True}
+            except ModelNotAvailableError as e:
+                entry = {"available": False, "error": str(e)}
+            entry["loaded"] = name in self._bundles
+            if name in self._bundles:
+                entry.update(self._bundles[name].info())
+            status[name] = entry
+        return status
+
+
+# Global registry instance
+model_registry = ModelRegistry()
@@ -1,19 +1,25 @@
-import pickle
+import sys
+import os
 import pandas as pd
 import numpy as np
 import re
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-MODEL_DIR = "src/models"
+from src.model_registry import model_registry
+
+
+MODEL_NAME = "binary_zscore"
 CURRENT_YEAR = 2025
 
 BUY_THRESHOLD = 0.70
 CONDITIONAL_THRESHOLD = 0.55
 
 
-classifier = pickle.load(open(f"{MODEL_DIR}/binary_zscore_model.pkl", "rb"))
-features = pickle.load(open(f"{MODEL_DIR}/binary_zscore_features.pkl", "rb"))
-imputer = pickle.load(open(f"{MODEL_DIR}/imputer.pkl", "rb"))
+def __getattr__(name):
+    if name in ("classifier", "features", "imputer"):
+        return getattr(model_registry.get(MODEL_NAME), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 num_features = [
@@ -104,6 +110,8 @@ def feature_to_reason(feature_name):
 
 
 def predict_car(sample: dict):
+    model = model_registry.get(MODEL_NAME)
+    classifier, features, imputer = model.classifier, model.features, model.imputer
 
     df = pd.DataFrame([sample])
     
@@ -148,7 +156,8 @@ def predict_car(sample: dict):
         "final_score": round(final_score, 3),
         "decision": decision,
         "risk_reasons": risk_reasons,
-        "top_reasons": reasons
+        "top_reasons": reasons,
+        "model_version": model.version
     }
 
 if __name__ == "__main__":
@@ -4,20 +4,32 @@ Buyability Prediction Module
 Predicts car buyability based on 6 numerical features only (no price).
 Returns a risk score (0-100) where higher = safer to buy.
 """
-import pickle
+import sys
+import os
 import pandas as pd
 import numpy as np
 import re
 
-MODEL_DIR = "src/models"
-CURRENT_YEAR = 2025
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.model_registry import model_registry, ModelNotAvailableError
+from src.health_score import health_score_kernel, COMPONENT_NAMES, CURRENT_YEAR
+
+MODEL_NAME = "buyability"
+# Same model exported as NumPy node tables, used by predict_buyability_fast
+COMPILED_MODEL_NAME = "buyability_compiled"
+
+# Precompiled patterns for parse_numeric (same semantics as parse_ccm / parse_hp)
+RANGE_PATTERN = re.compile(r"(\d+)-(\d+)")
+NUMBER_PATTERN = re.compile(r"(\d+)")
+
+
+def __getattr__(name):
+    """Expose bundle artifacts (classifier, imputer, ...) as lazy module attributes"""
+    if name in ("classifier", "imputer", "features", "health_threshold", "feature_weights"):
+        return getattr(model_registry.get(MODEL_NAME), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Load model artifacts
-classifier = pickle.load(open(f"{MODEL_DIR}/buyability_model.pkl", "rb"))
-imputer = pickle.load(open(f"{MODEL_DIR}/feature_imputer.pkl", "rb"))
-features = pickle.load(open(f"{MODEL_DIR}/buyability_features.pkl", "rb"))
-health_threshold = pickle.load(open(f"{MODEL_DIR}/health_threshold.pkl", "rb"))
-feature_weights = pickle.load(open(f"{MODEL_DIR}/feature_weights.pkl", "rb"))
 
 # Numerical features used by the model
 num_features = [
@@ -52,49 +64,29 @@ def parse_hp(val):
     return int(m[0]) if m else np.nan
 
 
+def parse_numeric(val):
+    """parse_ccm / parse_hp with precompiled patterns, always returning a float"""
+    txt = str(val)
+    m = RANGE_PATTERN.search(txt)
+    if m:
+        return (int(m.group(1)) + int(m.group(2))) / 2
+    m = NUMBER_PATTERN.search(txt)
+    return float(m.group(1)) if m else np.nan
+
+
 def calculate_health_score(row, weights):
     """
-    Calculate composite health score from individual features.
+    Calculate composite health score for a single car.
     Returns health score (0-1) and individual component scores.
     """
-    # Age score: newer is better (0-20 years range)
-    age_score = float(np.clip(1 - (row['car_age'] / 20), 0, 1))
-
-    # km_per_year score: lower usage is better (0-30000 km/year range)
-    km_per_year_score = float(np.clip(1 - (row['km_per_year'] / 30000), 0, 1))
-
-    # Total km score: lower mileage is better (0-400000 km range)
-    km_score = float(np.clip(1 - (row['Km'] / 400000), 0, 1))
-
-    # Model year score: more recent is better (1959-2025 range)
-    year_score = float(np.clip((row['Model Yıl'] - 1959) / (CURRENT_YEAR - 1959), 0, 1))
-
-    # HP score: higher power is better (50-250 HP range)
-    hp_score = float(np.clip((row['Beygir Gucu'] - 50) / 200, 0, 1))
-
-    # CCM score: optimal around 1450cc, penalize extremes
-    ccm_score = float(np.clip(1 - (abs(row['CCM'] - 1450) / 1000), 0, 1))
-
-    # Composite weighted score
-    health_score = (
-        weights['age'] * age_score +
-        weights['km_per_year'] * km_per_year_score +
-        weights['total_km'] * km_score +
-        weights['model_year'] * year_score +
-        weights['hp'] * hp_score +
-        weights['ccm'] * ccm_score
+    health_scores, components = health_score_kernel(
+        row['car_age'], row['km_per_year'], row['Km'],
+        row['Model Yıl'], row['Beygir Gucu'], row['CCM'], weights
     )
-
     score_components = {
-        'age_score': round(age_score, 3),
-        'km_per_year_score': round(km_per_year_score, 3),
-        'km_score': round(km_score, 3),
-        'year_score': round(year_score, 3),
-        'hp_score': round(hp_score, 3),
-        'ccm_score': round(ccm_score, 3)
+        name: round(value, 3) for name, value in zip(COMPONENT_NAMES, components[0].tolist())
     }
-
-    return health_score, score_components
+    return float(health_scores[0]), score_components
 
 
 def get_risk_factors(row, score_components):
@@ -189,7 +181,11 @@ def predict_buyability(sample: dict):
             - feature_scores: Individual feature scores
             - top_features: Top 3 contributing features
             - explanation: Text description of the risk level
+            - model_version: Version stamp of the model bundle used
     """
+    model = model_registry.get(MODEL_NAME)
+    features = model.features
+
     # Parse input into DataFrame
     df = pd.DataFrame([sample])
 
@@ -210,15 +206,15 @@ def predict_buyability(sample: dict):
             df[col] = np.nan
 
     # Impute missing values
-    df[features] = imputer.transform(df[features])
+    df[features] = model.imputer.transform(df[features])
 
     # Get model prediction
     X = df[features]
-    probability = float(classifier.predict_proba(X)[0][1])
+    probability = float(model.classifier.predict_proba(X)[0][1])
 
     # Calculate health score
     row = df.iloc[0]
-    health_score, score_components = calculate_health_score(row, feature_weights)
+    health_score, score_components = calculate_health_score(row, model.feature_weights)
 
     # Convert health score to risk score (0-100)
     # Using health_score instead of probability for more granular results
@@ -231,7 +227,7 @@ def predict_buyability(sample: dict):
     risk_factors = get_risk_factors(row, score_components)
 
     # Get top contributing features
-    importances = classifier.feature_importances_
+    importances = model.classifier.feature_importances_
     feature_importance_pairs = sorted(
         zip(features, importances),
         key=lambda x: x[1],
@@ -254,7 +250,235 @@ def predict_buyability(sample: dict):
         'risk_factors': risk_factors,
         'feature_scores': score_components,
         'top_features': top_features,
-        'explanation': risk_score_to_text(risk_score)
+        'explanation': risk_score_to_text(risk_score),
+        'model_version': model.version
+    }
+
+
+def parse_numeric_series(values):
+    """Vectorized equivalent of parse_ccm / parse_hp over a pandas Series"""
+    txt = values.astype(str)
+    ranges = txt.str.extract(r"(\d+)-(\d+)").astype(float)
+    single = txt.str.extract(r"(\d+)")[0].astype(float)
+    midpoint = (ranges[0] + ranges[1]) / 2
+    return midpoint.where(ranges[0].notna(), single)
+
+
+def impute_features(X, imputer):
+    """
+    Impute a feature DataFrame row-consistently.
+
+    The imputer leaves complete rows untouched, so only rows with missing
+    values go through it. They are transformed one at a time because the
+    imputer's matrix products round differently for 1-row and N-row inputs,
+    and batch results must match predict_buyability exactly.
+    """
+    values = X.to_numpy(dtype=float)
+    for i in np.flatnonzero(np.isnan(values).any(axis=1)):
+        values[i] = imputer.transform(X.iloc[[i]].astype(float))[0]
+    return values
+
+
+def calculate_health_scores(df, weights):
+    """
+    Calculate health scores for every row of a feature DataFrame.
+    Returns health scores (0-1) and a DataFrame of component scores.
+    """
+    health_scores, components = health_score_kernel(
+        df['car_age'], df['km_per_year'], df['Km'],
+        df['Model Yıl'], df['Beygir Gucu'], df['CCM'], weights
+    )
+    return health_scores, pd.DataFrame(components, columns=COMPONENT_NAMES, index=df.index)
+
+
+def predict_buyability_batch(samples):
+    """
+    Predict buyability for many cars in one vectorized pass.
+
+    Args:
+        samples: List of sample dicts (same keys as predict_buyability)
+                 or a DataFrame with those columns
+
+    Returns:
+        List of result dicts, one per sample, identical to calling
+        predict_buyability on each sample individually
+    """
+    if isinstance(samples, pd.DataFrame):
+        df = samples.reset_index(drop=True).copy()
+    else:
+        df = pd.DataFrame(list(samples))
+
+    if df.empty:
+        return []
+
+    model = model_registry.get(MODEL_NAME)
+    features = model.features
+
+    # Parse CCM and HP if they're strings
+    if 'CCM' in df.columns:
+        df['CCM'] = parse_numeric_series(df['CCM'])
+    if 'Beygir Gucu' in df.columns:
+        df['Beygir Gucu'] = parse_numeric_series(df['Beygir Gucu'])
+
+    # Create derived features
+    df['Model Yıl'] = pd.to_numeric(df['Model Yıl'], errors='coerce')
+    df['Km'] = pd.to_numeric(df['Km'], errors='coerce')
+    df['car_age'] = (CURRENT_YEAR - df['Model Yıl']).clip(lower=1)
+    df['km_per_year'] = df['Km'] / df['car_age']
+
+    # Ensure all features exist
+    for col in features:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    # Impute missing values and score every row at once
+    df[features] = impute_features(df[features], model.imputer)
+    probabilities = model.classifier.predict_proba(df[features])[:, 1]
+    health_scores, components = calculate_health_scores(df, model.feature_weights)
+
+    # Top features are the same for every row
+    feature_importance_pairs = sorted(
+        zip(features, model.classifier.feature_importances_),
+        key=lambda x: x[1],
+        reverse=True
+    )[:3]
+
+    rows = df[features].to_dict('records')
+    component_rows = components.to_dict('records')
+
+    results = []
+    for row, comps, probability, health_score in zip(rows, component_rows, probabilities, health_scores):
+        health_score = float(health_score)
+        score_components = {name: round(float(value), 3) for name, value in comps.items()}
+        risk_score = int(round(health_score * 100))
+
+        results.append({
+            'risk_score': risk_score,
+            'decision': "BUYABLE" if health_score >= 0.5 else "NOT BUYABLE",
+            'probability': round(float(probability), 3),
+            'health_score': round(health_score, 3),
+            'risk_factors': get_risk_factors(row, score_components),
+            'feature_scores': score_components,
+            'top_features': [
+                {
+                    'feature': feature_to_description(feat),
+                    'value': float(row[feat]),
+                    'importance': round(float(imp), 3)
+                }
+                for feat, imp in feature_importance_pairs
+            ],
+            'explanation': risk_score_to_text(risk_score),
+            'model_version': model.version
+        })
+
+    return results
+
+
+def build_feature_vector(sample: dict, features):
+    """
+    Parse a sample into a plain float array ordered like `features`,
+    without going through pandas. Missing or unparsable values are NaN.
+    """
+    year = sample['Model Yıl']
+    km = sample['Km']
+    car_age = max(CURRENT_YEAR - year, 1)
+    values = {
+        'CCM': parse_numeric(sample['CCM']) if 'CCM' in sample else np.nan,
+        'Beygir Gucu': parse_numeric(sample['Beygir Gucu']) if 'Beygir Gucu' in sample else np.nan,
+        'Km': km,
+        'Model Yıl': year,
+        'car_age': car_age,
+        'km_per_year': km / car_age,
+    }
+    return np.array([values.get(col, np.nan) for col in features], dtype=np.float64)
+
+
+# Top-3 (feature, importance) pairs per model version; importances are fixed per model
+_top_feature_cache = {}
+
+
+def get_top_feature_pairs(model):
+    """Cached top-3 feature importances of a model bundle"""
+    pairs = _top_feature_cache.get(model.version)
+    if pairs is None:
+        pairs = sorted(
+            zip(model.features, model.classifier.feature_importances_),
+            key=lambda x: x[1],
+            reverse=True
+        )[:3]
+        pairs = [(feat, feature_to_description(feat), round(float(imp), 3)) for feat, imp in pairs]
+        _top_feature_cache[model.version] = pairs
+    return pairs
+
+
+def get_fast_model():
+    """
+    The compiled bundle if it was exported from the booster bundle in use
+    (same version, e.g. not left over from before a reload of a retrained
+    model), otherwise the booster bundle
+    """
+    try:
+        compiled = model_registry.get(COMPILED_MODEL_NAME)
+    except ModelNotAvailableError:
+        return model_registry.get(MODEL_NAME)
+    try:
+        model = model_registry.get(MODEL_NAME)
+    except ModelNotAvailableError:
+        # Deployed without the sklearn/lightgbm artifacts
+        return compiled
+    return compiled if compiled.source_version == model.version else model
+
+
+def predict_buyability_fast(sample: dict):
+    """
+    Single-row predict_buyability without pandas.
+
+    Imputes and scores with the compiled bundle (NumPy imputer and tree
+    ensemble) when it matches the booster bundle's version, otherwise with
+    the sklearn imputer and the LightGBM booster directly. Results are
+    identical to predict_buyability except for model_version, which names
+    the bundle that actually scored the sample.
+
+    Args:
+        sample: Dictionary with car features (same keys as predict_buyability)
+
+    Returns:
+        Same dictionary as predict_buyability
+    """
+    model = get_fast_model()
+    features = model.features
+
+    x = build_feature_vector(sample, features)
+
+    # Only samples with missing values need imputing
+    if np.isnan(x).any():
+        if model.name == COMPILED_MODEL_NAME:
+            x = model.imputer.transform(x)[0]
+        else:
+            x = model.imputer.transform(pd.DataFrame([x], columns=features))[0]
+
+    if model.name == COMPILED_MODEL_NAME:
+        probability = float(model.classifier.predict_proba(x[None, :])[0, 1])
+    else:
+        probability = float(model.classifier.booster_.predict(x[None, :])[0])
+
+    row = dict(zip(features, x.tolist()))
+    health_score, score_components = calculate_health_score(row, model.feature_weights)
+    risk_score = int(round(health_score * 100))
+
+    return {
+        'risk_score': risk_score,
+        'decision': "BUYABLE" if health_score >= 0.5 else "NOT BUYABLE",
+        'probability': round(probability, 3),
+        'health_score': round(health_score, 3),
+        'risk_factors': get_risk_factors(row, score_components),
+        'feature_scores': score_components,
+        'top_features': [
+            {'feature': description, 'value': row[feat], 'importance': importance}
+            for feat, description, importance in get_top_feature_pairs(model)
+        ],
+        'explanation': risk_score_to_text(risk_score),
+        'model_version': model.version
     }
 
 
@@ -3,16 +3,24 @@ import numpy as np
 import pickle
 import os
 import re
+import sys
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
 from lightgbm import LGBMClassifier
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, roc_auc_score
 
-MODEL_DIR = "src/models"
-os.makedirs(MODEL_DIR, exist_ok=True)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tree_ensemble import TreeEnsemble
+from src.compiled_imputer import CompiledImputer
+from src.health_score import health_score_kernel, CURRENT_YEAR
 
-CURRENT_YEAR = 2025
+# Resolve paths from this file so training works from any working directory
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.environ.get("MODEL_DIR") or os.path.join(SRC_DIR, "models")
+DATA_PATH = os.path.join(SRC_DIR, "data", "raw", "turkey_car_market.csv")
+os.makedirs(MODEL_DIR, exist_ok=True)
 
 # Feature weights for health score calculation
 FEATURE_WEIGHTS = {
@@ -45,47 +53,9 @@ def parse_hp(val):
     return int(m[0]) if m else np.nan
 
 
-def calculate_health_score(df, weights):
-    """
-    Calculate composite health score from 6 numerical features.
-    Each feature is normalized to 0-1 range, then weighted.
-    Higher score = better condition.
-    """
-    # Age score: newer is better (0-20 years range)
-    age_score = np.clip(1 - (df['car_age'] / 20), 0, 1)
-
-    # km_per_year score: lower usage is better (0-30000 km/year range)
-    km_per_year_score = np.clip(1 - (df['km_per_year'] / 30000), 0, 1)
-
-    # Total km score: lower mileage is better (0-400000 km range)
-    km_score = np.clip(1 - (df['Km'] / 400000), 0, 1)
-
-    # Model year score: more recent is better (1959-2025 range)
-    year_score = (df['Model Yıl'] - 1959) / (CURRENT_YEAR - 1959)
-    year_score = np.clip(year_score, 0, 1)
-
-    # HP score: higher power is better (50-250 HP range)
-    hp_score = np.clip((df['Beygir Gucu'] - 50) / 200, 0, 1)
-
-    # CCM score: optimal around 1450cc, penalize extremes
-    ccm_score = np.clip(1 - (np.abs(df['CCM'] - 1450) / 1000), 0, 1)
-
-    # Composite weighted score
-    health_score = (
-        weights['age'] * age_score +
-        weights['km_per_year'] * km_per_year_score +
-        weights['total_km'] * km_score +
-        weights['model_year'] * year_score +
-        weights['hp'] * hp_score +
-        weights['ccm'] * ccm_score
-    )
-
-    return health_score
-
-
 # LOAD DATA
 print("Loading data...")
-df = pd.read_csv("data/raw/turkey_car_market.csv")
+df = pd.read_csv(DATA_PATH)
 print(f"Loaded {len(df)} records")
 
 # Parse numeric features
@@ -121,7 +91,10 @@ df[num_features] = imputer.fit_transform(df[num_features])
 
 # Calculate health score for each car
 print("\nCalculating health scores...")
-df['health_score'] = calculate_health_score(df, FEATURE_WEIGHTS)
+df['health_score'], _ = health_score_kernel(
+    df['car_age'], df['km_per_year'], df['Km'],
+    df['Model Yıl'], df['Beygir Gucu'], df['CCM'], FEATURE_WEIGHTS
+)
 
 # Analyze health score distribution
 print("\nHealth Score Statistics:")
@@ -208,11 +181,20 @@ pickle.dump(num_features, open(f"{MODEL_DIR}/buyability_features.pkl", "wb"))
 pickle.dump(threshold, open(f"{MODEL_DIR}/health_threshold.pkl", "wb"))
 pickle.dump(FEATURE_WEIGHTS, open(f"{MODEL_DIR}/feature_weights.pkl", "wb"))
 
+# Export the booster as array-backed node tables for the NumPy evaluator
+ensemble = TreeEnsemble.from_booster(model.booster_)
+ensemble.save(f"{MODEL_DIR}/buyability_trees.npz")
+max_diff = np.max(np.abs(ensemble.predict_proba(X_test.to_numpy())[:, 1] - probs))
+print(f"\nCompiled tree ensemble max |LightGBM - NumPy| on test set: {max_diff:.3e}")
+CompiledImputer.from_imputer(imputer).save(f"{MODEL_DIR}/buyability_imputer.npz")
+
 print("\nModel artifacts saved:")
 print(f"  - {MODEL_DIR}/buyability_model.pkl")
 print(f"  - {MODEL_DIR}/feature_imputer.pkl")
 print(f"  - {MODEL_DIR}/buyability_features.pkl")
 print(f"  - {MODEL_DIR}/health_threshold.pkl")
 print(f"  - {MODEL_DIR}/feature_weights.pkl")
+print(f"  - {MODEL_DIR}/buyability_trees.npz")
+print(f"  - {MODEL_DIR}/buyability_imputer.npz")
 
 print("\nModel training completed successfully!")
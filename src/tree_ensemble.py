@@ -0,0 +1,219 @@
+"""
+Compiled Tree Ensemble
+
+Flattens a trained LightGBM binary classifier into array-backed node tables
+(feature index, threshold, left/right child, leaf value) and scores rows
+directly from those arrays with NumPy, so the API can predict without
+importing lightgbm or sklearn.
+
+train_binary_zscore.py exports the trained model; tests/test_tree_ensemble.py
+checks the exported ensemble against LightGBM.
+"""
+import numpy as np
+
+# LightGBM decision_type bit layout and missing value handling
+CATEGORICAL_MASK = 1
+DEFAULT_LEFT_MASK = 2
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+ZERO_THRESHOLD = 1e-35
+
+NODE_ARRAYS = ["split_feature", "threshold", "left_child", "right_child",
+               "leaf_value", "default_left", "missing_type"]
+
+
+def _parse_model_string(model_string):
+    """Split a LightGBM model string into header fields and per-tree fields"""
+    header = {}
+    trees = []
+    current = header
+    for line in model_string.splitlines():
+        if line.startswith("Tree="):
+            current = {}
+            trees.append(current)
+        elif line.startswith("end of trees"):
+            break
+        elif "=" in line:
+            key, _, value = line.partition("=")
+            current[key] = value
+    return header, trees
+
+
+def export_booster(booster):
+    """
+    Flatten a LightGBM booster into node tables.
+
+    Internal nodes and leaves of every tree share one set of arrays. Leaves
+    point to themselves on both sides, so evaluation can step every row a
+    fixed number of times without branching on node type.
+
+    Args:
+        booster: lightgbm.Booster (e.g. LGBMClassifier.booster_)
+
+    Returns:
+        Dictionary of NumPy arrays accepted by TreeEnsemble
+    """
+    header, trees = _parse_model_string(booster.model_to_string())
+
+    objective = header.get("objective", "")
+    if not objective.startswith("binary") or int(header.get("num_tree_per_iteration", 1)) != 1:
+        raise ValueError(f"Only binary models are supported, got objective '{objective}'")
+
+    sigmoid = 1.0
+    for token in objective.split():
+        if token.startswith("sigmoid:"):
+            sigmoid = float(token.split(":")[1])
+
+    columns = {name: [] for name in NODE_ARRAYS}
+    roots = []
+    max_depth = 0
+
+    for tree in trees:
+        offset = len(columns["leaf_value"])
+        leaf_values = [float(v) for v in tree["leaf_value"].split()]
+        num_internal = int(tree["num_leaves"]) - 1
+
+        if num_internal > 0:
+            decision_type = [int(v) for v in tree["decision_type"].split()]
+            if any(d & CATEGORICAL_MASK for d in decision_type):
+                raise ValueError("Categorical splits are not supported")
+
+            left = [int(v) for v in tree["left_child"].split()]
+            right = [int(v) for v in tree["right_child"].split()]
+
+            def node_index(child):
+                return offset + child if child >= 0 else offset + num_internal + ~child
+
+            columns["split_feature"] += [int(v) for v in tree["split_feature"].split()]
+            columns["threshold"] += [float(v) for v in tree["threshold"].split()]
+            columns["left_child"] += [node_index(c) for c in left]
+            columns["right_child"] += [node_index(c) for c in right]
+            columns["leaf_value"] += [0.0] * num_internal
+            columns["default_left"] += [bool(d & DEFAULT_LEFT_MASK) for d in decision_type]
+            columns["missing_type"] += [(d >> 2) & 3 for d in decision_type]
+
+            # Depth of the deepest leaf bounds the number of evaluation steps
+            depth = {0: 0}
+            for i in range(num_internal):
+                for child in (left[i], right[i]):
+                    if child >= 0:
+                        depth[child] = depth[i] + 1
+                    else:
+                        max_depth = max(max_depth, depth[i] + 1)
+
+        leaf_start = offset + num_internal
+        for i, value in enumerate(leaf_values):
+            columns["split_feature"].append(0)
+            columns["threshold"].append(np.inf)
+            columns["left_child"].append(leaf_start + i)
+            columns["right_child"].append(leaf_start + i)
+            columns["leaf_value"].append(value)
+            columns["default_left"].append(True)
+            columns["missing_type"].append(MISSING_NONE)
+
+        roots.append(offset)
+
+    return {
+        "split_feature": np.array(columns["split_feature"], dtype=np.int32),
+        "threshold": np.array(columns["threshold"], dtype=np.float64),
+        "left_child": np.array(columns["left_child"], dtype=np.int32),
+        "right_child": np.array(columns["right_child"], dtype=np.int32),
+        "leaf_value": np.array(columns["leaf_value"], dtype=np.float64),
+        "default_left": np.array(columns["default_left"], dtype=bool),
+        "missing_type": np.array(columns["missing_type"], dtype=np.int8),
+        "tree_roots": np.array(roots, dtype=np.int32),
+        "max_depth": np.array(max_depth, dtype=np.int32),
+        "sigmoid": np.array(sigmoid, dtype=np.float64),
+        "feature_names": np.array(header.get("feature_names", "").split()),
+        "feature_importances": np.array(booster.feature_importance("split"), dtype=np.int64),
+    }
+
+
+class TreeEnsemble:
+    """
+    NumPy evaluator for an exported LightGBM binary classifier.
+
+    Mirrors the parts of the LGBMClassifier interface used by the
+    prediction modules: predict_proba and feature_importances_.
+    """
+
+    def __init__(self, arrays):
+        self.split_feature = arrays["split_feature"]
+        self.threshold = arrays["threshold"]
+        self.left_child = arrays["left_child"]
+        self.right_child = arrays["right_child"]
+        self.leaf_value = arrays["leaf_value"]
+        self.default_left = arrays["default_left"]
+        self.missing_type = arrays["missing_type"]
+        self.tree_roots = arrays["tree_roots"]
+        self.max_depth = int(arrays["max_depth"])
+        self.sigmoid = float(arrays["sigmoid"])
+        self.feature_names = [str(name) for name in arrays["feature_names"]]
+        self.feature_importances_ = arrays["feature_importances"]
+        self._arrays = arrays
+
+        # Children interleaved as [left, right, left, right, ...] so the next node is
+        # children[2 * node + goes_right]; intp indices avoid casts on every take()
+        self.children = np.stack([self.left_child, self.right_child], axis=1).ravel().astype(np.intp)
+        self._split_feature = self.split_feature.astype(np.intp)
+        self._roots = self.tree_roots.astype(np.intp)
+        # Without Zero/NaN-aware splits, missing values simply behave as 0.0
+        self.plain_splits = bool(np.all(self.missing_type == MISSING_NONE))
+
+    @classmethod
+    def from_booster(cls, booster):
+        return cls(export_booster(booster))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def save(self, path):
+        # Write through a file handle so np.savez keeps the given filename
+        with open(path, "wb") as f:
+            np.savez(f, **self._arrays)
+
+    @property
+    def n_trees(self):
+        return len(self.tree_roots)
+
+    def raw_score(self, X):
+        """Sum of leaf values for each row (log-odds)"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+
+        if self.plain_splits:
+            flat = np.where(np.isnan(X), 0.0, X).ravel()
+            row_offsets = (np.arange(X.shape[0]) * X.shape[1])[:, None]
+            nodes = np.broadcast_to(self._roots, (X.shape[0], self.n_trees))
+            for _ in range(self.max_depth):
+                values = flat.take(row_offsets + self._split_feature.take(nodes))
+                nodes = self.children.take((nodes << 1) | (values > self.threshold.take(nodes)))
+        else:
+            rows = np.arange(X.shape[0])[:, None]
+            nodes = np.broadcast_to(self.tree_roots, (X.shape[0], self.n_trees))
+            for _ in range(self.max_depth):
+                values = X[rows, self.split_feature[nodes]]
+                missing_type = self.missing_type[nodes]
+                is_nan = np.isnan(values)
+
+                # NaN is treated as zero unless the split handles NaN explicitly
+                values = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, values)
+                use_default = (
+                    ((missing_type == MISSING_ZERO) & (np.abs(values) <= ZERO_THRESHOLD)) |
+                    ((missing_type == MISSING_NAN) & is_nan)
+                )
+                go_left = np.where(use_default, self.default_left[nodes], values <= self.threshold[nodes])
+                nodes = np.where(go_left, self.left_child[nodes], self.right_child[nodes])
+
+        # Sequential sum in tree order, as LightGBM accumulates it
+        return np.cumsum(self.leaf_value.take(nodes), axis=1)[:, -1]
+
+    def predict_proba(self, X):
+        """Class probabilities, shape (n_rows, 2) like LGBMClassifier.predict_proba"""
+        positive = 1.0 / (1.0 + np.exp(-self.sigmoid * self.raw_score(X)))
+        return np.column_stack([1.0 - positive, positive])
+
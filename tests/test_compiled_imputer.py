@@ -0,0 +1,68 @@
+"""
+Compiled imputer vs sklearn IterativeImputer
+
+Checks the committed src/models/buyability_imputer.npz against the pickled
+buyability imputer. Read-only: no artifact is written.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.model_registry import model_registry
+from src.compiled_imputer import CompiledImputer
+from src.predict_buyability import CURRENT_YEAR, parse_numeric_series
+
+IMPUTER_PATH = os.path.join(ROOT, "src", "models", "buyability_imputer.npz")
+DATASET_PATH = os.path.join(ROOT, "src", "data", "raw", "turkey_car_market.csv")
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return model_registry.get("buyability")
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    return CompiledImputer.load(IMPUTER_PATH)
+
+
+@pytest.fixture(scope="module")
+def rows(bundle):
+    """Dataset rows with values knocked out in several columns"""
+    raw = pd.read_csv(DATASET_PATH)
+    df = pd.DataFrame({
+        "CCM": parse_numeric_series(raw["CCM"]),
+        "Beygir Gucu": parse_numeric_series(raw["Beygir Gucu"]),
+        "Km": raw["Km"].astype(float),
+        "Model Yıl": raw["Model Yıl"].astype(float),
+    })
+    df["car_age"] = (CURRENT_YEAR - df["Model Yıl"]).clip(lower=1)
+    df["km_per_year"] = df["Km"] / df["car_age"]
+    X = df[bundle.features].sample(500, random_state=0).reset_index(drop=True)
+    X.iloc[::2, 0] = np.nan
+    X.iloc[::3, 1] = np.nan
+    X.iloc[::7, 4] = np.nan
+    return X
+
+
+def test_single_rows_match_sklearn(bundle, compiled, rows):
+    # One row at a time, the way the API imputes
+    for i in range(len(rows)):
+        expected = bundle.imputer.transform(rows.iloc[[i]])[0]
+        actual = compiled.transform(rows.iloc[i].to_numpy())[0]
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_batch_matches_sklearn(bundle, compiled, rows):
+    np.testing.assert_allclose(compiled.transform(rows.to_numpy()), bundle.imputer.transform(rows), rtol=0, atol=1e-9)
+
+
+def test_complete_rows_unchanged(compiled, rows):
+    complete = rows.dropna().to_numpy()
+    np.testing.assert_array_equal(compiled.transform(complete), complete)
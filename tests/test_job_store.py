@@ -0,0 +1,130 @@
+"""
+Crawl job store (backend/api/services/job_store.py), SQLite backend
+
+Compare-and-set transitions, counters, result blobs, retention and the
+recovery of jobs whose worker died.
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from config.settings import settings
+from api.models.schemas import JobStatus
+from api.services.job_store import JobStore, WORKER_ID
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_STORE_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "JOB_STORE_PATH", str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(settings, "JOB_BLOB_DIR", str(tmp_path / "results"))
+    store = JobStore()
+    yield store
+    store.close()
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def create(store, job_id, status=JobStatus.PENDING, age_seconds=0, **fields):
+    created_at = datetime.utcnow() - timedelta(seconds=age_seconds)
+    run(store.create({"job_id": job_id, "url": "https://example.com", "status": status, "created_at": created_at, **fields}))
+
+
+def test_transition_is_compare_and_set(store):
+    create(store, "a")
+    assert run(store.transition("a", JobStatus.RUNNING, [JobStatus.PENDING], started_at=datetime.utcnow()))
+    # A second worker cannot start it again
+    assert not run(store.transition("a", JobStatus.RUNNING, [JobStatus.PENDING]))
+    assert run(store.transition("a", JobStatus.CANCELLED, [JobStatus.PENDING, JobStatus.RUNNING]))
+    # A crawl finishing after the cancel does not flip it back
+    assert not run(store.transition("a", JobStatus.COMPLETED, [JobStatus.RUNNING], result={"title": "t"}))
+    job = run(store.get("a"))
+    assert job["status"] == JobStatus.CANCELLED and job["result"] is None
+    assert not run(store.transition("missing", JobStatus.RUNNING, [JobStatus.PENDING]))
+
+
+def test_counters_follow_transitions_and_deletes(store):
+    for job_id in "abc":
+        create(store, job_id)
+    started = datetime.utcnow()
+    run(store.transition("a", JobStatus.RUNNING, [JobStatus.PENDING], started_at=started))
+    run(store.transition("a", JobStatus.COMPLETED, [JobStatus.RUNNING], completed_at=started + timedelta(seconds=4)))
+    run(store.transition("b", JobStatus.CANCELLED, [JobStatus.PENDING]))
+    run(store.delete("c"))
+
+    stats = run(store.stats())
+    assert stats["counts"] == {"completed": 1, "cancelled": 1}
+    assert stats["totals"] == {"created": 3, "pending": 3, "running": 1, "completed": 1, "cancelled": 1}
+    assert stats["average_duration"] == pytest.approx(4.0, abs=0.01)
+
+
+def test_result_blob_round_trip(store):
+    create(store, "a", JobStatus.RUNNING)
+    result = {"title": "t", "html": "<html>" + "x" * 5000, "links": ["https://example.com/1"]}
+    run(store.transition("a", JobStatus.COMPLETED, [JobStatus.RUNNING], result=result))
+
+    job = run(store.get("a"))
+    assert job["result"] == {"title": "t"}
+    assert job["result_blob"]["fields"] == ["html", "links"]
+    assert run(store.get_result("a"))["result"] == result
+
+
+def test_failed_transition_keeps_stored_blob(store):
+    create(store, "a", JobStatus.RUNNING)
+    run(store.update("a", result={"items": [1]}))
+    run(store.transition("a", JobStatus.CANCELLED, [JobStatus.RUNNING]))
+    assert not run(store.transition("a", JobStatus.COMPLETED, [JobStatus.RUNNING], result={"items": [1, 2]}))
+    assert run(store.get_result("a"))["result"] == {"items": [1]}
+
+
+def test_result_without_bulky_fields_drops_old_blob(store):
+    create(store, "a", JobStatus.COMPLETED)
+    run(store.update("a", result={"html": "x" * 100}))
+    run(store.update("a", result={"title": "t"}))
+    assert os.listdir(settings.JOB_BLOB_DIR) == []
+    assert run(store.get_result("a"))["result"] == {"title": "t"}
+
+
+def test_retention_evicts_expired_and_excess_jobs(store, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_TTL_COMPLETED_SECONDS", 3600)
+    monkeypatch.setattr(settings, "JOB_RETENTION_MAX_JOBS", 2)
+    create(store, "expired", JobStatus.COMPLETED, age_seconds=7200)
+    create(store, "old", JobStatus.FAILED, age_seconds=60)
+    create(store, "new", JobStatus.COMPLETED, age_seconds=30)
+    create(store, "pending", JobStatus.PENDING, age_seconds=9000)
+
+    assert store.enforce_retention()["jobs"] == 2
+    assert run(store.get("expired")) is None and run(store.get("old")) is None
+    # Pending jobs are never evicted
+    assert run(store.get("pending")) is not None and run(store.get("new")) is not None
+
+
+def test_stale_running_job_is_failed(store, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_STALE_SECONDS", 300)
+    old = datetime.utcnow() - timedelta(seconds=600)
+    for job_id in ("dead", "alive"):
+        create(store, job_id, JobStatus.RUNNING, age_seconds=600, started_at=old, worker_id="w", heartbeat_at=old)
+    run(store.update("alive", heartbeat_at=datetime.utcnow()))
+
+    assert store.recover_stale_jobs() == 1
+    assert run(store.get("dead"))["status"] == JobStatus.FAILED
+    assert run(store.get("alive"))["status"] == JobStatus.RUNNING
+
+
+def test_pending_job_is_claimed_once(store):
+    create(store, "a", worker_id="gone")
+    assert run(store.claim("a", "gone"))
+    assert not run(store.claim("a", "gone"))
+    assert run(store.get("a"))["worker_id"] == WORKER_ID
+
+    run(store.release(["a"]))
+    assert run(store.get("a"))["worker_id"] == ""
+    assert run(store.claim("a", ""))
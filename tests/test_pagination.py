@@ -0,0 +1,63 @@
+"""
+Keyset pagination cursors (backend/storage/pagination.py)
+"""
+import os
+import sys
+from datetime import datetime
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "backend"))
+
+from storage.pagination import encode_cursor, decode_cursor, cursor_after
+
+
+@pytest.mark.parametrize("value", [
+    datetime(2025, 1, 31, 23, 59, 59, 123456),
+    1490000.5,
+    42,
+    "Ankara",
+    None,
+])
+def test_round_trip(value):
+    cursor = encode_cursor("crawled_at", value, "1289077570")
+    assert decode_cursor(cursor, "crawled_at") == {"value": value, "id": "1289077570"}
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor("price", "ü/+?&" * 10, 7)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+
+
+def test_other_ordering_is_rejected():
+    cursor = encode_cursor("price", 100, 1)
+    with pytest.raises(ValueError, match="ordering"):
+        decode_cursor(cursor, "crawled_at")
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "e30", encode_cursor("price", 1, 2)[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "price")
+
+
+def test_cursor_after_full_page_points_after_last_item():
+    items = [{"crawled_at": datetime(2025, 1, day), "id": day} for day in (3, 2, 1)]
+    cursor = cursor_after(items, "crawled_at", "id", limit=3)
+    assert decode_cursor(cursor, "crawled_at") == {"value": datetime(2025, 1, 1), "id": 1}
+
+
+def test_cursor_after_reads_attributes():
+    class Row:
+        def __init__(self, price, id):
+            self.price = price
+            self.id = id
+
+    cursor = cursor_after([Row(100, 1), Row(90, 2)], "price", "id", limit=2)
+    assert decode_cursor(cursor, "price") == {"value": 90, "id": 2}
+
+
+def test_short_page_is_the_last():
+    assert cursor_after([{"id": 1, "price": 1}], "price", "id", limit=2) is None
+    assert cursor_after([], "price", "id", limit=0) is None
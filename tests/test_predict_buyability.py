@@ -0,0 +1,60 @@
+"""
+predict_buyability_batch and predict_buyability_fast vs predict_buyability
+
+Both faster paths must return exactly what predict_buyability returns for
+the same sample (predict_buyability_fast may name another bundle in
+model_version).
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.predict_buyability import predict_buyability, predict_buyability_batch, predict_buyability_fast
+
+DATASET_PATH = os.path.join(ROOT, "src", "data", "raw", "turkey_car_market.csv")
+
+
+@pytest.fixture(scope="module")
+def samples():
+    """Dataset rows as API samples, plus missing and unparsable engine specs"""
+    raw = pd.read_csv(DATASET_PATH).dropna(subset=["Model Yıl", "Km"]).sample(300, random_state=0)
+    samples = [
+        {"Model Yıl": int(row["Model Yıl"]), "Km": int(row["Km"]), "CCM": row["CCM"], "Beygir Gucu": row["Beygir Gucu"]}
+        for _, row in raw.iterrows()
+    ]
+    for i, sample in enumerate(samples[:60]):
+        if i % 3 == 0:
+            del sample["CCM"]
+        elif i % 3 == 1:
+            sample["Beygir Gucu"] = "Bilmiyorum"
+        else:
+            sample["CCM"] = 1598
+    return samples
+
+
+def without_version(result):
+    return {key: value for key, value in result.items() if key != "model_version"}
+
+
+def test_batch_matches_single(samples):
+    expected = [predict_buyability(sample) for sample in samples]
+    assert predict_buyability_batch(samples) == expected
+
+
+def test_batch_accepts_dataframe(samples):
+    expected = predict_buyability_batch(samples[:20])
+    assert predict_buyability_batch(pd.DataFrame(samples[:20])) == expected
+
+
+def test_batch_of_nothing():
+    assert predict_buyability_batch([]) == []
+
+
+def test_fast_matches_single(samples):
+    for sample in samples:
+        assert without_version(predict_buyability_fast(sample)) == without_version(predict_buyability(sample))
@@ -0,0 +1,68 @@
+"""
+Compiled tree ensemble vs LightGBM
+
+Checks the committed src/models/buyability_trees.npz against the pickled
+LightGBM buyability model. Read-only: no artifact is written.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.model_registry import model_registry
+from src.tree_ensemble import TreeEnsemble
+
+TREES_PATH = os.path.join(ROOT, "src", "models", "buyability_trees.npz")
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return model_registry.get("buyability")
+
+
+@pytest.fixture(scope="module")
+def ensemble():
+    return TreeEnsemble.load(TREES_PATH)
+
+
+def random_rows(features, n_rows, seed=0):
+    """Random feature rows over realistic ranges, every third row with NaNs"""
+    rng = np.random.default_rng(seed)
+    ranges = {
+        "CCM": (800, 5000),
+        "Beygir Gucu": (50, 500),
+        "Km": (0, 500000),
+        "Model Yıl": (1990, 2025),
+        "car_age": (1, 35),
+        "km_per_year": (0, 60000),
+    }
+    X = np.column_stack([rng.uniform(*ranges.get(name, (0, 1000)), n_rows) for name in features])
+    X[::3, rng.integers(0, len(features))] = np.nan
+    X[::5, 0] = np.nan
+    X[::7, :] = np.nan
+    return pd.DataFrame(X, columns=features)
+
+
+def test_predictions_match_lightgbm(bundle, ensemble):
+    X = random_rows(bundle.features, 2000)
+    expected = bundle.classifier.predict_proba(X)[:, 1]
+    actual = ensemble.predict_proba(X.to_numpy())[:, 1]
+    assert np.max(np.abs(expected - actual)) <= 1e-12
+
+
+def test_single_row_matches_lightgbm(bundle, ensemble):
+    X = random_rows(bundle.features, 30, seed=1)
+    for i in range(len(X)):
+        expected = bundle.classifier.predict_proba(X.iloc[[i]])[0, 1]
+        actual = ensemble.predict_proba(X.iloc[i].to_numpy())[0, 1]
+        assert abs(expected - actual) <= 1e-12
+
+
+def test_feature_importances_match_lightgbm(bundle, ensemble):
+    np.testing.assert_array_equal(ensemble.feature_importances_, bundle.classifier.feature_importances_)
+    assert ensemble.feature_names == list(bundle.classifier.booster_.feature_name())